@@ -6,6 +6,7 @@ class TopicalVocabulary {
     this.vocabulary = {};
     this.currentTopic = null;
     this.currentTopicVocabulary = [];
+    this.bundleManifest = null;
   }
 
   // Spanish to English topic key mapping
@@ -207,9 +208,81 @@ class TopicalVocabulary {
     return vocabulary;
   }
 
+  // Load a whole language/level from its generated bundle in a single request.
+  // Returns null when no bundle has been built for it.
+  async loadVocabularyBundle(language, level) {
+    if (!this.bundleManifest) {
+      this.bundleManifest = fetch('data/word_lists/bundles.json')
+        .then(res => (res.ok ? res.json() : { bundles: {} }))
+        .catch(() => ({ bundles: {} }));
+    }
+    const manifest = await this.bundleManifest;
+    const info = manifest.bundles && manifest.bundles[`${language}/${level}`];
+    if (!info) return null;
+
+    const res = await fetch(`data/word_lists/${info.file}`);
+    if (!res.ok) return null;
+    const bundle = await res.json();
+
+    // Rows are stored once as value arrays in `fields` order; topics list
+    // their row numbers, so an entry shared by several topics is one object
+    const vocab = {};
+    const decoded = new Map();
+    const decodeRow = (r) => {
+      if (decoded.has(r)) return decoded.get(r);
+      const row = bundle.entries[r];
+      const entry = {};
+      bundle.fields.forEach((field, i) => {
+        if (row[i] !== null) entry[field] = row[i];
+      });
+      decoded.set(r, entry);
+      return entry;
+    };
+    for (const item of bundle.index) {
+      // Version 1 bundles stored each topic as a contiguous offset/count slice
+      const rows = item.rows || Array.from({ length: item.count }, (_, i) => item.offset + i);
+      vocab[item.key] = { topic: item.topic, words: rows.map(decodeRow) };
+    }
+    return vocab;
+  }
+
+  // Expand a topic file written in the compact columnar format
+  // (see scripts/compact_format.py) back into { topic, words }
+  decodeColumnarTopic(data) {
+    const words = Array.from({ length: data.count }, () => ({}));
+    const templated = [];
+    data.fields.forEach((field, i) => {
+      data.columns[i].forEach((value, row) => {
+        if (value === null) return;
+        if (Array.isArray(value)) {
+          words[row][field] = value.map(id => data.strings[id]);
+        } else if (value >= 0) {
+          words[row][field] = data.strings[value];
+        } else {
+          templated.push([row, field, data.strings[-value - 1]]);
+        }
+      });
+    });
+    for (const [row, field, template] of templated) {
+      words[row][field] = template.replace(/\{(\w+)\}/, (_, name) => words[row][name]);
+    }
+    return data.topic !== undefined ? { topic: data.topic, words } : words;
+  }
+
   // Load vocabulary for a specific language and level
   async loadTopicalVocabulary(language, level) {
     console.log(`Loading topical JSON vocabulary for ${language} ${level}...`);
+    try {
+      const bundled = await this.loadVocabularyBundle(language, level);
+      if (bundled) {
+        this.vocabulary[`${language}_${level}`] = bundled;
+        console.log(`✅ Loaded ${Object.keys(bundled).length} topics for ${language} ${level} from bundle`);
+        return bundled;
+      }
+    } catch (error) {
+      console.warn(`Bundle load failed for ${language} ${level}, falling back to topic files:`, error);
+    }
+
     const base = `data/word_lists/${language}/${level}`;
     // fetch topic index
     const indexRes = await fetch(`${base}/index.json`);
@@ -220,7 +293,7 @@ class TopicalVocabulary {
       const res = await fetch(`${base}/${key}.json`);
       if (!res.ok) throw new Error(`Failed to load ${key}.json`);
       const data = await res.json();
-      vocab[key] = data;
+      vocab[key] = data.format === 'columnar' ? this.decodeColumnarTopic(data) : data;
     }
     this.vocabulary[`${language}_${level}`] = vocab;
     console.log(`✅ Loaded ${Object.keys(vocab).length} topics for ${language} ${level}`);
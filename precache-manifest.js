@@ -0,0 +1,20 @@
+// Generated by scripts/precache.py from the word-list build. Do not edit.
+self.__PRECACHE_MANIFEST = {
+  "version": "a577ce496588",
+  "entries": [
+    {"url": "./", "hash": "c5e5bf0983ce4aec", "size": 24006},
+    {"url": "./css/styles.css", "hash": "dbb35d4b18e65750", "size": 39846},
+    {"url": "./icons/apple-touch-icon.png", "hash": "176d6b5439c9b868", "size": 21977},
+    {"url": "./icons/favicon-96x96.png", "hash": "4587169d1799222e", "size": 7681},
+    {"url": "./icons/favicon.ico", "hash": "882b6c67bd383b64", "size": 15086},
+    {"url": "./icons/favicon.svg", "hash": "29c937d6dd9aa45a", "size": 139562},
+    {"url": "./icons/web-app-manifest-192x192.png", "hash": "26bb6019e162751b", "size": 24644},
+    {"url": "./icons/web-app-manifest-512x512.png", "hash": "7864794af5cf4887", "size": 144256},
+    {"url": "./index.html", "hash": "c5e5bf0983ce4aec", "size": 24006},
+    {"url": "./js/app.js", "hash": "f6961f27aa61c7f6", "size": 76287},
+    {"url": "./js/chatbot.js", "hash": "f0731f5d3b9baaa4", "size": 52729},
+    {"url": "./js/topical-vocabulary.js", "hash": "3a9c64091d58f199", "size": 19498},
+    {"url": "./js/translations.js", "hash": "19661bfae407a5b0", "size": 10269},
+    {"url": "./manifest.json", "hash": "6b2e2bbfe09132c5", "size": 1451}
+  ]
+};
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Cross-language alignment index for the generated word lists.
+Every source (Spanish) word gets a stable integer ID; for each target
+language the index records the translation and where the entry lives
+(topic file and offset), so tools and the app can jump between languages
+without scanning every topic file. IDs survive rebuilds: known words keep
+their ID, new words get the next free one and removed IDs are not reused.
+
+Usage:
+    python scripts/alignment.py lookup "piel" english russian
+    python scripts/alignment.py reverse "skin" english
+"""
+
+import json
+import sys
+import unicodedata
+from pathlib import Path
+
+from build_manifest import file_matches, write_if_changed
+from normalize import normalize_key
+
+ALIGNMENT_NAME = 'alignment.json'
+ALIGNMENT_VERSION = 1
+
+
+def _source_key(word):
+    return unicodedata.normalize('NFC', word.strip())
+
+
+def build_alignment(topic_sets, previous=None):
+    """
+    Build the alignment data from [(language, level, [(topic_key, topic_data)])].
+    previous is the earlier alignment data, used to keep IDs stable.
+    """
+    ids = {}
+    next_id = 0
+    if previous and previous.get('version') == ALIGNMENT_VERSION:
+        ids = {record['word']: int(word_id) for word_id, record in previous['words'].items()}
+        next_id = previous.get('next_id', max(ids.values(), default=-1) + 1)
+
+    files = []
+    words = {}
+    for language, level, topics in topic_sets:
+        for topic_key, topic_data in topics:
+            entries = topic_data if isinstance(topic_data, list) else topic_data.get('words', [])
+            file_index = len(files)
+            files.append(f'{language}/{level}/{topic_key}.json')
+            for offset, entry in enumerate(entries):
+                word = _source_key(entry.get('word', ''))
+                if not word:
+                    continue
+                word_id = ids.get(word)
+                if word_id is None:
+                    word_id = ids[word] = next_id
+                    next_id += 1
+                record = words.setdefault(word_id, {'word': word, 'targets': {}})
+                record['targets'].setdefault(language, []).append(
+                    [file_index, offset, entry.get('translation', word)]
+                )
+
+    return {
+        'version': ALIGNMENT_VERSION,
+        'next_id': next_id,
+        'files': files,
+        'words': {str(word_id): words[word_id] for word_id in sorted(words)}
+    }
+
+
+def write_alignment(base_dir, topic_sets, dry_run=False):
+    """Rebuild alignment.json below base_dir; returns True if it changed."""
+    path = Path(base_dir) / ALIGNMENT_NAME
+    previous = None
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+    data = build_alignment(topic_sets, previous)
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if dry_run:
+        return not file_matches(path, payload)
+    return write_if_changed(path, payload)
+
+
+class AlignmentIndex:
+    """Query API over alignment.json with O(1) lookups in both directions."""
+
+    def __init__(self, data):
+        self.files = data['files']
+        self.words = {int(word_id): record for word_id, record in data['words'].items()}
+        self._by_word = {}
+        self._by_translation = {}
+        for word_id, record in self.words.items():
+            self._by_word.setdefault(normalize_key(record['word']), []).append(word_id)
+            for language, targets in record['targets'].items():
+                for _, _, translation in targets:
+                    ids = self._by_translation.setdefault((language, normalize_key(translation)), [])
+                    if word_id not in ids:
+                        ids.append(word_id)
+
+    @classmethod
+    def load(cls, path=f'data/word_lists/{ALIGNMENT_NAME}'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def ids_for(self, word):
+        """IDs of source words matching word (case- and whitespace-insensitive)."""
+        return list(self._by_word.get(normalize_key(word), []))
+
+    def _targets(self, word_id, langs):
+        record = self.words[word_id]
+        result = {}
+        for language, targets in record['targets'].items():
+            if langs and language not in langs:
+                continue
+            result[language] = [
+                {'translation': translation, 'file': self.files[file_index], 'offset': offset}
+                for file_index, offset, translation in targets
+            ]
+        return result
+
+    def lookup(self, word, langs=None):
+        """
+        Return [{'id', 'word', 'targets': {language: [{'translation', 'file', 'offset'}]}}]
+        for a source word, optionally restricted to some languages.
+        """
+        return [
+            {'id': word_id, 'word': self.words[word_id]['word'], 'targets': self._targets(word_id, langs)}
+            for word_id in self.ids_for(word)
+        ]
+
+    def reverse_lookup(self, translation, lang):
+        """Return [{'id', 'word'}] for source words translated as translation in lang."""
+        return [
+            {'id': word_id, 'word': self.words[word_id]['word']}
+            for word_id in self._by_translation.get((lang, normalize_key(translation)), [])
+        ]
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ('lookup', 'reverse'):
+        print('Usage: python scripts/alignment.py lookup WORD [LANG...]')
+        print('       python scripts/alignment.py reverse TRANSLATION LANG')
+        return 2
+    index = AlignmentIndex.load()
+    if sys.argv[1] == 'lookup':
+        result = index.lookup(sys.argv[2], sys.argv[3:] or None)
+    else:
+        if len(sys.argv) < 4:
+            print('reverse needs a language, e.g. english')
+            return 2
+        result = index.reverse_lookup(sys.argv[2], sys.argv[3])
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 0 if result else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
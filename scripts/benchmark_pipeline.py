@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark the word-list build pipeline.
+Builds synthetic vocabulary files at 1x, 10x and 100x the size of
+spanish_b2_words.txt with the topical generator through the real pipeline
+(wordlist_pipeline.generate: parsing, dedup, build_topic with translation,
+examples and answer keys, serialization, writing, distractors, bundles and
+the alignment and search indexes), reads the time of every stage from the
+build's own stage timers (see instrumentation), records the peak memory of
+the build and writes the results to JSON so runs can be compared across
+commits.
+
+Usage:
+    python scripts/benchmark_pipeline.py --output bench.json
+    python scripts/benchmark_pipeline.py --compare bench.json --threshold 0.25
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from build_vocabulary import build_langs, load_config
+import generate_enhanced_word_lists as generator
+import instrumentation
+from wordlist_pipeline import generate
+
+SOURCE = 'data/word_lists/spanish_b2_words.txt'
+SCALES = (1, 10, 100)
+# Reporting order of the pipeline's stages; 'topic' includes the ones below it
+STAGES = ('parse', 'dedup', 'topic', 'translate', 'examples', 'answer_keys', 'serialize',
+          'write', 'load_topics', 'distractors', 'bundle', 'alignment', 'search_index')
+RESULTS_VERSION = 2
+LEVEL = 'bench'
+
+
+def make_corpus(source, scale, target):
+    """Write scale copies of source to target; each copy gets its own topic names."""
+    lines = Path(source).read_text(encoding='utf-8').split('\n')
+    with open(target, 'w', encoding='utf-8') as f:
+        for copy in range(scale):
+            for line in lines:
+                if copy and line.startswith('##'):
+                    line = f'{line.rstrip()} {copy}'
+                f.write(line + '\n')
+    return len(lines) * scale
+
+
+def run_build(src_file, out_dir):
+    """
+    Build src_file from scratch into out_dir with the shipped pipeline and
+    return the seconds per stage and the bytes of the topic files.
+    """
+    config = load_config()
+    langs = build_langs(config, config['builds']['topical'])
+    instrumentation.enable()
+    try:
+        # The per-file log of a 100x build would drown the results
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate([LEVEL], {LEVEL: str(src_file)}, langs, generator.parse_file,
+                     generator.build_topic, generator.get_fingerprint(), base_dir=out_dir,
+                     force=True, precache=False, patches=False)
+        stats = instrumentation.get_recorder().stats()
+    finally:
+        instrumentation.disable()
+    seconds = {name: timing['wall'] for name, timing in stats['stages'].items()}
+    return seconds, stats['counters'].get('bytes_serialized', 0)
+
+
+def build_peak(src_file, out_dir):
+    """Run the build again under tracemalloc and return its peak bytes."""
+    tracemalloc.start()
+    try:
+        run_build(src_file, out_dir)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark(scales, repeat, memory):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='vocab-bench-') as tmp:
+        tmp = Path(tmp)
+        for scale in scales:
+            src_file = tmp / f'corpus_{scale}x.txt'
+            lines = make_corpus(SOURCE, scale, src_file)
+            print(f"⏱️  {scale}x ({lines} lines)...")
+
+            best = {}
+            for run in range(repeat):
+                timings, output_bytes = run_build(src_file, tmp / f'out_{scale}x_{run}')
+                for stage, seconds in timings.items():
+                    best[stage] = min(best.get(stage, seconds), seconds)
+            peak = build_peak(src_file, tmp / f'out_{scale}x_mem') if memory else None
+
+            stages = sorted(best, key=lambda name: STAGES.index(name) if name in STAGES else len(STAGES))
+            results[f'{scale}x'] = {
+                'lines': lines,
+                'output_bytes': output_bytes,
+                'peak_bytes': peak,
+                'stages': {stage: {'seconds': round(best[stage], 6)} for stage in stages}
+            }
+            for stage in stages:
+                print(f"   {stage:<13} {best[stage] * 1000:9.1f} ms")
+            if peak is not None:
+                print(f"   peak memory   {peak / 1e6:9.1f} MB")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Return the list of stage regressions beyond threshold (a fraction, e.g. 0.2)."""
+    if baseline.get('version') != RESULTS_VERSION:
+        raise ValueError(f"results version {baseline.get('version')!r} measured other stages; "
+                         f"re-run the baseline with this version ({RESULTS_VERSION})")
+    regressions = []
+    for scale, current in results.items():
+        previous = baseline.get('results', {}).get(scale)
+        if not previous:
+            continue
+        for stage, timing in current['stages'].items():
+            old = previous['stages'].get(stage, {}).get('seconds')
+            if old and timing['seconds'] > old * (1 + threshold):
+                regressions.append(
+                    f"{scale} {stage}: {old * 1000:.1f} ms -> {timing['seconds'] * 1000:.1f} ms "
+                    f"(+{(timing['seconds'] / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the vocabulary build pipeline.')
+    parser.add_argument('--scales', type=int, nargs='+', default=list(SCALES),
+                        help='corpus sizes as multiples of spanish_b2_words.txt (default: 1 10 100)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per scale; the fastest is kept')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the tracemalloc pass that measures peak memory')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='compare against an earlier results file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown per stage before --compare fails (default: 0.2 = 20%%)')
+    args = parser.parse_args()
+
+    results = benchmark(args.scales, max(1, args.repeat), args.memory)
+    report = {
+        'version': RESULTS_VERSION,
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        try:
+            regressions = compare(results, baseline, args.threshold)
+        except ValueError as e:
+            print(f"❌ Cannot compare against {args.compare}: {e}")
+            return 1
+        if regressions:
+            print(f"❌ {len(regressions)} stage(s) slower than {args.compare} by more than {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"✅ No regressions against {args.compare} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
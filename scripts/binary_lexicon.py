@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Compiled, memory-mapped translation lexicon.
+The builder writes the normalized lexicon indexes to one binary file: a
+header, a per-language directory, sorted fixed-size records per table and a
+shared UTF-8 string pool. The reader maps the file and binary-searches the
+records in place, so opening it costs the same for ten entries or a million,
+and only the strings a lookup touches are ever decoded.
+
+The header also records the fingerprint of the generator tables the file
+was compiled from (before any --tsv dictionaries were merged in), and a
+build refuses a lexicon compiled from other tables than its own.
+
+Layout (little-endian, offsets are absolute):
+    header     magic 'VLEX', version, language count, table fingerprint,
+               source table fingerprint
+    directory  per language: name, exact table, accent-folded table
+    tables     records of (key offset, key length, value offset, value length),
+               sorted by the UTF-8 bytes of the key
+    pool       deduplicated UTF-8 strings
+
+Usage:
+    python scripts/binary_lexicon.py build data/lexicon.bin
+    python scripts/binary_lexicon.py build basic.bin --build basic
+    python scripts/binary_lexicon.py build big.bin --tsv en es-en.tsv
+    python scripts/binary_lexicon.py lookup data/lexicon.bin en alegria
+    python scripts/generate_enhanced_word_lists.py --lexicon data/lexicon.bin
+"""
+
+import argparse
+import importlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from build_manifest import write_if_changed
+from lexicon import Lexicon, build_indexes, new_counters, tables_fingerprint
+from normalize import normalize_key
+from translation_provider import cached_tables
+
+MAGIC = b'VLEX'
+BINARY_VERSION = 2
+HEADER = struct.Struct('<4sII64s64s')
+DIRECTORY = struct.Struct('<IIIIII')
+RECORD = struct.Struct('<IIII')
+# Set by --lexicon; read through the environment so pool workers inherit it
+LEXICON_ENV = 'VOCAB_LEXICON'
+# Set from build_config.json: 'module:function' returning the translation tables
+TRANSLATIONS_ENV = 'VOCAB_TRANSLATIONS'
+
+
+def source_fingerprint(tables):
+    """Fingerprint of a build's translation tables, as recorded by encode_lexicon."""
+    return tables_fingerprint(build_indexes(tables)[0])
+
+
+def encode_lexicon(tables, source_tables=None):
+    """
+    Compile {lang: {source_word: translation}} into the binary format;
+    source_tables are the generator tables they extend (default: tables).
+    """
+    exact, folded = build_indexes(tables)
+    source = tables_fingerprint(exact) if source_tables is None else source_fingerprint(source_tables)
+    languages = sorted(exact)
+
+    pool = bytearray()
+    pool_offsets = {}
+
+    def intern(text):
+        data = text.encode('utf-8')
+        if data not in pool_offsets:
+            pool_offsets[data] = len(pool)
+            pool.extend(data)
+        return pool_offsets[data], len(data)
+
+    # Record offsets are relative to the pool until its position is known
+    tables_out = []
+    for lang in languages:
+        name = intern(lang)
+        sections = []
+        for index in (exact[lang], folded[lang]):
+            records = sorted(index.items(), key=lambda item: item[0].encode('utf-8'))
+            sections.append([intern(key) + intern(value) for key, value in records])
+        tables_out.append((name, sections))
+
+    record_count = sum(len(records) for _, sections in tables_out for records in sections)
+    tables_start = HEADER.size + DIRECTORY.size * len(languages)
+    pool_start = tables_start + RECORD.size * record_count
+
+    directory = bytearray()
+    records_out = bytearray()
+    for (name_off, name_len), sections in tables_out:
+        positions = []
+        for records in sections:
+            positions += [tables_start + len(records_out), len(records)]
+            for key_off, key_len, value_off, value_len in records:
+                records_out += RECORD.pack(pool_start + key_off, key_len, pool_start + value_off, value_len)
+        directory += DIRECTORY.pack(pool_start + name_off, name_len, *positions)
+
+    header = HEADER.pack(MAGIC, BINARY_VERSION, len(languages), tables_fingerprint(exact).encode('ascii'),
+                         source.encode('ascii'))
+    return header + bytes(directory) + bytes(records_out) + bytes(pool)
+
+
+def write_lexicon(path, tables, source_tables=None):
+    """Compile tables to path; returns True if the file changed."""
+    return write_if_changed(path, encode_lexicon(tables, source_tables))
+
+
+class MappedTable:
+    """Read-only mapping over one sorted record table inside the mapped file."""
+
+    def __init__(self, buffer, offset, count):
+        self._buffer = buffer
+        self._offset = offset
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def _record(self, index):
+        return RECORD.unpack_from(self._buffer, self._offset + index * RECORD.size)
+
+    def get(self, key, default=None):
+        target = key.encode('utf-8')
+        buffer = self._buffer
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_off, key_len, value_off, value_len = self._record(mid)
+            probe = buffer[key_off:key_off + key_len]
+            if probe < target:
+                lo = mid + 1
+            elif probe > target:
+                hi = mid
+            else:
+                return buffer[value_off:value_off + value_len].decode('utf-8')
+        return default
+
+    def items(self):
+        buffer = self._buffer
+        for index in range(self._count):
+            key_off, key_len, value_off, value_len = self._record(index)
+            yield (buffer[key_off:key_off + key_len].decode('utf-8'),
+                   buffer[value_off:value_off + value_len].decode('utf-8'))
+
+
+class BinaryLexicon(Lexicon):
+    """A Lexicon whose indexes live in a memory-mapped file built by write_lexicon."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, fingerprint, source = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != BINARY_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a version {BINARY_VERSION} binary lexicon")
+        self._fingerprint = fingerprint.decode('ascii')
+        self.source_fingerprint = source.decode('ascii')
+
+        exact = {}
+        folded = {}
+        for i in range(count):
+            name_off, name_len, exact_off, exact_count, folded_off, folded_count = \
+                DIRECTORY.unpack_from(self._mmap, HEADER.size + i * DIRECTORY.size)
+            lang = self._mmap[name_off:name_off + name_len].decode('utf-8')
+            exact[lang] = MappedTable(self._mmap, exact_off, exact_count)
+            folded[lang] = MappedTable(self._mmap, folded_off, folded_count)
+        self._exact = exact
+        self._folded = folded
+        self._stats = {lang: new_counters() for lang in exact}
+
+    def tables_fingerprint(self):
+        # Stored by the builder; equal to Lexicon(tables).tables_fingerprint()
+        return self._fingerprint
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def use_binary_lexicon(path):
+    """Make open_lexicon() read path, in this process and in its workers; None stops it."""
+    if path:
+        os.environ[LEXICON_ENV] = os.path.abspath(path)
+    else:
+        os.environ.pop(LEXICON_ENV, None)
+
+
+def use_translation_tables(spec):
+    """Make open_lexicon() build its tables with 'module:function'; None restores the default."""
+    if spec:
+        os.environ[TRANSLATIONS_ENV] = spec
+    else:
+        os.environ.pop(TRANSLATIONS_ENV, None)
+
+
+def resolve_tables(spec):
+    """The table function named by 'module:function'."""
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+
+def check_lexicon(path, spec):
+    """
+    Raise ValueError unless the binary lexicon at path was compiled from the
+    tables of spec ('module:function'), e.g. those of the build using it.
+    """
+    with BinaryLexicon(path) as lexicon:
+        compiled_from = lexicon.source_fingerprint
+    if compiled_from != source_fingerprint(resolve_tables(spec)()):
+        raise ValueError(f"{path} was not compiled from the current {spec} tables; rebuild it with "
+                         f"python scripts/binary_lexicon.py build {path} --translations {spec}")
+
+
+def open_lexicon(build_tables):
+    """
+    Open the binary lexicon selected by use_binary_lexicon, else
+    Lexicon(build_tables()), where use_translation_tables may replace
+    build_tables, falling back to the translation-provider cache selected
+    by translation_provider.use_translation_cache.
+    """
+    path = os.environ.get(LEXICON_ENV)
+    spec = os.environ.get(TRANSLATIONS_ENV)
+    if spec:
+        build_tables = resolve_tables(spec)
+    lexicon = BinaryLexicon(path) if path else Lexicon(build_tables())
+    fallback = cached_tables()
+    if fallback:
+        lexicon.set_fallback(fallback)
+    return lexicon
+
+
+def read_tsv(path):
+    """Read 'source<TAB>translation' lines, skipping blanks and '#' comments."""
+    table = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if not line.strip() or line.startswith('#') or '\t' not in line:
+                continue
+            source, translation = line.split('\t', 1)
+            table.setdefault(source.strip(), translation.strip())
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query a compiled binary lexicon.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="compile a build's translation tables")
+    build.add_argument('output')
+    build.add_argument('--config', default='scripts/build_config.json', metavar='FILE',
+                       help='build config naming the tables (default: scripts/build_config.json)')
+    build.add_argument('--build', default='topical', metavar='NAME',
+                       help="compile the tables of this build of the config (default: topical)")
+    build.add_argument('--translations', metavar='MODULE:FUNCTION',
+                       help='compile the tables returned by this function instead')
+    build.add_argument('--tsv', nargs=2, action='append', default=[], metavar=('LANG', 'FILE'),
+                       help='add a tab-separated bilingual dictionary for LANG (repeatable); '
+                            'the generator tables win on conflicts')
+    lookup = commands.add_parser('lookup', help='translate words with a compiled lexicon')
+    lookup.add_argument('lexicon')
+    lookup.add_argument('lang')
+    lookup.add_argument('words', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        spec = args.translations
+        if not spec:
+            with open(args.config, 'r', encoding='utf-8') as f:
+                spec = json.load(f)['builds'].get(args.build, {}).get('translations')
+            if not spec:
+                parser.error(f"build {args.build!r} of {args.config} names no translation tables")
+        source_tables = resolve_tables(spec)()
+        tables = {lang: dict(table) for lang, table in source_tables.items()}
+        for lang, tsv in args.tsv:
+            external = read_tsv(tsv)
+            merged = tables.setdefault(lang, {})
+            known = {normalize_key(source) for source in merged}
+            merged.update((s, t) for s, t in external.items() if normalize_key(s) not in known)
+            print(f"Read {len(external)} entries for {lang} from {tsv}")
+        changed = write_lexicon(args.output, tables, source_tables)
+        entries = sum(len(table) for table in tables.values())
+        print(f"{'Written' if changed else 'Unchanged'} {args.output} from {spec} ({entries} entries, "
+              f"{os.path.getsize(args.output)} bytes)")
+        return 0
+
+    with BinaryLexicon(args.lexicon) as lexicon:
+        for word in args.words:
+            print(f"{word} -> {lexicon.translate(word, args.lang)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Build manifest for incremental word-list generation.
+Records a hash of the inputs behind every generated file so that a rebuild
+only regenerates and rewrites the files whose inputs actually changed.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+
+def content_hash(*parts):
+    """Return a stable sha256 over JSON-serializable parts."""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def bytes_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_matches(path, payload):
+    """True if the file at path already holds exactly payload (bytes)."""
+    path = Path(path)
+    try:
+        return path.stat().st_size == len(payload) and path.read_bytes() == payload
+    except FileNotFoundError:
+        return False
+
+
+def write_if_changed(path, payload):
+    """
+    Write payload (bytes) to path unless the file already holds exactly that
+    content. Untouched files keep their mtime, and therefore their ETag.
+    Returns True if the file was written.
+    """
+    path = Path(path)
+    if file_matches(path, payload):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(payload)
+    tmp_path.replace(path)
+    return True
+
+
+class BuildManifest:
+    """
+    Maps each generated file (relative to the output root) to the hash of the
+    inputs it was built from and the hash of the bytes that were written.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.files = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.files = data.get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable build manifest {self.path}: {e}")
+
+    def is_fresh(self, rel_path, input_hash, root):
+        """True if rel_path was built from input_hash and is still on disk unchanged."""
+        record = self.files.get(rel_path)
+        if not record or record.get('input') != input_hash:
+            return False
+        path = Path(root) / rel_path
+        try:
+            # The size check is cheap and catches most edits; the hash catches the rest
+            if path.stat().st_size != record.get('size'):
+                return False
+            return bytes_hash(path.read_bytes()) == record.get('output')
+        except FileNotFoundError:
+            return False
+
+    def record(self, rel_path, input_hash, payload, build=None):
+        """Record a written file; build names the build that owns it, if any."""
+        self.files[rel_path] = {
+            'input': input_hash,
+            'output': bytes_hash(payload),
+            'size': len(payload)
+        }
+        if build:
+            self.files[rel_path]['build'] = build
+
+    def forget(self, rel_path):
+        """Drop the record of a file the build no longer produces."""
+        self.files.pop(rel_path, None)
+
+    def save(self):
+        data = {
+            'version': MANIFEST_VERSION,
+            'files': dict(sorted(self.files.items()))
+        }
+        payload = (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+        write_if_changed(self.path, payload)
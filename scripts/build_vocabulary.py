@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the word-list builds, driven by build_config.json.
+The config declares the output directory, the web root (the directory of
+sw.js, which gets precache-manifest.js), the languages and, per build, the
+generator module that turns words into topic files (its parse_file,
+build_topic and get_fingerprint), the levels with their source files, the
+target languages, the translation tables and example engine to use (as
+'module:function') and default pipeline options. Options given on the
+command line override the config.
+
+--level, --lang and --topic restrict the builds to a slice: only those
+levels are parsed and only those topic files are built and written, so
+iterating on one topic does not regenerate the whole tree. --watch keeps
+running after the build and rebuilds what each edit affects (see watcher.py).
+When several builds run, each writes its own --profile and --trace file,
+named after the build (build.prof -> build.topical.prof, build.pages.prof).
+
+Usage:
+    python scripts/build_vocabulary.py
+    python scripts/build_vocabulary.py --level b2 --lang russian --topic ocio
+    python scripts/build_vocabulary.py --build basic --force
+    python scripts/build_vocabulary.py --watch
+"""
+
+import argparse
+import importlib
+import json
+from pathlib import Path
+
+from binary_lexicon import check_lexicon, use_binary_lexicon, use_translation_tables
+from example_engine import use_example_engine
+from translation_provider import fill_missing_translations, use_translation_cache
+from watcher import DEBOUNCE, watch
+from wordlist_pipeline import add_build_arguments, generate
+
+DEFAULT_CONFIG = 'scripts/build_config.json'
+CONFIG_VERSION = 1
+# Indexes over every language/level in the output. A build that switches one
+# off in its config options (like 'pages', whose English lists have no
+# Spanish source) never writes it, not even when the option is given on the
+# command line, because the index would then only cover that build's levels.
+SHARED_INDEXES = ('alignment', 'search', 'sqlite')
+
+
+def load_config(path=DEFAULT_CONFIG):
+    """Read a build config; raises ValueError if it is malformed."""
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    if config.get('version') != CONFIG_VERSION:
+        raise ValueError(f"{path}: unsupported config version {config.get('version')!r}")
+    for name, build in config.get('builds', {}).items():
+        for key in ('generator', 'levels', 'languages'):
+            if key not in build:
+                raise ValueError(f"{path}: build {name!r} has no {key!r}")
+        unknown = [code for code in build['languages'] if code not in config['languages']]
+        if unknown:
+            raise ValueError(f"{path}: build {name!r} uses undeclared language(s) {', '.join(unknown)}")
+    return config
+
+
+def build_langs(config, build):
+    """The build's languages as the pipeline's [{'code', 'tcode'}] list."""
+    return [{'code': code, 'tcode': config['languages'][code]} for code in build['languages']]
+
+
+def default_builds(config):
+    """Builds run when none is named: every build not marked "default": false."""
+    return [name for name, build in config['builds'].items() if build.get('default', True)]
+
+
+def make_parser(description=None, builds=None):
+    """Command-line options: build and slice selection plus the pipeline's options."""
+    parser = argparse.ArgumentParser(
+        description=description or 'Build the word lists declared in build_config.json.')
+    parser.add_argument('--config', default=DEFAULT_CONFIG, metavar='FILE',
+                        help=f'build config (default: {DEFAULT_CONFIG})')
+    if builds is None:
+        parser.add_argument('--build', action='append', metavar='NAME',
+                            help='run this build of the config (repeatable; default: every build '
+                                 'not marked "default": false)')
+    parser.add_argument('--level', action='append', metavar='LEVEL',
+                        help='only parse and build this level (repeatable)')
+    parser.add_argument('--lang', action='append', metavar='LANGUAGE',
+                        help='only build this language, e.g. russian (repeatable)')
+    parser.add_argument('--topic', action='append', metavar='TOPIC',
+                        help='only build this topic, with all its pages (repeatable)')
+    parser.add_argument('--watch', action='store_true',
+                        help='after building, watch the sources and rebuild the topics each edit changes')
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE, metavar='SECONDS',
+                        help=f'with --watch, wait for this much quiet before rebuilding (default: {DEBOUNCE:g})')
+    parser.add_argument('--poll', action='store_true',
+                        help='with --watch, poll file stats instead of using inotify')
+    add_build_arguments(parser)
+    return parser
+
+
+def per_build_path(path, name):
+    """path with the build name before its suffix, e.g. build.prof -> build.topical.prof."""
+    path = Path(path)
+    return str(path.with_name(f'{path.stem}.{name}{path.suffix}'))
+
+
+def run_build(name, config, args, parse_file=None):
+    """
+    Run one build of config with the parsed options; returns the changed
+    paths. parse_file replaces the generator's (the watcher's is cached).
+    """
+    build = config['builds'][name]
+    options = build.get('options', {})
+    only_levels = [level for level in args.level or () if level in build['levels']]
+    only_langs = [code for code in args.lang or () if code in build['languages']]
+    if (args.level and not only_levels) or (args.lang and not only_langs):
+        print(f"Skipping {name}: no level or language of the slice")
+        return []
+    for option in SHARED_INDEXES:
+        if option in options and not options[option]:
+            setattr(args, option, options[option])
+
+    print(f"🔨 {name} ({build['generator']})")
+    # A build without translation tables has no use for --lexicon
+    lexicon = args.lexicon if build.get('translations') else None
+    if lexicon:
+        try:
+            check_lexicon(lexicon, build['translations'])
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"Cannot use --lexicon for {name}: {e}")
+    use_binary_lexicon(lexicon)
+    use_translation_tables(build.get('translations'))
+    use_example_engine(build.get('examples'))
+    generator = importlib.import_module(build['generator'])
+    parse_file = parse_file or generator.parse_file
+    levels = list(build['levels'])
+    langs = build_langs(config, build)
+    get_lexicon = getattr(generator, 'get_lexicon', None)
+    if args.provider and get_lexicon:
+        fill_missing_translations(get_lexicon, only_levels or levels, build['levels'], parse_file,
+                                  langs, generator.SOURCE_LANGUAGE, args.provider,
+                                  args.translation_cache, args.provider_concurrency, args.provider_rate)
+    else:
+        # A provider of an earlier build in this process must not leak into this one
+        use_translation_cache(None)
+
+    changed = generate(levels, build['levels'], langs, parse_file, generator.build_topic,
+                       generator.get_fingerprint(), base_dir=config['output'],
+                       app_root=config.get('web_root', '.'),
+                       force=args.force, dry_run=args.dry_run, jobs=args.jobs,
+                       stats_providers=getattr(generator, 'STATS_PROVIDERS', ()), bundle=args.bundle,
+                       distractors=args.distractors, page_size=args.page_size,
+                       page_order=args.page_order, frequencies=args.frequencies,
+                       compact=args.compact, alignment=args.alignment, search=args.search,
+                       precache=args.precache, dedup=args.dedup, patches=args.patches,
+                       sqlite=args.sqlite, profile=args.profile, trace=args.trace,
+                       only_levels=only_levels, only_langs=only_langs, only_topics=args.topic,
+                       build_name=name)
+    if hasattr(generator, 'print_stats'):
+        generator.print_stats()
+    print(f"✅ {name}: word lists generated.")
+    return changed
+
+
+def main(argv=None, builds=None, description=None):
+    """Run the named builds (default: the config's default builds) on the requested slice."""
+    args = make_parser(description, builds).parse_args(argv)
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError, KeyError) as e:
+        raise SystemExit(f"Cannot read build config: {e}")
+    names = builds or args.build or default_builds(config)
+    unknown = [name for name in names if name not in config['builds']]
+    if unknown:
+        raise SystemExit(f"Unknown build(s) {', '.join(unknown)}; the config has {', '.join(config['builds'])}")
+    for option, values, key in (('--level', args.level, 'levels'), ('--lang', args.lang, 'languages')):
+        declared = {value for name in names for value in config['builds'][name][key]}
+        unknown = [value for value in values or () if value not in declared]
+        if unknown:
+            raise SystemExit(f"{option} {', '.join(unknown)} is not part of {', '.join(names)}")
+
+    build_args = {}
+    for name in names:
+        # Each build starts from its own config options; the command line overrides them
+        parser = make_parser(description, builds)
+        parser.set_defaults(**config['builds'][name].get('options', {}))
+        build_args[name] = parser.parse_args(argv)
+        if len(names) > 1:
+            # One profile and trace file per build instead of each build overwriting the last
+            for option in ('profile', 'trace'):
+                if getattr(build_args[name], option):
+                    setattr(build_args[name], option, per_build_path(getattr(build_args[name], option), name))
+        run_build(name, config, build_args[name])
+    if args.watch:
+        watch(config, names, build_args, run_build, debounce=args.debounce, poll=args.poll)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Single-file vocabulary bundles, one per language/level.
+A bundle holds the topic index, each topic's entry rows and every entry
+once, so the app can load a whole level in one request instead of index.json
+plus one request per topic. Bundles get a content-hashed file name, precompressed .gz/.br
+siblings and an entry in bundles.json, which the frontend reads first.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+from build_manifest import bytes_hash, file_matches, write_if_changed
+
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are skipped without it
+    brotli = None
+
+BUNDLE_VERSION = 2
+BUNDLE_MANIFEST = 'bundles.json'
+
+
+def build_bundle(language, level, packed, distractors=None):
+    """
+    Serialize dedup.pack_entries() output for one language/level into one
+    compact bundle. Entries are stored once, as rows of values in 'fields'
+    order; each index item lists the rows of its topic, so an entry shared by
+    several topics appears in several lists. distractors, if given, is
+    entry_distractors() output: one list of row indices per entry.
+    """
+    entries, _, topic_rows = packed
+    fields = []
+    for entry in entries:
+        for field in entry:
+            if field not in fields:
+                fields.append(field)
+
+    bundle = {
+        'version': BUNDLE_VERSION,
+        'language': language,
+        'level': level,
+        'fields': fields,
+        'index': [{'key': key, 'topic': topic, 'rows': rows} for key, topic, rows in topic_rows],
+        'entries': [[entry.get(field) for field in fields] for entry in entries]
+    }
+    if distractors is not None:
+        bundle['distractors'] = distractors['rows']
+        bundle['distractors_key'] = distractors['key']
+    return json.dumps(bundle, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compressed_variants(payload):
+    """Return {suffix: bytes} for every precompressed sibling we can produce."""
+    # mtime=0 keeps the .gz output byte-identical across builds
+    variants = {'.gz': gzip.compress(payload, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(payload, quality=11)
+    return variants
+
+
+def write_bundle(base_dir, language, level, payload, dry_run=False):
+    """
+    Write a bundle and its compressed siblings under <language>/<level>/,
+    removing bundles from earlier builds. Returns (manifest record, changed).
+    """
+    base_dir = Path(base_dir)
+    digest = bytes_hash(payload)
+    lang_dir = base_dir / language / level
+    name = f'bundle.{digest[:12]}.json'
+    path = lang_dir / name
+    variants = compressed_variants(payload)
+
+    changed = not file_matches(path, payload)
+    if not dry_run:
+        write_if_changed(path, payload)
+        for suffix, data in variants.items():
+            write_if_changed(path.with_name(name + suffix), data)
+        keep = {name} | {name + suffix for suffix in variants}
+        for old in lang_dir.glob('bundle.*.json*'):
+            if old.name not in keep:
+                old.unlink()
+
+    bundle = json.loads(payload)
+    record = {
+        'file': f'{language}/{level}/{name}',
+        'hash': digest,
+        'size': len(payload),
+        'encodings': sorted('gzip' if s == '.gz' else 'br' for s in variants),
+        'topics': len(bundle['index']),
+        'entries': len(bundle['entries'])
+    }
+    return record, changed
+
+
+def read_bundle_manifest(base_dir):
+    """The records of bundles.json as {'<language>/<level>': record}; {} if there is none."""
+    path = Path(base_dir) / BUNDLE_MANIFEST
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('bundles', {})
+
+
+def update_bundle_manifest(base_dir, records, dry_run=False):
+    """Merge {'<language>/<level>': record} into bundles.json; returns True if it changed."""
+    path = Path(base_dir) / BUNDLE_MANIFEST
+    bundles = read_bundle_manifest(base_dir)
+    bundles.update(records)
+    manifest = {'version': BUNDLE_VERSION, 'bundles': dict(sorted(bundles.items()))}
+    payload = (json.dumps(manifest, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+    if dry_run:
+        return not file_matches(path, payload)
+    return write_if_changed(path, payload)
+
+
+def load_bundle(base_dir, language, level):
+    """Return the current bundle of a language/level as listed in bundles.json, or None."""
+    base_dir = Path(base_dir)
+    try:
+        with open(base_dir / BUNDLE_MANIFEST, 'r', encoding='utf-8') as f:
+            record = json.load(f).get('bundles', {}).get(f'{language}/{level}')
+        if record is None:
+            return None
+        with open(base_dir / record['file'], 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_bundle(path):
+    """Expand a bundle back into {topic_key: {'topic': ..., 'words': [...]}}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        bundle = json.load(f)
+    fields = bundle['fields']
+    result = {}
+    for item in bundle['index']:
+        if 'rows' in item:
+            rows = [bundle['entries'][row] for row in item['rows']]
+        else:  # version 1: each topic's rows are contiguous
+            rows = bundle['entries'][item['offset']:item['offset'] + item['count']]
+        words = [{f: v for f, v in zip(fields, row) if v is not None} for row in rows]
+        result[item['key']] = {'topic': item['topic'], 'words': words}
+    return result
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Compact columnar format for topic JSON files.
+
+The regular topic file repeats the 'word'/'translation'/'example' keys for
+every entry and spells out template examples in full. The compact format
+stores one array per field, all strings in a shared, deduplicated string
+table, and examples that only differ by the entry's own translation as a
+single template such as 'The word "{translation}" is useful.'
+
+Layout:
+    {"format": "columnar", "version": 1, "topic": "...", "count": N,
+     "fields": ["word", "translation", "example"],
+     "strings": ["...", ...],
+     "columns": [[0, 3, ...], [1, 4, ...], [2, -6, ...]]}
+
+A column value v >= 0 is strings[v]; v < 0 is the template strings[-v - 1]
+with its {field} placeholder filled from the same entry; a list is a list of
+strings (e.g. answer keys) and null is a missing field. Usage: python scripts/compact_format.py check FILE...
+"""
+
+import json
+import re
+import sys
+
+FORMAT_NAME = 'columnar'
+FORMAT_VERSION = 1
+TEMPLATE_FIELDS = ('example',)
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+def _template_for(text, entry, field):
+    """Return text with another field's value replaced by a {name} placeholder, or None."""
+    if '{' in text or '}' in text:
+        return None
+    for name in ('translation', 'word'):
+        value = entry.get(name)
+        if name != field and isinstance(value, str) and value and text.count(value) == 1:
+            return text.replace(value, '{' + name + '}')
+    return None
+
+
+def encode_topic(topic_data):
+    """Encode {'topic': ..., 'words': [...]} (or a bare entry list) as columnar data."""
+    if isinstance(topic_data, list):
+        topic, words = None, topic_data
+    else:
+        topic, words = topic_data.get('topic'), topic_data.get('words', [])
+
+    fields = []
+    for entry in words:
+        for field in entry:
+            if field not in fields:
+                fields.append(field)
+
+    strings = []
+    string_ids = {}
+
+    def intern(text):
+        string_id = string_ids.get(text)
+        if string_id is None:
+            string_id = string_ids[text] = len(strings)
+            strings.append(text)
+        return string_id
+
+    columns = []
+    for field in fields:
+        column = []
+        for entry in words:
+            value = entry.get(field)
+            if value is None:
+                column.append(None)
+                continue
+            if isinstance(value, list):
+                column.append([intern(item) for item in value])
+                continue
+            template = _template_for(value, entry, field) if field in TEMPLATE_FIELDS else None
+            column.append(-intern(template) - 1 if template is not None else intern(value))
+        columns.append(column)
+
+    encoded = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'count': len(words),
+        'fields': fields,
+        'strings': strings,
+        'columns': columns
+    }
+    if topic is not None:
+        encoded['topic'] = topic
+    return encoded
+
+
+def decode_topic(encoded):
+    """Turn columnar data back into {'topic': ..., 'words': [...]}."""
+    strings = encoded['strings']
+    fields = encoded['fields']
+    words = [{} for _ in range(encoded['count'])]
+
+    # Plain values first so templates can refer to any other field
+    templated = []
+    for field, column in zip(fields, encoded['columns']):
+        for entry, value in zip(words, column):
+            if value is None:
+                continue
+            if isinstance(value, list):
+                entry[field] = [strings[item] for item in value]
+            elif value >= 0:
+                entry[field] = strings[value]
+            else:
+                templated.append((entry, field, strings[-value - 1]))
+    for entry, field, template in templated:
+        entry[field] = PLACEHOLDER.sub(lambda m: entry[m.group(1)], template, count=1)
+
+    # Restore the original key order
+    words = [{field: entry[field] for field in fields if field in entry} for entry in words]
+    if 'topic' in encoded:
+        return {'topic': encoded['topic'], 'words': words}
+    return words
+
+
+def serialize_compact(topic_data):
+    """Serialize topic data in the compact format, without indentation."""
+    encoded = encode_topic(topic_data)
+    return json.dumps(encoded, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def is_compact(data):
+    return isinstance(data, dict) and data.get('format') == FORMAT_NAME
+
+
+def load_topic(payload):
+    """Parse topic file bytes in either format into the regular schema."""
+    data = json.loads(payload)
+    return decode_topic(data) if is_compact(data) else data
+
+
+def validate(encoded):
+    """Return a list of problems found in columnar data (empty if valid)."""
+    problems = []
+    if encoded.get('version') != FORMAT_VERSION:
+        problems.append(f"unsupported version {encoded.get('version')!r}")
+    fields = encoded.get('fields', [])
+    columns = encoded.get('columns', [])
+    strings = encoded.get('strings', [])
+    count = encoded.get('count')
+    if len(fields) != len(columns):
+        problems.append(f'{len(fields)} fields but {len(columns)} columns')
+    for field, column in zip(fields, columns):
+        if len(column) != count:
+            problems.append(f"column '{field}' has {len(column)} values, expected {count}")
+        for value in column:
+            if value is None:
+                continue
+            if isinstance(value, list):
+                if any(not 0 <= item < len(strings) for item in value):
+                    problems.append(f"column '{field}' refers to a missing string")
+                    break
+                continue
+            index = value if value >= 0 else -value - 1
+            if index >= len(strings):
+                problems.append(f"column '{field}' refers to missing string {index}")
+                break
+            if value < 0:
+                match = PLACEHOLDER.search(strings[index])
+                if not match or match.group(1) not in fields:
+                    problems.append(f"column '{field}' uses invalid template {strings[index]!r}")
+                    break
+    if len(set(strings)) != len(strings):
+        problems.append('string table contains duplicates')
+    if not problems:
+        # A valid file must survive a full round trip unchanged
+        if encode_topic(decode_topic(encoded)) != encoded:
+            problems.append('round trip does not reproduce the file')
+    return problems
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != 'check':
+        print('Usage: python scripts/compact_format.py check FILE...')
+        return 2
+    failed = 0
+    for path in sys.argv[2:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if is_compact(data):
+            problems = validate(data)
+        elif isinstance(data, dict) and 'words' in data or \
+                isinstance(data, list) and all(isinstance(entry, dict) for entry in data):
+            problems = validate(encode_topic(data))
+        else:
+            print(f"-  {path}: not a topic file, skipped")
+            continue
+        if problems:
+            failed += 1
+            for problem in problems:
+                print(f"❌ {path}: {problem}")
+        else:
+            print(f"✅ {path}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
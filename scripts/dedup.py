@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Build-time deduplication of vocabulary entries.
+Within a topic, words that differ only by case, accents or spacing collapse
+into their first spelling before any file is generated. Across topics, the
+repeats are reported, and each bundle stores a repeated entry once; every
+topic that lists it refers to the same row.
+"""
+
+import json
+from pathlib import Path
+
+from build_manifest import file_matches, write_if_changed
+from normalize import fold_key
+
+DEDUP_REPORT = 'dedup-report.json'
+# Bump when pack_entries changes which entries share a row, so bundles are rebuilt
+SHARE_VERSION = 2
+
+
+def dedupe_topics(topics_map):
+    """
+    Collapse in-topic variants of {topic_key: [words]}. Returns the cleaned
+    map and [{'topic', 'kept', 'merged': [dropped spellings]}].
+    """
+    result = {}
+    merges = []
+    for topic, words in topics_map.items():
+        seen = {}
+        kept = []
+        for word in words:
+            key = fold_key(word)
+            if key in seen:
+                seen[key]['merged'].append(word)
+                continue
+            seen[key] = {'topic': topic, 'kept': word, 'merged': []}
+            kept.append(word)
+        result[topic] = kept
+        merges += [record for record in seen.values() if record['merged']]
+    return result, merges
+
+
+def cross_topic_repeats(topics_map):
+    """Return [{'word', 'home', 'topics'}] for words listed in more than one topic."""
+    topics_by_key = {}
+    first_spelling = {}
+    for topic, words in topics_map.items():
+        for word in words:
+            key = fold_key(word)
+            first_spelling.setdefault(key, word)
+            topics = topics_by_key.setdefault(key, [])
+            if topic not in topics:
+                topics.append(topic)
+    return [
+        {'word': first_spelling[key], 'home': topics[0], 'topics': topics}
+        for key, topics in topics_by_key.items() if len(topics) > 1
+    ]
+
+
+def pack_entries(topics, share=True):
+    """
+    Flatten [(topic_key, topic_data)] into unique entries. Returns
+    (entries, homes, index): homes[i] is the topic that first listed entry i
+    and index is [(topic_key, display_name, [entry rows])]. With share, an
+    entry whose folded word and translation already appeared in an earlier
+    topic reuses that row. The example is part of the key, since generated
+    examples often name their topic and must not show up under another one.
+    """
+    entries = []
+    homes = []
+    rows_by_key = {}
+    index = []
+    for topic_key, topic_data in topics:
+        words = topic_data if isinstance(topic_data, list) else topic_data.get('words', [])
+        display_name = topic_data.get('topic') if isinstance(topic_data, dict) else None
+        rows = []
+        for entry in words:
+            key = (fold_key(entry.get('word', '')), entry.get('translation'), entry.get('example'))
+            row = rows_by_key.get(key) if share else None
+            if row is None:
+                row = len(entries)
+                entries.append(entry)
+                homes.append(topic_key)
+                rows_by_key.setdefault(key, row)
+            rows.append(row)
+        index.append((topic_key, display_name or topic_key.replace('_', ' ').title(), rows))
+    return entries, homes, index
+
+
+def write_dedup_report(base_dir, report, dry_run=False):
+    """
+    Merge report ({section: {level or language/level: details}}) into
+    dedup-report.json below base_dir, so builds of some levels keep the
+    others' sections. Returns True if the file changed.
+    """
+    path = Path(base_dir) / DEDUP_REPORT
+    merged = {}
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            merged = json.load(f)
+    for section, items in report.items():
+        merged[section] = dict(sorted({**merged.get(section, {}), **items}.items()))
+    payload = (json.dumps(merged, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+    if dry_run:
+        return not file_matches(path, payload)
+    return write_if_changed(path, payload)
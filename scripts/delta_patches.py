@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Delta patches between builds of the topic files.
+When a build rewrites a topic file, the difference to the previous version
+is stored as a small patch keyed by the revisions (the precache-manifest
+hashes) of the old and the new file. A patch lists the removed entries by
+old position and the added and modified entries by new position; applying
+it to the old file and serializing the result gives the new file byte for
+byte, which the build checks before it keeps a patch. patches.json lists the
+last PATCH_HISTORY patches per file, so the service worker can update a
+cached topic by following the chain instead of downloading it again.
+
+Usage:
+    python scripts/delta_patches.py apply old.json data/word_lists/patches/<from>-<to>.json -o new.json
+    python scripts/delta_patches.py verify old.json data/word_lists/patches/<from>-<to>.json new.json
+"""
+
+import argparse
+import difflib
+import json
+import sys
+from pathlib import Path
+
+from build_manifest import bytes_hash, file_matches, write_if_changed
+
+PATCH_DIR = 'patches'
+PATCH_INDEX = 'patches.json'
+PATCHES_VERSION = 1
+PATCH_HISTORY = 5
+
+
+def revision(payload):
+    """Short content hash of a file, the same one precache-manifest.js lists."""
+    return bytes_hash(payload)[:16]
+
+
+def serialize(data):
+    # The topic files' own format (wordlist_pipeline.serialize_json)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def diff_topic(old, new):
+    """Return the patch turning topic data old into new (without revisions)."""
+    old_words, new_words = old.get('words', []), new.get('words', [])
+    matcher = difflib.SequenceMatcher(None, [json.dumps(e.get('word')) for e in old_words],
+                                      [json.dumps(e.get('word')) for e in new_words], autojunk=False)
+    removed, added, modified = [], [], []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            modified += [[j1 + k, new_words[j1 + k]] for k in range(i2 - i1)
+                         if old_words[i1 + k] != new_words[j1 + k]]
+        else:
+            removed += range(i1, i2)
+            added += [[j, new_words[j]] for j in range(j1, j2)]
+    # Every top-level field but the words, in file order
+    document = {key: (None if key == 'words' else value) for key, value in new.items()}
+    return {'document': document, 'removed': removed, 'added': added, 'modified': modified}
+
+
+def apply_patch(data, patch):
+    """Apply a patch from diff_topic to topic data; returns the new data."""
+    removed = set(patch['removed'])
+    words = [entry for i, entry in enumerate(data.get('words', [])) if i not in removed]
+    for i, entry in patch['added']:
+        words.insert(i, entry)
+    for i, entry in patch['modified']:
+        words[i] = entry
+    result = dict(patch['document'])
+    result['words'] = words
+    return result
+
+
+def make_patch(old_payload, new_payload):
+    """
+    Patch from one serialized topic file to another, or None if the files
+    are not plain JSON topics or the patch would not reproduce new_payload.
+    """
+    try:
+        old, new = json.loads(old_payload), json.loads(new_payload)
+    except ValueError:
+        return None
+    if not isinstance(old, dict) or not isinstance(new, dict) or 'words' not in new:
+        return None
+    patch = {'from': revision(old_payload), 'to': revision(new_payload), **diff_topic(old, new)}
+    if serialize(apply_patch(old, patch)) != new_payload:
+        return None
+    return patch
+
+
+def write_patches(base_dir, changes, removed=()):
+    """
+    Store patches for changes, [(rel_path, old_payload, new_payload)] of the
+    topic files a build rewrote, and update patches.json. Each file keeps its
+    last PATCH_HISTORY patches; the history of the removed topic files is
+    dropped, and patch files no longer listed are deleted.
+    Returns the paths written, relative to base_dir.
+    """
+    base_dir = Path(base_dir)
+    index_path = base_dir / PATCH_INDEX
+    files = {}
+    if index_path.exists():
+        with open(index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == PATCHES_VERSION:
+            files = data.get('files', {})
+
+    for rel_path in removed:
+        files.pop(rel_path, None)
+
+    written = []
+    for rel_path, old_payload, new_payload in changes:
+        patch = make_patch(old_payload, new_payload)
+        if patch is None:
+            continue
+        payload = json.dumps(patch, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        name = f"{PATCH_DIR}/{patch['from']}-{patch['to']}.json"
+        if write_if_changed(base_dir / name, payload):
+            written.append(name)
+        history = [step for step in files.get(rel_path, []) if step['from'] != patch['from']]
+        history.append({'from': patch['from'], 'to': patch['to'], 'file': name, 'size': len(payload)})
+        files[rel_path] = history[-PATCH_HISTORY:]
+
+    # Patch files are content-addressed and may be shared, so prune by reference
+    listed = {step['file'] for history in files.values() for step in history}
+    for path in sorted((base_dir / PATCH_DIR).glob('*.json')):
+        if f'{PATCH_DIR}/{path.name}' not in listed:
+            path.unlink()
+
+    index = {'version': PATCHES_VERSION, 'files': dict(sorted(files.items()))}
+    if write_if_changed(index_path, (json.dumps(index, indent=2, ensure_ascii=False) + '\n').encode('utf-8')):
+        written.append(PATCH_INDEX)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply or verify a topic-file delta patch.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    apply = commands.add_parser('apply', help='apply PATCH to OLD')
+    apply.add_argument('old')
+    apply.add_argument('patch')
+    apply.add_argument('-o', '--output', help='write the result here instead of stdout')
+    verify = commands.add_parser('verify', help='check that PATCH turns OLD into exactly NEW')
+    verify.add_argument('old')
+    verify.add_argument('patch')
+    verify.add_argument('new')
+    args = parser.parse_args()
+
+    old_payload = Path(args.old).read_bytes()
+    with open(args.patch, 'r', encoding='utf-8') as f:
+        patch = json.load(f)
+    if revision(old_payload) != patch['from']:
+        print(f"❌ {args.old} is revision {revision(old_payload)}, the patch applies to {patch['from']}")
+        return 1
+    result = serialize(apply_patch(json.loads(old_payload), patch))
+
+    if args.command == 'apply':
+        if args.output:
+            write_if_changed(args.output, result)
+        else:
+            sys.stdout.write(result.decode('utf-8') + '\n')
+        return 0
+
+    if revision(result) != patch['to'] or not file_matches(args.new, result):
+        print(f"❌ patch({args.old}) differs from {args.new}")
+        return 1
+    print(f"✅ patch({args.old}) == {args.new} (revision {patch['to']}, "
+          f"{len(patch['removed'])} removed, {len(patch['added'])} added, {len(patch['modified'])} modified)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
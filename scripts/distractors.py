@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Precomputed multiple-choice distractors.
+For every entry of a language/level, pick the k other entries whose
+translations make the most plausible wrong answers. The score mixes
+normalized edit distance, same topic and similar length. Candidates are
+pruned first: a character-trigram index bucketed by length yields the
+entries within a length window that share the most trigrams, plus same-topic
+entries in that window, and only those are scored. That keeps a level at
+O(n * shortlist) instead of comparing every pair. The edit distance is only
+computed for candidates whose best possible score could still make the top k.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+
+from build_manifest import content_hash
+from normalize import fold_key
+
+DISTRACTORS_VERSION = 2
+DEFAULT_COUNT = 3
+SHORTLIST = 24
+# Trigrams shared by more entries than this carry no signal and are skipped
+MAX_POSTING = 200
+WEIGHTS = {'similarity': 0.6, 'topic': 0.25, 'length': 0.15}
+
+
+def _key(text):
+    return fold_key(text or '')
+
+
+def _grams(key):
+    padded = f' {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _pattern(key):
+    """Bit mask of the positions of each character, for edit_distance."""
+    masks = {}
+    for i, char in enumerate(key):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def edit_distance(a, b, pattern=None):
+    """
+    Levenshtein distance using Myers' bit-parallel algorithm: one pass over b
+    with a's columns packed into an integer. pattern is _pattern(a), which
+    callers comparing a against many strings can compute once.
+    """
+    m = len(a)
+    if not m:
+        return len(b)
+    if pattern is None:
+        pattern = _pattern(a)
+    last = 1 << (m - 1)
+    ones = (1 << m) - 1
+    pv, mv, score = ones, 0, m
+    for char in b:
+        eq = pattern.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & ones
+        mv = ph & xv
+    return score
+
+
+def _length_buckets(indices, lengths):
+    """Sort indices by entry length so a length window is one bisect slice."""
+    ordered = sorted(indices, key=lambda i: (lengths[i], i))
+    return ordered, [lengths[i] for i in ordered]
+
+
+def _window(bucket, low, high):
+    ordered, bucket_lengths = bucket
+    return ordered[bisect_left(bucket_lengths, low):bisect_right(bucket_lengths, high)]
+
+
+def compute_distractors(texts, topics, k=DEFAULT_COUNT, shortlist=SHORTLIST):
+    """
+    texts[i] is the answer text of entry i and topics[i] its topic. Returns,
+    for each entry, the indices of up to k distractors, best first. Entries
+    with the same normalized text never count as distractors for each other.
+    """
+    keys = [_key(text) for text in texts]
+    count = len(keys)
+    lengths = [len(key) for key in keys]
+    grams = [_grams(key) for key in keys]
+    postings = {}
+    for i, entry_grams in enumerate(grams):
+        for gram in entry_grams:
+            postings.setdefault(gram, []).append(i)
+    postings = {gram: _length_buckets(indices, lengths)
+                for gram, indices in postings.items() if len(indices) <= MAX_POSTING}
+    by_topic = {}
+    for i, topic in enumerate(topics):
+        by_topic.setdefault(topic, []).append(i)
+    by_topic = {topic: _length_buckets(indices, lengths) for topic, indices in by_topic.items()}
+
+    result = []
+    for i, key in enumerate(keys):
+        length = lengths[i]
+        if not length:
+            result.append([])
+            continue
+        window = max(2, length // 2)
+        low, high = max(1, length - window), length + window
+
+        shared = Counter()
+        for gram in grams[i]:
+            if gram in postings:
+                shared.update(_window(postings[gram], low, high))
+        # Most shared trigrams first, ties to the lower index (the order of
+        # shared depends on the hash seed); packed into one int per candidate
+        most = len(grams[i])
+        candidates = [packed % count for packed in heapq.nsmallest(
+            shortlist + 1, [(most - shared_grams) * count + j for j, shared_grams in shared.items()])]
+        same_topic = _window(by_topic[topics[i]], low, high)
+        candidates += heapq.nsmallest(shortlist // 3, same_topic, key=lambda j: abs(lengths[j] - length))
+
+        # Unique candidates with an upper bound of their score. The edit
+        # distance is at least the length difference, and at least a third of
+        # the trigrams one side has and the other lacks (an edit changes at
+        # most three of them).
+        seen = {key}
+        bounded = []
+        for j in candidates:
+            other = keys[j]
+            if other in seen:
+                continue
+            seen.add(other)
+            longest = max(length, lengths[j])
+            difference = abs(lengths[j] - length)
+            topic = WEIGHTS['topic'] * (topics[j] == topics[i])
+            similar_length = WEIGHTS['length'] * (1 - difference / longest)
+            missing = max(len(grams[i]), len(grams[j])) - len(grams[i] & grams[j])
+            least = max(difference, -(-missing // 3))
+            ceiling = WEIGHTS['similarity'] * (1 - least / longest) + topic + similar_length
+            bounded.append((ceiling, j, longest, topic, similar_length))
+        bounded.sort(key=lambda item: -item[0])
+
+        # Score the most promising first; stop once no bound can reach the top k
+        pattern = _pattern(key)
+        best = []  # up to k (-score, j), best first
+        for ceiling, j, longest, topic, similar_length in bounded:
+            if len(best) == k and ceiling < -best[-1][0]:
+                break
+            score = (WEIGHTS['similarity'] * (1 - edit_distance(key, keys[j], pattern) / longest)
+                     + topic + similar_length)
+            insort(best, (-score, j))
+            del best[k:]
+        result.append([j for _, j in best])
+    return result
+
+
+def entry_distractors(entries, topics, field='translation', k=DEFAULT_COUNT, previous=None):
+    """
+    Distractors for the entries of one language/level (the bundle's rows,
+    see dedup.pack_entries), where topics[i] is entry i's topic. Returns
+    {'key': input hash, 'rows': [[row, ...] per entry]}. Entries left
+    untranslated (translation == word) only get untranslated distractors and
+    vice versa, so every choice is in the same language. previous is the
+    result of an earlier build; its rows are reused if the inputs match.
+    """
+    texts = [entry.get(field) or entry.get('word', '') for entry in entries]
+    topic_of = list(topics)
+    untranslated = [entry.get(field) == entry.get('word') for entry in entries]
+
+    key = content_hash(DISTRACTORS_VERSION, WEIGHTS, SHORTLIST, MAX_POSTING, k,
+                       texts, topic_of, untranslated)
+    if previous and previous.get('key') == key:
+        return previous
+
+    result = [None] * len(texts)
+    for flag in (False, True):
+        group = [i for i, value in enumerate(untranslated) if value == flag]
+        choices = compute_distractors([texts[i] for i in group], [topic_of[i] for i in group], k)
+        for i, picks in zip(group, choices):
+            result[i] = [group[j] for j in picks]
+    return {'key': key, 'rows': result}
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Example sentence engine for the word-list generators.
+Real example sentences are loaded once from data/examples/<language>.json
+(shaped {topic: {word: sentence}}) and indexed by (language, topic,
+normalized word). Words without a real example get the language's fallback
+template; adding a language means adding a corpus file and/or a template.
+"""
+
+import importlib
+import json
+import os
+from pathlib import Path
+
+from build_manifest import content_hash
+from normalize import normalize_key
+
+EXAMPLES_DIR = 'data/examples'
+DEFAULT_TEMPLATE = 'Example: {word}'
+# Fallback templates of the two generators; vocabulary_summary also uses them
+# to spot entries that only got a template example
+WORD_TEMPLATES = {
+    'spanish': 'La palabra "{word}" es útil.',
+    'english': 'The word "{word}" is useful.',
+    'russian': 'Слово «{word}» полезно.'
+}
+TOPIC_TEMPLATES = {
+    'spanish': 'La palabra "{word}" es muy útil en el contexto de {topic}.',
+    'english': 'The word "{word}" is useful in the context of {topic}.',
+    'russian': 'Слово «{word}» полезно в контексте {topic}.'
+}
+# Set from build_config.json: 'module:function' returning an ExampleEngine;
+# read through the environment so pool workers inherit it
+EXAMPLES_ENV = 'VOCAB_EXAMPLES'
+
+
+def load_corpora(directory=EXAMPLES_DIR):
+    """Read every <language>.json corpus in directory into {language: {topic: {word: sentence}}}."""
+    corpora = {}
+    for path in sorted(Path(directory).glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            corpora[path.stem] = json.load(f)
+    return corpora
+
+
+class ExampleEngine:
+    """
+    Looks up real example sentences and falls back to per-language templates.
+    A template is a format string using {word} and {topic}, or a callable
+    taking (word, topic) and returning the sentence.
+    """
+
+    def __init__(self, corpora=None, templates=None, default_template=DEFAULT_TEMPLATE):
+        self._index = {}
+        for lang, topics in (corpora or {}).items():
+            for topic, examples in topics.items():
+                for word, sentence in examples.items():
+                    self._index[(lang, topic, normalize_key(word))] = sentence
+        self._templates = dict(templates or {})
+        self._default_template = default_template
+        self._stats = {}
+
+    def register_template(self, lang, template):
+        """Install or replace the fallback template for a language."""
+        self._templates[lang] = template
+
+    def _fallback(self, lang, word, topic):
+        template = self._templates.get(lang, self._default_template)
+        if callable(template):
+            return template(word, topic)
+        return template.format(word=word, topic=topic.replace('_', ' '))
+
+    def _counts(self, lang):
+        counts = self._stats.get(lang)
+        if counts is None:
+            counts = self._stats[lang] = {'corpus': 0, 'template': 0}
+        return counts
+
+    def example(self, lang, word, topic):
+        """Return an example sentence for word in the given language and topic."""
+        counts = self._counts(lang)
+        sentence = self._index.get((lang, topic, normalize_key(word)))
+        if sentence is not None:
+            counts['corpus'] += 1
+            return sentence
+        counts['template'] += 1
+        return self._fallback(lang, word, topic)
+
+    def examples_for_topic(self, lang, topic, words):
+        """Return one example per word for a whole topic."""
+        counts = self._counts(lang)
+        index = self._index
+        result = []
+        for word in words:
+            sentence = index.get((lang, topic, normalize_key(word)))
+            if sentence is not None:
+                counts['corpus'] += 1
+            else:
+                counts['template'] += 1
+                sentence = self._fallback(lang, word, topic)
+            result.append(sentence)
+        return result
+
+    def fingerprint(self):
+        """Stable hash of the corpora and templates, for build manifests."""
+        templates = {
+            lang: template if isinstance(template, str) else f'{template.__module__}.{template.__qualname__}'
+            for lang, template in self._templates.items()
+        }
+        corpus = sorted([list(key), sentence] for key, sentence in self._index.items())
+        return content_hash(corpus, templates, self._default_template)
+
+    def stats(self):
+        return {lang: dict(counts) for lang, counts in self._stats.items()}
+
+    def merge_stats(self, stats):
+        """Add counters collected elsewhere, e.g. in a worker process."""
+        for lang, counts in stats.items():
+            own = self._counts(lang)
+            for name, value in counts.items():
+                own[name] = own.get(name, 0) + value
+
+    def reset_stats(self):
+        self._stats = {}
+
+
+def use_example_engine(spec):
+    """Make open_example_engine() call 'module:function'; None restores the default."""
+    if spec:
+        os.environ[EXAMPLES_ENV] = spec
+    else:
+        os.environ.pop(EXAMPLES_ENV, None)
+
+
+def open_example_engine(make_engine):
+    """Create the engine selected by use_example_engine, else make_engine()."""
+    spec = os.environ.get(EXAMPLES_ENV)
+    if spec:
+        module, _, name = spec.partition(':')
+        make_engine = getattr(importlib.import_module(module), name)
+    return make_engine()
+
+
+def format_stats(stats):
+    """Render example counters as a one-line-per-language summary."""
+    return '\n'.join(
+        f"   {lang}: {counts['corpus']} real examples, {counts['template']} from template"
+        for lang, counts in stats.items()
+    )
@@ -4,107 +4,33 @@ Enhanced script to generate topical word lists with better translations and exam
 This version includes comprehensive translation dictionaries and contextual examples.
 """
 
-import os
-import json
-import re
-from pathlib import Path
+from functools import lru_cache
 
-# Configuration
-LEVELS = ['b1', 'b2']
-SRC_TXT = {
-    'b1': 'data/word_lists/spanish_b1_words.txt',
-    'b2': 'data/word_lists/spanish_b2_words.txt'
-}
-LANGS = [
-    {'code': 'spanish', 'tcode': 'es'},
-    {'code': 'english', 'tcode': 'en'},
-    {'code': 'russian', 'tcode': 'ru'}
-]
+from build_manifest import content_hash
+import build_vocabulary
+from example_engine import TOPIC_TEMPLATES, ExampleEngine, load_corpora, open_example_engine
+from example_engine import format_stats as format_example_stats
+from binary_lexicon import open_lexicon
+from instrumentation import stage
+from lexicon import format_stats
+from normalize import MATCH_KEY_VERSION, add_answer_keys
+import vocab_parser
+
+# Levels, source files and languages are configured in build_config.json
+SOURCE_LANGUAGE = 'spanish'
+
+def make_example_engine():
+    """Example engine over the corpora in data/examples/, with topic templates as fallback."""
+    return ExampleEngine(load_corpora(), TOPIC_TEMPLATES)
+
+@lru_cache(maxsize=None)
+def get_example_engine():
+    """Create the configured example engine once per process."""
+    return open_example_engine(make_example_engine)
 
 def get_contextual_example(lang, word, topic):
     """Generate contextual example sentences based on topic and language."""
-    
-    # Topic-specific examples for English
-    english_examples = {
-        'alimentación': {
-            'healthy food': 'I try to eat healthy food every day.',
-            'vegetables': 'Fresh vegetables are essential for good nutrition.',
-            'protein': 'Fish is an excellent source of protein.',
-            'vitamins': 'Fruits provide many important vitamins.',
-            'recipe': 'This recipe is easy to follow.',
-            'cooking': 'I enjoy cooking traditional dishes.',
-            'restaurant': 'We went to a nice restaurant yesterday.'
-        },
-        'trabajo': {
-            'work': 'I work in an office downtown.',
-            'job': 'She found a new job last month.',
-            'salary': 'The salary is competitive for this position.',
-            'interview': 'I have a job interview tomorrow.',
-            'experience': 'Previous experience is required.',
-            'contract': 'Please sign the employment contract.'
-        },
-        'educación': {
-            'study': 'I study Spanish three times a week.',
-            'school': 'The school is very well equipped.',
-            'student': 'She is an excellent student.',
-            'teacher': 'Our teacher is very patient.',
-            'exam': 'The final exam is next week.',
-            'university': 'He graduated from university last year.'
-        },
-        'viajes,_alojamiento_y_transporte': {
-            'travel': 'I love to travel to new countries.',
-            'hotel': 'We booked a hotel near the beach.',
-            'ticket': 'I bought a train ticket online.',
-            'passport': 'Don\'t forget your passport!',
-            'luggage': 'My luggage is quite heavy.',
-            'flight': 'The flight was delayed by two hours.'
-        }
-    }
-    
-    # Topic-specific examples for Russian
-    russian_examples = {
-        'alimentación': {
-            'здоровая пища': 'Я стараюсь есть здоровую пищу каждый день.',
-            'овощи': 'Свежие овощи необходимы для хорошего питания.',
-            'белок': 'Рыба - отличный источник белка.',
-            'витамины': 'Фрукты содержат много важных витаминов.',
-            'рецепт': 'Этому рецепту легко следовать.',
-            'готовка': 'Мне нравится готовить традиционные блюда.',
-            'ресторан': 'Вчера мы ходили в хороший ресторан.'
-        },
-        'trabajo': {
-            'работа': 'Я работаю в офисе в центре города.',
-            'работа': 'Она нашла новую работу в прошлом месяце.',
-            'зарплата': 'Зарплата конкурентоспособная для этой должности.',
-            'собеседование': 'У меня завтра собеседование.',
-            'опыт': 'Требуется предыдущий опыт работы.',
-            'контракт': 'Пожалуйста, подпишите трудовой договор.'
-        },
-        'educación': {
-            'изучать': 'Я изучаю испанский три раза в неделю.',
-            'школа': 'Школа очень хорошо оборудована.',
-            'студент': 'Она отличная студентка.',
-            'учитель': 'Наш учитель очень терпеливый.',
-            'экзамен': 'Выпускной экзамен на следующей неделе.',
-            'университет': 'Он окончил университет в прошлом году.'
-        }
-    }
-    
-    # Default examples
-    if lang == 'spanish':
-        return f'La palabra "{word}" es muy útil en el contexto de {topic.replace("_", " ")}.'
-    elif lang == 'english':
-        # Try to find topic-specific example
-        if topic in english_examples and word.lower() in english_examples[topic]:
-            return english_examples[topic][word.lower()]
-        return f'The word "{word}" is useful in the context of {topic.replace("_", " ")}.'
-    elif lang == 'russian':
-        # Try to find topic-specific example
-        if topic in russian_examples and word.lower() in russian_examples[topic]:
-            return russian_examples[topic][word.lower()]
-        return f'Слово «{word}» полезно в контексте {topic.replace("_", " ")}.'
-    
-    return f'Example: {word}'
+    return get_example_engine().example(lang, word, topic)
 
 def get_comprehensive_translations():
     """Return comprehensive translation dictionaries."""
@@ -241,110 +167,77 @@ def get_comprehensive_translations():
     
     return translations
 
+@lru_cache(maxsize=None)
+def get_lexicon():
+    """Build the normalized translation lexicon once per process."""
+    return open_lexicon(get_comprehensive_translations)
+
 def translate_word(word, target_lang):
     """Enhanced translation function with comprehensive dictionary."""
-    translations = get_comprehensive_translations()
-    
-    # Clean the word (remove extra spaces, convert to lowercase for lookup)
-    clean_word = word.strip().lower()
-    
-    if target_lang in translations and clean_word in translations[target_lang]:
-        return translations[target_lang][clean_word]
-    else:
-        # If no direct translation found, return the original word
-        return word
+    # The lexicon casefolds, NFC-normalizes and accent-folds the lookup key
+    return get_lexicon().translate(word, target_lang)
 
 def parse_txt(text):
     """
     Parse a vocabulary text file into a dictionary of topics and words.
     Returns: {topic_key: [word1, word2, ...]}
     """
-    lines = [line.strip() for line in text.split('\n')]
-    topic = None
-    result = {}
+    return vocab_parser.parse_txt(text)
+
+def parse_file(path):
+    """Stream a vocabulary file into {topic_key: [word1, word2, ...]}."""
+    return vocab_parser.parse_file(path)
+
+def build_topic(lang, level, topic_key, words):
+    """Build the JSON data for one topic in one language."""
+    if lang['code'] == 'spanish':
+        translations = words  # Spanish is the source language
+    else:
+        with stage('translate'):
+            translations = get_lexicon().translate_many(words, lang['tcode'])
     
-    for line in lines:
-        if line.startswith('##'):
-            # Extract topic name after ##, handling numbered sections
-            key_match = re.sub(r'##\s*\d*\.?\s*', '', line)
-            if ':' in key_match:
-                key = key_match.split(':')[1]
-            else:
-                key = key_match.replace('##', '').strip()
-            
-            topic = key.strip().lower().replace(' ', '_')
-            result[topic] = []
-            continue
-        
-        # Skip empty lines, comments, or if no topic is set
-        if not line or line.startswith('#') or topic is None:
-            continue
-            
-        result[topic].append(line)
+    # Generate contextual examples for the whole topic at once
+    with stage('examples'):
+        examples = get_example_engine().examples_for_topic(lang['code'], topic_key, translations)
+    
+    entries = []
+    for word, translation, example in zip(words, translations, examples):
+        entries.append({
+            'word': word,
+            'translation': translation,
+            'example': example
+        })
+    # Precomputed match keys, so the app only normalizes what the user types
+    with stage('answer_keys'):
+        add_answer_keys(entries, SOURCE_LANGUAGE, lang['code'])
     
-    return result
+    display_name = topic_key.replace('_', ' ').title()
+    return {
+        'topic': display_name,
+        'words': entries
+    }
+
+def get_fingerprint():
+    """Identify the translation and example tables the generated files depend on."""
+    return content_hash(get_lexicon().fingerprint(), get_example_engine().fingerprint(), MATCH_KEY_VERSION)
+
+# Counters merged back from pool workers and printed after the build
+STATS_PROVIDERS = (get_lexicon, get_example_engine)
+
+def print_stats():
+    """Print the translation and example counters of the last build, if it built any topic."""
+    stats = get_lexicon().stats()
+    if not any(any(counts.values()) for counts in stats.values()):
+        return
+    print("Translation lexicon:")
+    print(format_stats(stats))
+    print("Examples:")
+    print(format_example_stats(get_example_engine().stats()))
 
 def main():
-    """Main function to generate all word lists with enhanced translations."""
-    base_dir = Path('data/word_lists')
-    
-    for level in LEVELS:
-        src_file = Path(SRC_TXT[level])
-        
-        if not src_file.exists():
-            print(f"Warning: Source file {src_file} not found, skipping {level}")
-            continue
-            
-        print(f"Processing {level.upper()} level vocabulary...")
-        
-        # Parse the source text file
-        with open(src_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
-        topics_map = parse_txt(text)
-        print(f"Found {len(topics_map)} topics for {level}")
-        
-        for lang in LANGS:
-            lang_dir = base_dir / lang['code'] / level
-            lang_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Write index.json with list of available topics
-            index_file = lang_dir / 'index.json'
-            with open(index_file, 'w', encoding='utf-8') as f:
-                json.dump(list(topics_map.keys()), f, indent=2, ensure_ascii=False)
-            
-            # Process each topic
-            for topic_key, words in topics_map.items():
-                entries = []
-                
-                for word in words:
-                    if lang['code'] == 'spanish':
-                        translation = word  # Spanish is the source language
-                    else:
-                        translation = translate_word(word, lang['tcode'])
-                    
-                    # Generate contextual example
-                    example = get_contextual_example(lang['code'], translation, topic_key)
-                    
-                    entries.append({
-                        'word': word,
-                        'translation': translation,
-                        'example': example
-                    })
-                
-                # Write topic file
-                topic_file = lang_dir / f'{topic_key}.json'
-                topic_data = {
-                    'topic': topic_key.replace('_', ' ').title(),
-                    'words': entries
-                }
-                
-                with open(topic_file, 'w', encoding='utf-8') as f:
-                    json.dump(topic_data, f, indent=2, ensure_ascii=False)
-                
-                print(f"Written {lang['code']}/{level}/{topic_key}.json ({len(entries)} items)")
-    
-    print("✅ All enhanced word-lists generated with better translations and examples.")
+    """Run the 'topical' build from build_config.json."""
+    build_vocabulary.main(builds=['topical'],
+                          description='Generate topical word lists with enhanced translations and contextual examples.')
 
 if __name__ == '__main__':
     main()
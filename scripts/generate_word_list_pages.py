@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Page the headless English word lists (b2_words.txt, c1_words.txt).
+These files are bare word-per-line lists without '##' topic headings, so the
+topical generators skip them. Here each list becomes one topic that is split
+into small pages (50 words, alphabetical by default) under
+data/word_lists/english/<list>/, with index.json, pages.json and a bundle,
+so the app can lazy-load a page instead of the whole list.
+"""
+
+from build_manifest import content_hash
+import build_vocabulary
+import vocab_parser
+
+# The lists, the page size and order are configured in build_config.json
+LIST_TOPIC = 'page'
+PAGES_VERSION = 1
+
+def parse_file(path):
+    """Read a headless list into {'page': [words]}; paging splits it further."""
+    return vocab_parser.parse_file(path, default_topic=LIST_TOPIC)
+
+def build_topic(lang, level, topic_key, words):
+    """Build one page; its display name is the first and last word, like a dictionary."""
+    return {
+        'topic': f"{words[0]} – {words[-1]}" if words else topic_key,
+        'words': [{'word': word} for word in words]
+    }
+
+def get_fingerprint():
+    """Pages depend on nothing but the word lists and this version."""
+    return content_hash(PAGES_VERSION)
+
+def main():
+    """Run the 'pages' build from build_config.json."""
+    build_vocabulary.main(builds=['pages'], description='Split the headless word lists into small pages.')
+
+if __name__ == "__main__":
+    main()
@@ -4,32 +4,32 @@ Generate topical word lists from Spanish B1/B2 vocabulary files.
 Converts the vocabulary into JSON files organized by topic and language.
 """
 
-import os
-import json
-import re
-from pathlib import Path
+from functools import lru_cache
 
-# Configuration
-LEVELS = ['b1', 'b2']
-SRC_TXT = {
-    'b1': 'data/word_lists/spanish_b1_words.txt',
-    'b2': 'data/word_lists/spanish_b2_words.txt'
-}
-LANGS = [
-    {'code': 'spanish', 'tcode': 'es'},
-    {'code': 'english', 'tcode': 'en'},
-    {'code': 'russian', 'tcode': 'ru'}
-]
+from build_manifest import content_hash
+import build_vocabulary
+from example_engine import WORD_TEMPLATES, ExampleEngine, open_example_engine
+from binary_lexicon import open_lexicon
+from instrumentation import stage
+from lexicon import format_stats
+from normalize import MATCH_KEY_VERSION, add_answer_keys
+import vocab_parser
+
+# Levels, source files and languages are configured in build_config.json
+SOURCE_LANGUAGE = 'spanish'
+
+def make_example_engine():
+    """Template-only example engine; this generator uses no example corpora."""
+    return ExampleEngine(templates=WORD_TEMPLATES, default_template='')
+
+@lru_cache(maxsize=None)
+def get_example_engine():
+    """Create the configured example engine once per process."""
+    return open_example_engine(make_example_engine)
 
 def example_for(lang, word):
     """Generate simple example sentences for each language."""
-    if lang == 'spanish':
-        return f'La palabra "{word}" es útil.'
-    elif lang == 'english':
-        return f'The word "{word}" is useful.'
-    elif lang == 'russian':
-        return f'Слово «{word}» полезно.'
-    return ''
+    return get_example_engine().example(lang, word, '')
 
 def get_topic_translations():
     """Return Spanish to English topic name translations."""
@@ -86,40 +86,15 @@ def parse_txt(text):
     Parse a vocabulary text file into a dictionary of topics and words.
     Returns: {topic_key: [word1, word2, ...]}
     """
-    lines = [line.strip() for line in text.split('\n')]
-    topic = None
-    result = {}
-    topic_translations = get_topic_translations()
-    
-    for line in lines:
-        if line.startswith('##'):
-            # Extract topic name after ##, handling numbered sections
-            key_match = re.sub(r'##\s*\d*\.?\s*', '', line)
-            if ':' in key_match:
-                key = key_match.split(':')[1]
-            else:
-                key = key_match.replace('##', '').strip()
-            
-            spanish_topic = key.strip().lower().replace(' ', '_')
-            # Use English translation if available, otherwise use original
-            topic = topic_translations.get(spanish_topic, spanish_topic)
-            result[topic] = []
-            continue
-        
-        # Skip empty lines, comments, or if no topic is set
-        if not line or line.startswith('#') or topic is None:
-            continue
-            
-        result[topic].append(line)
-    
-    return result
+    return vocab_parser.parse_txt(text, get_topic_translations())
 
-def translate_word(word, target_lang):
-    """
-    Enhanced translation mapping with comprehensive vocabulary.
-    """
-    # Comprehensive translation dictionaries
-    translations = {
+def parse_file(path):
+    """Stream a vocabulary file into {topic_key: [word1, word2, ...]}."""
+    return vocab_parser.parse_file(path, get_topic_translations())
+
+def get_translation_tables():
+    """Return the Spanish to English/Russian translation tables."""
+    return {
         'en': {
             # Body parts
             'músculo': 'muscle', 'hueso': 'bone', 'piel': 'skin', 'corazón': 'heart',
@@ -265,75 +240,66 @@ def translate_word(word, target_lang):
             'tener una mala actitud': 'иметь плохое отношение'
         }
     }
-    
-    # Return translation if available, otherwise return the original word
-    if target_lang in translations and word in translations[target_lang]:
-        return translations[target_lang][word]
-    else:
-        return word  # Return original if no translation found
 
-def main():
-    """Main function to generate all word lists."""
-    base_dir = Path('data/word_lists')
+@lru_cache(maxsize=None)
+def get_lexicon():
+    """Build the normalized translation lexicon once per process."""
+    return open_lexicon(get_translation_tables)
+
+def translate_word(word, target_lang):
+    """
+    Translate a word, returning the original word if no translation is found.
+    """
+    return get_lexicon().translate(word, target_lang)
+
+def build_topic(lang, level, topic_key, words):
+    """Build the JSON data for one topic in one language."""
+    if lang['code'] == 'spanish':
+        translations = words  # Spanish is the source language
+    else:
+        with stage('translate'):
+            translations = get_lexicon().translate_many(words, lang['tcode'])
     
-    for level in LEVELS:
-        src_file = Path(SRC_TXT[level])
-        
-        if not src_file.exists():
-            print(f"Warning: Source file {src_file} not found, skipping {level}")
-            continue
-            
-        print(f"Processing {level.upper()} level vocabulary...")
-        
-        # Parse the source text file
-        with open(src_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
-        topics_map = parse_txt(text)
-        print(f"Found {len(topics_map)} topics for {level}")
-        
-        for lang in LANGS:
-            lang_dir = base_dir / lang['code'] / level
-            lang_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Write index.json with list of available topics
-            index_file = lang_dir / 'index.json'
-            with open(index_file, 'w', encoding='utf-8') as f:
-                json.dump(list(topics_map.keys()), f, indent=2, ensure_ascii=False)
-            
-            # Get English topic names for display
-            english_names = get_english_topic_names()
-            
-            # Process each topic
-            for topic_key, words in topics_map.items():
-                entries = []
-                
-                for word in words:
-                    if lang['code'] == 'spanish':
-                        translation = word  # Spanish is the source language
-                    else:
-                        translation = translate_word(word, lang['tcode'])
-                    
-                    entries.append({
-                        'word': word,
-                        'translation': translation,
-                        'example': example_for(lang['code'], translation)
-                    })
-                
-                # Write topic file with English display name
-                topic_file = lang_dir / f'{topic_key}.json'
-                display_name = english_names.get(topic_key, topic_key.replace('_', ' ').title())
-                topic_data = {
-                    'topic': display_name,
-                    'words': entries
-                }
-                
-                with open(topic_file, 'w', encoding='utf-8') as f:
-                    json.dump(topic_data, f, indent=2, ensure_ascii=False)
-                
-                print(f"Written {lang['code']}/{level}/{topic_key}.json ({len(entries)} items)")
+    with stage('examples'):
+        examples = get_example_engine().examples_for_topic(lang['code'], topic_key, translations)
     
-    print("✅ All word-lists generated.")
+    entries = []
+    for word, translation, example in zip(words, translations, examples):
+        entries.append({
+            'word': word,
+            'translation': translation,
+            'example': example
+        })
+    # Precomputed match keys, so the app only normalizes what the user types
+    with stage('answer_keys'):
+        add_answer_keys(entries, SOURCE_LANGUAGE, lang['code'])
+    
+    display_name = get_english_topic_names().get(topic_key, topic_key.replace('_', ' ').title())
+    return {
+        'topic': display_name,
+        'words': entries
+    }
+
+def get_fingerprint():
+    """Identify the translation and example tables the generated files depend on."""
+    return content_hash(get_lexicon().fingerprint(), get_example_engine().fingerprint(),
+                        get_english_topic_names(), MATCH_KEY_VERSION)
+
+# Counters merged back from pool workers and printed after the build
+STATS_PROVIDERS = (get_lexicon,)
+
+def print_stats():
+    """Print the translation counters of the last build, if it built any topic."""
+    stats = get_lexicon().stats()
+    if not any(any(counts.values()) for counts in stats.values()):
+        return
+    print("Translation lexicon:")
+    print(format_stats(stats))
+
+def main():
+    """Run the 'basic' build from build_config.json."""
+    build_vocabulary.main(builds=['basic'],
+                          description='Generate topical word lists from the Spanish B1/B2 vocabulary files.')
 
 if __name__ == '__main__':
     main()
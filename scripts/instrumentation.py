@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Build instrumentation: per-stage wall and CPU timers, counters and trace spans.
+The pipeline and the generators wrap their hot paths in stage(...) and call
+count(...). While instrumentation is off (the default) stage returns a shared
+no-op context and count returns at once, so the cost is one flag check.
+With --profile or --trace the recorder is switched on in the main process and,
+through the environment, in pool workers, which hand their numbers back like
+the lexicon's counters. --trace also keeps one span per stage call, written
+in Chrome trace format (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# 'stats' or 'trace'; read through the environment so pool workers inherit it
+INSTRUMENT_ENV = 'VOCAB_INSTRUMENT'
+_NULL = nullcontext()
+
+
+class Recorder:
+    """Accumulates stage timings, counters and (when tracing) spans."""
+
+    def __init__(self, mode=None):
+        self.mode = mode
+        self.reset_stats()
+
+    def stats(self):
+        return {'stages': {name: dict(t) for name, t in self.stages.items()},
+                'counters': dict(self.counters), 'spans': list(self.spans)}
+
+    def merge_stats(self, stats):
+        """Add numbers recorded elsewhere, e.g. in a worker process."""
+        for name, timing in stats['stages'].items():
+            own = self.stages.setdefault(name, {'calls': 0, 'wall': 0.0, 'cpu': 0.0})
+            for key, value in timing.items():
+                own[key] += value
+        for name, value in stats['counters'].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        self.spans += stats['spans']
+
+    def reset_stats(self):
+        self.stages = {}
+        self.counters = {}
+        self.spans = []
+
+
+_RECORDER = Recorder(os.environ.get(INSTRUMENT_ENV) or None)
+
+
+class _Stage:
+    __slots__ = ('name', 'args', 'wall', 'cpu')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        timing = _RECORDER.stages.get(self.name)
+        if timing is None:
+            timing = _RECORDER.stages[self.name] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0}
+        timing['calls'] += 1
+        timing['wall'] += wall
+        timing['cpu'] += cpu
+        if _RECORDER.mode == 'trace':
+            _RECORDER.spans.append({
+                'name': self.name, 'cat': 'build', 'ph': 'X',
+                'ts': round(self.wall * 1e6, 1), 'dur': round(wall * 1e6, 1),
+                'pid': os.getpid(), 'tid': threading.get_ident(), 'args': self.args
+            })
+        return False
+
+
+def stage(name, **args):
+    """Time the enclosed block as stage name; args label its trace span."""
+    if _RECORDER.mode is None:
+        return _NULL
+    return _Stage(name, args)
+
+
+def count(name, value=1):
+    """Add value to counter name."""
+    if _RECORDER.mode is not None:
+        _RECORDER.counters[name] = _RECORDER.counters.get(name, 0) + value
+
+
+def enabled():
+    return _RECORDER.mode is not None
+
+
+def enable(trace=False):
+    """Switch the recorder on with empty stats, here and in pool workers started afterwards."""
+    _RECORDER.mode = 'trace' if trace else 'stats'
+    _RECORDER.reset_stats()
+    os.environ[INSTRUMENT_ENV] = _RECORDER.mode
+
+
+def disable():
+    """Switch the recorder off; later builds and pool workers start uninstrumented."""
+    _RECORDER.mode = None
+    os.environ.pop(INSTRUMENT_ENV, None)
+
+
+def get_recorder():
+    """This process's recorder; a stats provider for wordlist_pipeline.generate."""
+    return _RECORDER
+
+
+def format_stats(stats):
+    """Render the stage timings (slowest first) and counters."""
+    lines = []
+    stages = sorted(stats['stages'].items(), key=lambda item: -item[1]['wall'])
+    for name, timing in stages:
+        lines.append(f"   {name}: {timing['calls']} call(s), {timing['wall'] * 1000:.1f} ms wall, "
+                     f"{timing['cpu'] * 1000:.1f} ms CPU")
+    for name, value in sorted(stats['counters'].items()):
+        lines.append(f"   {name}: {value}")
+    return '\n'.join(lines)
+
+
+def write_trace(path, stats):
+    """Write the recorded spans as a Chrome trace; counters go into otherData."""
+    trace = {
+        'traceEvents': sorted(stats['spans'], key=lambda span: (span['pid'], span['ts'])),
+        'displayTimeUnit': 'ms',
+        'otherData': {'counters': stats['counters']}
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(trace, f, ensure_ascii=False)
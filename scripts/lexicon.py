@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Shared translation lexicon for the word-list generators.
+Translation tables are normalized once into an immutable index, so looking up
+a word during generation is a plain dictionary hit instead of a table rebuild.
+"""
+
+import hashlib
+import json
+from types import MappingProxyType
+
+from normalize import fold_accents, normalize_key
+
+
+def build_indexes(tables):
+    """
+    Normalize {lang: {source_word: translation}} into (exact, folded) indexes
+    of the same shape, keyed by normalize_key and by its accent-folded form.
+    """
+    exact = {}
+    folded = {}
+    for lang, table in tables.items():
+        lang_exact = {}
+        lang_folded = {}
+        ambiguous = set()
+        for source, target in table.items():
+            key = normalize_key(source)
+            lang_exact.setdefault(key, target)
+
+            # Accent-insensitive fallback; drop keys that fold together
+            # but translate differently rather than guess between them.
+            folded_key = fold_accents(key)
+            if lang_folded.get(folded_key, target) != target:
+                ambiguous.add(folded_key)
+            lang_folded.setdefault(folded_key, target)
+        for folded_key in ambiguous:
+            del lang_folded[folded_key]
+        exact[lang] = lang_exact
+        folded[lang] = lang_folded
+    return exact, folded
+
+
+def tables_fingerprint(exact):
+    """Stable hash of normalized {lang: {key: translation}} tables."""
+    tables = {lang: sorted(table.items()) for lang, table in exact.items()}
+    payload = json.dumps(tables, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def new_counters():
+    return {'hits': 0, 'folded_hits': 0, 'provided': 0, 'misses': 0}
+
+
+class Lexicon:
+    """
+    Immutable, normalized view over translation tables.
+    Tables have the shape {lang: {source_word: translation}}.
+    """
+
+    # Translations of words the tables miss, see set_fallback
+    _fallback = MappingProxyType({})
+
+    def __init__(self, tables):
+        exact, folded = build_indexes(tables)
+        self._exact = MappingProxyType({lang: MappingProxyType(t) for lang, t in exact.items()})
+        self._folded = MappingProxyType({lang: MappingProxyType(t) for lang, t in folded.items()})
+        self._stats = {lang: new_counters() for lang in exact}
+
+    def set_fallback(self, tables):
+        """
+        Consult tables (e.g. cached translation-provider results, same shape
+        as the lexicon's) for words the lexicon's own tables miss.
+        """
+        exact, _ = build_indexes(tables)
+        self._fallback = MappingProxyType({lang: MappingProxyType(t) for lang, t in exact.items()})
+        for lang in exact:
+            self._stats.setdefault(lang, new_counters())
+
+    @property
+    def languages(self):
+        return tuple(self._exact)
+
+    def tables_fingerprint(self):
+        return tables_fingerprint(self._exact)
+
+    def fingerprint(self):
+        """Return a stable hash of the normalized tables, for build manifests."""
+        if not self._fallback:
+            return self.tables_fingerprint()
+        payload = self.tables_fingerprint() + tables_fingerprint(self._fallback)
+        return hashlib.sha256(payload.encode('ascii')).hexdigest()
+
+    def lookup(self, word, lang):
+        """Return the translation for word, or None if the lexicon has none."""
+        exact = self._exact.get(lang)
+        fallback = self._fallback.get(lang, {})
+        if exact is None and not fallback:
+            return None
+        exact = exact or {}
+        stats = self._stats[lang]
+
+        key = normalize_key(word)
+        translation = exact.get(key)
+        if translation is not None:
+            stats['hits'] += 1
+            return translation
+
+        translation = self._folded.get(lang, {}).get(fold_accents(key))
+        if translation is not None:
+            stats['folded_hits'] += 1
+            return translation
+
+        translation = fallback.get(key)
+        if translation is not None:
+            stats['provided'] += 1
+            return translation
+
+        stats['misses'] += 1
+        return None
+
+    def translate(self, word, lang):
+        """Translate word, falling back to the original word on a miss."""
+        translation = self.lookup(word, lang)
+        return word if translation is None else translation
+
+    def translate_many(self, words, lang):
+        """Translate a sequence of words in one pass; misses keep the source word."""
+        exact = self._exact.get(lang)
+        fallback = self._fallback.get(lang, {})
+        if exact is None and not fallback:
+            return list(words)
+        exact = exact or {}
+        folded = self._folded.get(lang, {})
+        stats = self._stats[lang]
+
+        result = []
+        for word in words:
+            key = normalize_key(word)
+            translation = exact.get(key)
+            if translation is not None:
+                stats['hits'] += 1
+            else:
+                translation = folded.get(fold_accents(key))
+                if translation is not None:
+                    stats['folded_hits'] += 1
+                elif key in fallback:
+                    stats['provided'] += 1
+                    translation = fallback[key]
+                else:
+                    stats['misses'] += 1
+                    translation = word
+            result.append(translation)
+        return result
+
+    def stats(self):
+        """Return a copy of the per-language hit/miss counters."""
+        return {lang: dict(counts) for lang, counts in self._stats.items()}
+
+    def merge_stats(self, stats):
+        """Add counters collected elsewhere, e.g. in a worker process."""
+        for lang, counts in stats.items():
+            own = self._stats.setdefault(lang, new_counters())
+            for name, value in counts.items():
+                own[name] = own.get(name, 0) + value
+
+    def reset_stats(self):
+        for counts in self._stats.values():
+            for name in counts:
+                counts[name] = 0
+
+
+def format_stats(stats):
+    """Render lexicon counters as a one-line-per-language summary."""
+    lines = []
+    for lang, counts in stats.items():
+        found = counts['hits'] + counts['folded_hits'] + counts.get('provided', 0)
+        total = found + counts['misses']
+        coverage = found / total * 100 if total else 0.0
+        provided = f"{counts['provided']} from the translation provider, " if counts.get('provided') else ''
+        lines.append(
+            f"   {lang}: {counts['hits']} hits, {counts['folded_hits']} accent-folded hits, "
+            f"{provided}{counts['misses']} misses ({coverage:.1f}% coverage)"
+        )
+    return '\n'.join(lines)
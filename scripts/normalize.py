@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Shared text normalization for the word-list scripts.
+normalize_key and fold_key are the lookup keys used by the lexicon and the
+indexes. match_key is the more lenient key for checking answers: besides
+NFC, case and accent folding it drops punctuation and a leading article.
+The generators store every entry's match keys, so the app only has to
+normalize what the user typed.
+"""
+
+import re
+import unicodedata
+
+# Bump when match_key changes, so generated answer keys are rebuilt
+MATCH_KEY_VERSION = 2
+
+# Leading words dropped from answers; English 'to' marks infinitives ('to hug')
+ARTICLES = {
+    'spanish': ('el', 'la', 'los', 'las', 'lo', 'un', 'una', 'unos', 'unas'),
+    'english': ('the', 'a', 'an', 'to'),
+    'german': ('der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einen', 'einem', 'einer'),
+    'russian': ()
+}
+APOSTROPHES = re.compile(r"['’`´]")
+PUNCTUATION = re.compile(r'[^\w\s]')
+# 'ir/venir', 'hombro(s)'; an alternative that is an ending gives another
+# form of the first word: 'ciego/a' (ciega), 'profesor/a' (profesora), 'ojo/s'
+ALTERNATIVES = re.compile(r'\s*[/;]\s*')
+ENDINGS = ('a', 'o', 's', 'as', 'os', 'es')
+VOWELS = 'aeiouáéíóú'
+OPTIONAL_PART = re.compile(r'\(([^)]*)\)')
+# Word-class and usage notes, as in 'but (prep)' or 'banco (m.)', are not part of the answer
+NOTE = re.compile(r'\s+\(([^)]*)\)')
+NOTES = {'adj', 'adv', 'art', 'conj', 'f', 'fam', 'fig', 'inf', 'interj', 'm', 'mf', 'n',
+         'pl', 'prep', 'pron', 'sg', 'v', 'vi', 'vr', 'vt'}
+# Cyrillic й is a letter of its own, not и with an accent
+CYRILLIC_SHORT_I = re.compile('([иИ])\u0306')
+
+
+def collapse_whitespace(text):
+    return ' '.join(text.split())
+
+
+def normalize_key(text):
+    """Return the canonical lookup key: NFC, collapsed whitespace, casefolded."""
+    return unicodedata.normalize('NFC', collapse_whitespace(text)).casefold()
+
+
+def fold_accents(text):
+    """Remove combining marks so 'alimentación' also matches 'alimentacion'."""
+    decomposed = unicodedata.normalize('NFD', text)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return unicodedata.normalize('NFC', stripped)
+
+
+def fold_key(text):
+    """normalize_key without accents: the key of the search and distractor indexes."""
+    return fold_accents(normalize_key(text))
+
+
+def strip_article(key, lang):
+    """Drop one leading article of lang from an already folded key, if more words follow."""
+    first, _, rest = key.partition(' ')
+    if rest and first in ARTICLES.get(lang, ()):
+        return rest
+    return key
+
+
+def fold_answer(text):
+    """fold_key for answers: like fold_accents, but й stays distinct from и."""
+    decomposed = unicodedata.normalize('NFD', normalize_key(text))
+    decomposed = CYRILLIC_SHORT_I.sub('\\1\0', decomposed)
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return unicodedata.normalize('NFC', stripped.replace('\0', '\u0306'))
+
+
+def match_key(text, lang=None):
+    """
+    Key for comparing an answer with an entry: folded, without punctuation or
+    a leading article, whitespace collapsed. 'La Piel ' and 'piel' match.
+    """
+    key = fold_answer(APOSTROPHES.sub('', text or ''))
+    key = collapse_whitespace(PUNCTUATION.sub(' ', key))
+    return strip_article(key, lang)
+
+
+def with_ending(word, ending):
+    """
+    word with another ending: 'ciego' + 'a' is 'ciega' and 'ciegos' + 'as'
+    'ciegas' (the vowel is replaced), 'profesor' + 'a' is 'profesora' and
+    'ojo' + 's' 'ojos' (the ending is appended), 'pez' + 'es' is 'peces'.
+    """
+    last = word[-1:].lower()
+    if ending[0] in VOWELS:
+        if ending[1:] == 's' and last == 's' and word[-2:-1].lower() in VOWELS:
+            return word[:-2] + ending
+        if last in VOWELS:
+            return word[:-1] + ending
+        if last == 'z' and ending[0] == 'e':
+            return word[:-1] + 'c' + ending
+    return word + ending
+
+
+def _strip_notes(text):
+    def replace(match):
+        note = match.group(1).strip().lower()
+        return ' ' if note.endswith('.') or note in NOTES else match.group(0)
+    return NOTE.sub(replace, text).strip()
+
+
+def accepted_forms(text, lang=None):
+    """
+    Match keys of every form of text a learner may give: each '/'- or
+    ';'-separated alternative, with and without any optional '(...)' part.
+    Notes like '(prep)' are dropped. The first key is the entry's canonical
+    answer.
+    """
+    forms = []
+    parts = ALTERNATIVES.split(_strip_notes(text or ''))
+    for i, part in enumerate(parts):
+        if i and part.lower() in ENDINGS:
+            part = with_ending(parts[0], part.lower())
+        if OPTIONAL_PART.search(part):
+            forms += [OPTIONAL_PART.sub(' ', part), OPTIONAL_PART.sub(r'\1', part)]
+        else:
+            forms.append(part)
+    keys = []
+    for form in forms:
+        key = match_key(form, lang)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def add_answer_keys(entries, word_lang, translation_lang):
+    """
+    Add 'word_keys' and 'translation_keys' to each entry dict. Entries whose
+    words share a match key (e.g. 'human resources director' and 'Human
+    Resources Director') accept each other's translations, and vice versa.
+    """
+    word_keys = [accepted_forms(entry.get('word'), word_lang) for entry in entries]
+    # An untranslated entry's translation is the source word
+    translation_keys = [
+        accepted_forms(entry.get('translation'),
+                       word_lang if entry.get('translation') == entry.get('word') else translation_lang)
+        for entry in entries
+    ]
+
+    def group_by_first(keys):
+        groups = {}
+        for i, forms in enumerate(keys):
+            if forms:
+                groups.setdefault(forms[0], []).append(i)
+        return groups
+
+    def merged(i, own, groups, other):
+        result = list(own[i])
+        for j in groups.get(other[i][0], ()) if other[i] else ():
+            for key in own[j]:
+                if key not in result:
+                    result.append(key)
+        return result
+
+    by_word = group_by_first(word_keys)
+    by_translation = group_by_first(translation_keys)
+    for i, entry in enumerate(entries):
+        entry['word_keys'] = merged(i, word_keys, by_translation, translation_keys)
+        entry['translation_keys'] = merged(i, translation_keys, by_word, word_keys)
+    return entries
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Service-worker precache manifest.
+Lists the app shell, bundles.json and the vocabulary bundles it points at,
+each with its content hash and size, and writes them to precache-manifest.js
+next to sw.js. The app loads a whole level from its bundle, so the per-topic
+files and word-list pages are left to runtime caching; --topics adds them
+for offline use without bundles (sw.js can then patch them, see
+delta_patches). The manifest version (and with it the service worker's CACHE_NAME)
+is derived from all entry hashes, so it only changes when content does, and
+sw.js only re-downloads entries whose hash changed.
+
+The vocabulary build rewrites the manifest after every build; after editing
+the app shell alone, regenerate it with:
+    python scripts/precache.py
+    python scripts/precache.py --check   # exit 1 if the manifest is stale
+    python scripts/precache.py --topics  # also precache every topic file
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from build_manifest import bytes_hash, content_hash, file_matches, write_if_changed
+from bundles import BUNDLE_MANIFEST, read_bundle_manifest
+
+PRECACHE_NAME = 'precache-manifest.js'
+APP_SHELL = [
+    'index.html',
+    'css/styles.css',
+    'js/app.js',
+    'js/topical-vocabulary.js',
+    'js/translations.js',
+    'js/chatbot.js',
+    'manifest.json',
+    'icons/favicon-96x96.png',
+    'icons/web-app-manifest-192x192.png',
+    'icons/web-app-manifest-512x512.png',
+    'icons/apple-touch-icon.png',
+    'icons/favicon.ico',
+    'icons/favicon.svg'
+]
+# Build artifacts the app never fetches
+EXCLUDED_DATA = {'alignment.json', 'dedup-report.json', 'patches.json'}
+
+
+def vocabulary_files(base_dir, topics=False):
+    """
+    bundles.json and the current bundles it lists; with topics, also every
+    other JSON file the app may load from the generated word-list tree.
+    """
+    base_dir = Path(base_dir)
+    files = []
+    if (base_dir / BUNDLE_MANIFEST).exists():
+        files.append(base_dir / BUNDLE_MANIFEST)
+    files += [base_dir / record['file'] for record in read_bundle_manifest(base_dir).values()]
+    if topics:
+        files += [p for p in base_dir.glob('*.json') if p.name not in EXCLUDED_DATA]
+        files += [p for p in base_dir.glob('*/*/*.json') if not p.name.startswith('bundle.')]
+    # Skip build bookkeeping such as .build-manifest.json
+    return sorted({p for p in files if p.exists() and not p.name.startswith('.')})
+
+
+def build_precache(app_root, base_dir, topics=False):
+    """Return the manifest data: {'version': ..., 'entries': [{'url', 'hash', 'size'}]}."""
+    app_root = Path(app_root)
+    entries = []
+
+    def add(url, path):
+        data = path.read_bytes()
+        entries.append({'url': url, 'hash': bytes_hash(data)[:16], 'size': len(data)})
+
+    for rel_path in APP_SHELL:
+        path = app_root / rel_path
+        if path.exists():
+            add(f'./{rel_path}', path)
+    # The scope root serves index.html
+    if (app_root / 'index.html').exists():
+        add('./', app_root / 'index.html')
+
+    for path in vocabulary_files(base_dir, topics):
+        add('./' + path.resolve().relative_to(app_root.resolve()).as_posix(), path)
+
+    entries.sort(key=lambda entry: entry['url'])
+    version = content_hash([[e['url'], e['hash']] for e in entries])[:12]
+    return {'version': version, 'entries': entries}
+
+
+def write_precache(app_root, base_dir, dry_run=False, topics=False):
+    """Write precache-manifest.js into app_root; returns (manifest, changed)."""
+    manifest = build_precache(app_root, base_dir, topics)
+    # One entry per line keeps diffs between builds readable
+    entries = ',\n'.join('    ' + json.dumps(e, ensure_ascii=False) for e in manifest['entries'])
+    payload = (
+        '// Generated by scripts/precache.py from the word-list build. Do not edit.\n'
+        'self.__PRECACHE_MANIFEST = {\n'
+        f'  "version": "{manifest["version"]}",\n'
+        f'  "entries": [\n{entries}\n  ]\n'
+        '};\n'
+    ).encode('utf-8')
+    path = Path(app_root) / PRECACHE_NAME
+    if dry_run:
+        return manifest, not file_matches(path, payload)
+    return manifest, write_if_changed(path, payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate the service-worker precache manifest.')
+    parser.add_argument('--root', default='.', help='app root that holds sw.js (default: .)')
+    parser.add_argument('--base-dir', default='data/word_lists',
+                        help='generated word-list tree (default: data/word_lists)')
+    parser.add_argument('--check', action='store_true',
+                        help='only report whether the manifest is stale; exit 1 if it is')
+    parser.add_argument('--topics', action='store_true',
+                        help='also precache every topic file and page, not only the bundles')
+    args = parser.parse_args()
+
+    manifest, changed = write_precache(args.root, Path(args.root) / args.base_dir, dry_run=args.check,
+                                       topics=args.topics)
+    if args.check:
+        if changed:
+            print(f"❌ {PRECACHE_NAME} is stale; run python scripts/precache.py")
+            return 1
+        print(f"✅ {PRECACHE_NAME} is current (version {manifest['version']})")
+        return 0
+    state = 'Written' if changed else 'Unchanged'
+    print(f"{state} {PRECACHE_NAME}: {len(manifest['entries'])} entries, version {manifest['version']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
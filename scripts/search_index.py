@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Static search index over every generated language/level.
+Words, translations and examples are tokenized, casefolded and accent-folded.
+Each term's postings point at (language, level, topic, offset). Terms go into
+prefix shards and their character trigrams into trigram shards. Any shard
+larger than the size budget is split on one more character. A client only
+fetches the shards whose key matches the typed prefix. search.json maps shard
+keys to content-hashed file names.
+
+Usage:
+    python scripts/search_index.py "alimen"
+    python scripts/search_index.py "skin" --lang english --level b2
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from build_manifest import bytes_hash, file_matches, write_if_changed
+from compact_format import load_topic
+from normalize import fold_key
+
+SEARCH_DIR = 'search'
+SEARCH_MANIFEST = 'search.json'
+SEARCH_VERSION = 1
+SHARD_BUDGET = 64 * 1024
+
+# Field bits stored with every posting, and their ranking weights
+FIELDS = (('word', 1, 3.0), ('translation', 2, 2.0), ('example', 4, 1.0))
+# Extra posting bit: the term is the whole word field, e.g. 'piel' but not 'tener la piel'
+WHOLE_WORD = 8
+WHOLE_WORD_BONUS = 1.0
+TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN.findall(fold_key(text or ''))
+
+
+def trigrams(term):
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+def collect_postings(topic_sets):
+    """
+    Return (files, {term: [file_index, offset, field_bits, ...]}) for
+    [(language, level, [(topic_key, topic_data)])].
+    """
+    files = []
+    postings = {}
+    for language, level, topics in topic_sets:
+        for topic_key, topic_data in topics:
+            entries = topic_data if isinstance(topic_data, list) else topic_data.get('words', [])
+            file_index = len(files)
+            files.append([language, level, topic_key])
+            for offset, entry in enumerate(entries):
+                bits = {}
+                for field, bit, _ in FIELDS:
+                    for term in tokenize(entry.get(field)):
+                        bits[term] = bits.get(term, 0) | bit
+                word_terms = tokenize(entry.get('word'))
+                if len(word_terms) == 1:
+                    bits[word_terms[0]] |= WHOLE_WORD
+                for term, field_bits in bits.items():
+                    postings.setdefault(term, []).extend((file_index, offset, field_bits))
+    return files, postings
+
+
+def _shard(items, budget, depth=1):
+    """
+    Split {term: value} into {key: {term: value}} where every key is a term
+    prefix. A shard over budget is split on the next character; terms no
+    longer than the key stay in the key's own shard.
+    """
+    groups = {}
+    for term, value in items.items():
+        groups.setdefault(term[:depth], {})[term] = value
+    shards = {}
+    for key, group in groups.items():
+        size = len(json.dumps(group, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+        longer = {term: value for term, value in group.items() if len(term) > depth}
+        if size <= budget or not longer:
+            shards[key] = group
+            continue
+        rest = {term: value for term, value in group.items() if len(term) <= depth}
+        if rest:
+            shards[key] = rest
+        shards.update(_shard(longer, budget, depth + 1))
+    return shards
+
+
+def build_search_index(topic_sets, budget=SHARD_BUDGET):
+    """Return (manifest data without file names, {(kind, key): payload bytes})."""
+    files, postings = collect_postings(topic_sets)
+    grams = {}
+    for term in postings:
+        for gram in trigrams(term):
+            grams.setdefault(gram, []).append(term)
+
+    payloads = {}
+    for kind, items in (('prefix', postings), ('trigram', grams)):
+        for key, shard in _shard(dict(sorted(items.items())), budget).items():
+            payloads[kind, key] = json.dumps(shard, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    data = {'version': SEARCH_VERSION, 'files': files, 'terms': len(postings), 'budget': budget}
+    return data, payloads
+
+
+def write_search_index(base_dir, topic_sets, budget=SHARD_BUDGET, dry_run=False):
+    """
+    Write the shards below <base_dir>/search/ and search.json, removing shards
+    from earlier builds. Returns True if anything changed.
+    """
+    search_dir = Path(base_dir) / SEARCH_DIR
+    data, payloads = build_search_index(topic_sets, budget)
+    shards = {'prefix': {}, 'trigram': {}}
+    names = {}
+    for (kind, key), payload in sorted(payloads.items()):
+        name = f'{kind}.{bytes_hash(payload)[:12]}.json'
+        names[name] = payload
+        shards[kind][key] = {'file': name, 'size': len(payload)}
+    data['shards'] = shards
+
+    manifest_path = search_dir / SEARCH_MANIFEST
+    manifest = (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+    if dry_run:
+        return any(not file_matches(search_dir / name, payload) for name, payload in names.items()) \
+            or not file_matches(manifest_path, manifest)
+
+    changed = False
+    for name, payload in names.items():
+        changed |= write_if_changed(search_dir / name, payload)
+    for old in search_dir.glob('*.*.json'):
+        if old.name not in names:
+            old.unlink()
+            changed = True
+    return write_if_changed(manifest_path, manifest) or changed
+
+
+def _shard_keys(keys, prefix):
+    """Shard keys that can hold terms starting with prefix."""
+    return [key for key in keys if key.startswith(prefix) or prefix.startswith(key)]
+
+
+class SearchIndex:
+    """Query API over the search shards; shards are read on first use and cached."""
+
+    def __init__(self, search_dir):
+        self.search_dir = Path(search_dir)
+        with open(self.search_dir / SEARCH_MANIFEST, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.files = data['files']
+        self.shards = data['shards']
+        self._loaded = {}
+        self._topics = {}
+
+    @classmethod
+    def load(cls, base_dir='data/word_lists'):
+        return cls(Path(base_dir) / SEARCH_DIR)
+
+    def _shard(self, kind, key):
+        if (kind, key) not in self._loaded:
+            with open(self.search_dir / self.shards[kind][key]['file'], 'r', encoding='utf-8') as f:
+                self._loaded[kind, key] = json.load(f)
+        return self._loaded[kind, key]
+
+    def prefix_terms(self, prefix):
+        """Return {term: postings} for every indexed term starting with prefix."""
+        result = {}
+        for key in _shard_keys(self.shards['prefix'], prefix):
+            for term, postings in self._shard('prefix', key).items():
+                if term.startswith(prefix):
+                    result[term] = postings
+        return result
+
+    def substring_terms(self, fragment):
+        """Return {term: postings} for terms containing fragment (3+ characters)."""
+        candidates = None
+        for gram in trigrams(fragment):
+            terms = set()
+            for key in _shard_keys(self.shards['trigram'], gram):
+                terms.update(self._shard('trigram', key).get(gram, ()))
+            candidates = terms if candidates is None else candidates & terms
+            if not candidates:
+                return {}
+        result = {}
+        for term in sorted(candidates or ()):
+            if fragment in term:
+                result[term] = self.prefix_terms(term).get(term, [])
+        return result
+
+    def search(self, query, limit=20, langs=None, levels=None, substring=True):
+        """
+        Rank entries matching every query token. Exact terms outrank prefix
+        matches, which outrank substring matches; matches in the word outrank
+        the translation, which outranks the example, and a single-token query
+        that is the entire word ranks highest. Returns
+        [{'language', 'level', 'topic', 'offset', 'score'}], best first.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        scores = None
+        for token in tokens:
+            matches = self.prefix_terms(token)
+            kind_weight = {term: 1.0 if term == token else 0.6 * len(token) / len(term) for term in matches}
+            if substring and len(token) >= 3:
+                for term, postings in self.substring_terms(token).items():
+                    if term not in matches:
+                        matches[term] = postings
+                        kind_weight[term] = 0.3 * len(token) / len(term)
+            token_scores = {}
+            for term, postings in matches.items():
+                for i in range(0, len(postings), 3):
+                    file_index, offset, bits = postings[i:i + 3]
+                    language, level, _ = self.files[file_index]
+                    if (langs and language not in langs) or (levels and level not in levels):
+                        continue
+                    score = kind_weight[term] * max(weight for _, bit, weight in FIELDS if bits & bit)
+                    if bits & WHOLE_WORD and len(tokens) == 1:
+                        score += WHOLE_WORD_BONUS * kind_weight[term]
+                    doc = (file_index, offset)
+                    if score > token_scores.get(doc, 0):
+                        token_scores[doc] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {doc: scores[doc] + s for doc, s in token_scores.items() if doc in scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [
+            {'language': self.files[file_index][0], 'level': self.files[file_index][1],
+             'topic': self.files[file_index][2], 'offset': offset, 'score': round(score, 3)}
+            for (file_index, offset), score in ranked
+        ]
+
+    def entry(self, hit, base_dir='data/word_lists'):
+        """Read the vocabulary entry a search hit points at."""
+        rel_path = f"{hit['language']}/{hit['level']}/{hit['topic']}.json"
+        if rel_path not in self._topics:
+            data = load_topic((Path(base_dir) / rel_path).read_bytes())
+            self._topics[rel_path] = data if isinstance(data, list) else data.get('words', [])
+        return self._topics[rel_path][hit['offset']]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the static vocabulary search index.')
+    parser.add_argument('query')
+    parser.add_argument('--base-dir', default='data/word_lists')
+    parser.add_argument('--lang', action='append', help='restrict to a language (repeatable)')
+    parser.add_argument('--level', action='append', help='restrict to a level (repeatable)')
+    parser.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    index = SearchIndex.load(args.base_dir)
+    hits = index.search(args.query, limit=args.limit, langs=args.lang, levels=args.level)
+    for hit in hits:
+        entry = index.entry(hit, args.base_dir)
+        print(f"{hit['score']:5.2f}  {hit['language']}/{hit['level']}/{hit['topic']}#{hit['offset']}: "
+              f"{entry.get('word')} -> {entry.get('translation')}")
+    if not hits:
+        print(f"No matches for {args.query!r}")
+    return 0 if hits else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
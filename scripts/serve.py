@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Static file server for the PWA, a drop-in replacement for `python -m http.server`.
+
+- serves precompressed .br/.gz siblings (e.g. the vocabulary bundles) when
+  the client accepts them, and gzips other text files on the fly
+- strong ETags with If-None-Match -> 304 Not Modified
+- Cache-Control: immutable for content-hashed files, revalidate otherwise
+- single byte-range requests (206 / 416)
+- one thread per connection, HTTP/1.1 keep-alive
+- access log with per-request latency
+
+Usage: python scripts/serve.py [--port 8000] [--bind 127.0.0.1] [--directory .]
+"""
+
+import argparse
+import email.utils
+import gzip
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# bundle.5f0343e7a9c3.json, app.3f2a9c1d.js, ...
+HASHED_NAME = re.compile(r'\.[0-9a-f]{8,}\.[A-Za-z0-9]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript',
+                      'application/manifest+json', 'image/svg+xml')
+MIN_COMPRESS_SIZE = 1024
+GZIP_CACHE_ENTRIES = 256
+
+
+class GzipCache:
+    """Small LRU of on-the-fly gzip results keyed by (path, mtime, size)."""
+
+    def __init__(self, max_entries=GZIP_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, stat, data):
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            compressed = self._items.get(key)
+            if compressed is not None:
+                self._items.move_to_end(key)
+                return compressed
+        compressed = gzip.compress(data, compresslevel=6, mtime=0)
+        with self._lock:
+            self._items[key] = compressed
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return compressed
+
+
+def accepted_encodings(header):
+    """Parse Accept-Encoding into the set of codings with a non-zero q-value."""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        match = re.search(r'q=([0-9.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(coding)
+    return accepted
+
+
+def parse_range(header, size):
+    """
+    Parse a single 'bytes=start-end' range. Returns (start, end) inclusive,
+    None if the header should be ignored, or 'invalid' if unsatisfiable.
+    """
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', (header or '').strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    start, end = match.groups()
+    if start == '':
+        length = int(end)
+        if length == 0:
+            return 'invalid'
+        return max(0, size - length), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return 'invalid'
+    return start, end
+
+
+class VocabRequestHandler(SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler with compression, validators, caching and ranges."""
+
+    protocol_version = 'HTTP/1.1'
+    gzip_cache = GzipCache()
+
+    def parse_request(self):
+        self._started = time.perf_counter()
+        self._sent_bytes = 0
+        return super().parse_request()
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def _serve(self, head):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = os.path.join(path, 'index.html')
+            if not self.path.split('?', 1)[0].endswith('/') or not os.path.isfile(index):
+                # Redirects and directory listings are left to the base class
+                return super().do_HEAD() if head else super().do_GET()
+            path = index
+        if not os.path.isfile(path):
+            self.send_error(HTTPStatus.NOT_FOUND, 'File not found')
+            return
+
+        ctype = self.guess_type(path)
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding'))
+        encoding, body_path = None, path
+        for coding, suffix in PRECOMPRESSED:
+            if coding in accepted and os.path.isfile(path + suffix):
+                encoding, body_path = coding, path + suffix
+                break
+
+        stat = os.stat(body_path)
+        compressible = ctype.startswith(COMPRESSIBLE_TYPES) and stat.st_size >= MIN_COMPRESS_SIZE
+        if encoding is None and compressible and 'gzip' in accepted:
+            encoding = 'gzip'
+            variant = 'gzip-dynamic'
+        else:
+            variant = encoding or 'identity'
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}-{variant}"'
+        name = os.path.basename(path)
+        cache_control = IMMUTABLE if HASHED_NAME.search(name) else REVALIDATE
+
+        def common_headers():
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self.send_header('Last-Modified', self.date_time_string(int(stat.st_mtime)))
+            if compressible or encoding:
+                self.send_header('Vary', 'Accept-Encoding')
+
+        if self._not_modified(etag, stat):
+            self._sent_bytes = 0
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            common_headers()
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        with open(body_path, 'rb') as f:
+            body = f.read()
+        if variant == 'gzip-dynamic':
+            body = self.gzip_cache.get(body_path, stat, body)
+
+        status = HTTPStatus.OK
+        content_range = None
+        byte_range = parse_range(self.headers.get('Range'), len(body))
+        if byte_range == 'invalid':
+            self._sent_bytes = 0
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header('Content-Range', f'bytes */{len(body)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if byte_range is not None and self._range_applies(etag, stat):
+            start, end = byte_range
+            content_range = f'bytes {start}-{end}/{len(body)}'
+            body = body[start:end + 1]
+            status = HTTPStatus.PARTIAL_CONTENT
+
+        self._sent_bytes = 0 if head else len(body)
+        self.send_response(status)
+        self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Accept-Ranges', 'bytes')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if content_range:
+            self.send_header('Content-Range', content_range)
+        common_headers()
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _not_modified(self, etag, stat):
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or etag in tags or f'W/{etag}' in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return since is not None and int(stat.st_mtime) <= since.timestamp()
+        return False
+
+    def _range_applies(self, etag, stat):
+        """Honour If-Range: only serve a partial body if the validator still matches."""
+        if_range = self.headers.get('If-Range')
+        if not if_range:
+            return True
+        if if_range.startswith(('"', 'W/')):
+            return if_range == etag
+        return if_range == self.date_time_string(int(stat.st_mtime))
+
+    def end_headers(self):
+        # Service workers must be able to control the whole app
+        if self.path.split('?', 1)[0].endswith('/sw.js'):
+            self.send_header('Service-Worker-Allowed', '/')
+        super().end_headers()
+
+    def log_request(self, code='-', size='-'):
+        elapsed = (time.perf_counter() - getattr(self, '_started', time.perf_counter())) * 1000
+        sent = getattr(self, '_sent_bytes', 0)
+        code = getattr(code, 'value', code)
+        self.log_message('"%s" %s %d %.1fms', self.requestline, code, sent, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the PWA with compression, ETags and caching.')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--bind', default='', help='address to bind (default: all interfaces)')
+    parser.add_argument('--directory', default=os.getcwd(), help='directory to serve (default: cwd)')
+    args = parser.parse_args()
+
+    handler = partial(VocabRequestHandler, directory=args.directory)
+    with ThreadingHTTPServer((args.bind, args.port), handler) as httpd:
+        host = args.bind or 'localhost'
+        print(f"🌐 Serving {args.directory} at http://{host}:{args.port}/")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\nServer stopped.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Translation providers for the words the lexicon misses.
+Before a build, every source word the lexicon cannot translate is collected
+and sent to a provider in batches: asyncio with bounded concurrency, a rate
+limit and retries with backoff. Results, including "no translation", go to
+a SQLite cache keyed by (source, language, provider), so a phrase is only
+ever sent once. The generators' lexicons then use the cached translations as
+a fallback, in the main process and in pool workers.
+
+A provider subclasses TranslationProvider and implements translate_batch.
+'stub' is an offline stand-in that answers from tab-separated files; other
+providers are named by import path, so an HTTP backend plugs in without
+touching the generators:
+
+    python scripts/generate_enhanced_word_lists.py --provider stub:en=es-en.tsv,ru=es-ru.tsv
+    python scripts/generate_enhanced_word_lists.py --provider mypackage.deepl:DeepLProvider
+"""
+
+import asyncio
+import importlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from normalize import normalize_key
+
+DEFAULT_CACHE = 'data/translation-cache.sqlite'
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 10.0
+RETRIES = 3
+BACKOFF = 0.5
+# Read through the environment so pool workers inherit them, like --lexicon
+CACHE_ENV = 'VOCAB_TRANSLATION_CACHE'
+PROVIDER_ENV = 'VOCAB_TRANSLATION_PROVIDER'
+
+
+class TranslationError(Exception):
+    """A batch failed in a way worth retrying (timeout, rate limit, 5xx)."""
+
+
+# Connection and timeout errors of HTTP backends are retried like TranslationError
+RETRYABLE = (TranslationError, OSError, asyncio.TimeoutError)
+
+
+class TranslationProvider:
+    """
+    Base class for translation backends. translate_batch receives up to
+    batch_size source texts and returns one translation or None per text.
+    """
+
+    name = None
+    batch_size = 50
+
+    @classmethod
+    def from_spec(cls, argument):
+        """Create the provider from the part of --provider after the first ':'."""
+        return cls()
+
+    async def translate_batch(self, texts, source_lang, target_lang):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+class StubProvider(TranslationProvider):
+    """
+    Offline stand-in: answers from {lang: {source: translation}} tables,
+    e.g. 'stub:en=es-en.tsv,ru=es-ru.tsv', and returns None for the rest.
+    """
+
+    name = 'stub'
+
+    def __init__(self, tables=None, delay=0.0):
+        self.tables = {lang: {normalize_key(source): target for source, target in table.items()}
+                       for lang, table in (tables or {}).items()}
+        self.delay = delay
+        self.batches = 0
+
+    @classmethod
+    def from_spec(cls, argument):
+        from binary_lexicon import read_tsv
+        tables = {}
+        for item in filter(None, argument.split(',')):
+            lang, _, path = item.partition('=')
+            tables[lang] = read_tsv(path)
+        return cls(tables)
+
+    async def translate_batch(self, texts, source_lang, target_lang):
+        self.batches += 1
+        await asyncio.sleep(self.delay)
+        table = self.tables.get(target_lang, {})
+        return [table.get(normalize_key(text)) for text in texts]
+
+
+PROVIDERS = {'stub': StubProvider}
+
+
+def load_provider(spec):
+    """
+    Create a provider from 'name[:argument]', where name is a key of
+    PROVIDERS or 'module:Class' (a TranslationProvider subclass).
+    """
+    name, _, argument = spec.partition(':')
+    if name in PROVIDERS:
+        return PROVIDERS[name].from_spec(argument)
+    class_name, _, argument = argument.partition(':')
+    if not class_name:
+        raise ValueError(f"Unknown translation provider {spec!r}; use one of {sorted(PROVIDERS)} "
+                         "or module:Class")
+    provider = getattr(importlib.import_module(name), class_name).from_spec(argument)
+    provider.name = provider.name or f'{name}:{class_name}'
+    return provider
+
+
+class TranslationCache:
+    """On-disk cache of provider results; a NULL translation records a miss."""
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                translation TEXT,
+                PRIMARY KEY (source, lang, provider)
+            ) WITHOUT ROWID
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def known(self, lang, provider):
+        """Normalized source texts already answered for lang by provider."""
+        rows = self.conn.execute('SELECT source FROM translations WHERE lang = ? AND provider = ?',
+                                 (lang, provider))
+        return {source for source, in rows}
+
+    def store(self, lang, provider, results):
+        """Record {source_text: translation or None} in one transaction."""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)',
+                [(normalize_key(source), lang, provider, translation) for source, translation in results.items()])
+
+    def tables(self, provider):
+        """Cached translations of provider as {lang: {source: translation}}."""
+        tables = {}
+        rows = self.conn.execute('SELECT lang, source, translation FROM translations '
+                                 'WHERE provider = ? AND translation IS NOT NULL ORDER BY lang, source',
+                                 (provider,))
+        for lang, source, translation in rows:
+            tables.setdefault(lang, {})[source] = translation
+        return tables
+
+
+class RateLimiter:
+    """Spaces out request starts to at most rate per second."""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = time.monotonic()
+            if self.next_start > now:
+                await asyncio.sleep(self.next_start - now)
+            self.next_start = max(now, self.next_start) + self.interval
+
+
+async def translate_all(provider, cache, texts_by_lang, source_lang,
+                        concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE, retries=RETRIES):
+    """
+    Translate {target_lang: [texts]} with provider and store every answered
+    batch in cache as soon as it arrives. A batch that still fails after
+    retries, fails with an unexpected error or gets a wrong number of answers
+    is left out of the cache, so the next build asks again; the other batches
+    carry on. Returns (translated, untranslatable, failed) counts.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate)
+    counts = [0, 0, 0]
+
+    def fail(lang, batch, error):
+        print(f"Warning: {provider.name} failed on {len(batch)} {lang} text(s): {error!r}")
+        counts[2] += len(batch)
+
+    async def run(lang, batch):
+        async with semaphore:
+            for attempt in range(retries + 1):
+                await limiter.wait()
+                try:
+                    answers = await provider.translate_batch(batch, source_lang, lang)
+                    if len(answers) != len(batch):
+                        raise TranslationError(f'{len(answers)} answer(s) for {len(batch)} text(s)')
+                    break
+                except RETRYABLE as e:
+                    if attempt == retries:
+                        fail(lang, batch, e)
+                        return
+                    await asyncio.sleep(BACKOFF * 2 ** attempt)
+                except Exception as e:
+                    fail(lang, batch, e)
+                    return
+        results = dict(zip(batch, answers))
+        cache.store(lang, provider.name, results)
+        answered = sum(1 for translation in results.values() if translation)
+        counts[0] += answered
+        counts[1] += len(results) - answered
+
+    size = provider.batch_size
+    try:
+        await asyncio.gather(*(run(lang, texts[i:i + size])
+                               for lang, texts in texts_by_lang.items()
+                               for i in range(0, len(texts), size)))
+    finally:
+        await provider.close()
+    return tuple(counts)
+
+
+def use_translation_cache(path, provider_name=None):
+    """
+    Make open_lexicon() fall back to provider_name's cached translations;
+    None stops the fallback for later builds.
+    """
+    if path:
+        os.environ[CACHE_ENV] = os.path.abspath(path)
+        os.environ[PROVIDER_ENV] = provider_name
+    else:
+        os.environ.pop(CACHE_ENV, None)
+        os.environ.pop(PROVIDER_ENV, None)
+
+
+def cached_tables():
+    """The cached tables selected by use_translation_cache, or None."""
+    path = os.environ.get(CACHE_ENV)
+    if not path or not os.path.exists(path):
+        return None
+    cache = TranslationCache(path)
+    try:
+        return cache.tables(os.environ[PROVIDER_ENV])
+    finally:
+        cache.close()
+
+
+def fill_missing_translations(get_lexicon, levels, src_txt, parse_file, langs, source_language,
+                              spec, cache_path=DEFAULT_CACHE, concurrency=DEFAULT_CONCURRENCY,
+                              rate=DEFAULT_RATE):
+    """
+    Send the source words of levels that get_lexicon() cannot translate into
+    one of the generator's langs to the provider named by spec, unless the
+    cache already has its answer. Afterwards get_lexicon() returns a lexicon
+    that falls back to the cached translations.
+    """
+    source_lang = next(lang['tcode'] for lang in langs if lang['code'] == source_language)
+    targets = [lang['tcode'] for lang in langs if lang['code'] != source_language]
+    words = {}
+    for level in levels:
+        if Path(src_txt[level]).exists():
+            for topic_words in parse_file(src_txt[level]).values():
+                words.update(dict.fromkeys(topic_words))
+
+    provider = load_provider(spec)
+    lexicon = get_lexicon()
+    cache = TranslationCache(cache_path)
+    try:
+        pending = {}
+        for lang in targets:
+            known = cache.known(lang, provider.name)
+            misses = [word for word in words if lexicon.lookup(word, lang) is None]
+            pending[lang] = [word for word in misses if normalize_key(word) not in known]
+            print(f"{lang}: {len(misses)} lexicon miss(es), {len(pending[lang])} not cached yet")
+        lexicon.reset_stats()
+        if any(pending.values()):
+            translated, untranslatable, failed = asyncio.run(
+                translate_all(provider, cache, pending, source_lang, concurrency, rate))
+            print(f"{provider.name}: {translated} translated, {untranslatable} without translation, "
+                  f"{failed} failed")
+    finally:
+        cache.close()
+
+    use_translation_cache(cache_path, provider.name)
+    get_lexicon.cache_clear()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+SQLite export of the generated vocabulary, for the chatbot servers and
+analytics jobs. Levels, topics, source words, translations and examples are
+normalized into their own tables. entries joins them in topic order, an FTS5
+table indexes words, translations and examples, and covering indexes answer
+'the words of this language/level/topic' from the index alone.
+
+The database is rebuilt in place in one transaction. It uses WAL mode, so
+readers keep seeing the previous build until the new one commits. A build
+whose inputs are unchanged does not touch the file.
+
+Usage:
+    python scripts/generate_enhanced_word_lists.py --sqlite data/vocabulary.sqlite
+    python scripts/vocab_db.py data/vocabulary.sqlite topics english b1
+    python scripts/vocab_db.py data/vocabulary.sqlite words english b1 alimentación
+    python scripts/vocab_db.py data/vocabulary.sqlite search "piel" --lang english
+"""
+
+import argparse
+import sqlite3
+import sys
+from pathlib import Path
+
+from build_manifest import content_hash
+from normalize import fold_key
+
+SQLITE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE levels (id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE);
+CREATE TABLE topics (
+    id INTEGER PRIMARY KEY,
+    lang TEXT NOT NULL,
+    level_id INTEGER NOT NULL REFERENCES levels(id),
+    key TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE UNIQUE INDEX topics_by_lang_level ON topics (lang, level_id, key, id, name);
+CREATE TABLE source_words (id INTEGER PRIMARY KEY, word TEXT NOT NULL UNIQUE, word_key TEXT NOT NULL);
+CREATE INDEX source_words_by_key ON source_words (word_key, id);
+CREATE TABLE translations (
+    id INTEGER PRIMARY KEY,
+    lang TEXT NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (lang, text)
+);
+CREATE TABLE examples (
+    id INTEGER PRIMARY KEY,
+    lang TEXT NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (lang, text)
+);
+CREATE TABLE entries (
+    id INTEGER PRIMARY KEY,
+    topic_id INTEGER NOT NULL REFERENCES topics(id),
+    position INTEGER NOT NULL,
+    word_id INTEGER NOT NULL REFERENCES source_words(id),
+    translation_id INTEGER REFERENCES translations(id),
+    example_id INTEGER REFERENCES examples(id)
+);
+CREATE INDEX entries_by_topic ON entries (topic_id, position, word_id, translation_id, example_id);
+CREATE INDEX entries_by_word ON entries (word_id, topic_id);
+CREATE VIRTUAL TABLE entries_fts USING fts5 (
+    word, translation, example,
+    content = '', tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+TABLES = ('entries_fts', 'entries', 'examples', 'translations', 'source_words', 'topics', 'levels', 'meta')
+
+
+class _Interner:
+    """Assigns row ids to distinct values, in first-seen order."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def __call__(self, value):
+        if value not in self.ids:
+            self.ids[value] = len(self.ids) + 1
+        return self.ids[value]
+
+    def rows(self):
+        return [(row_id, *value) if isinstance(value, tuple) else (row_id, value)
+                for value, row_id in self.ids.items()]
+
+
+def _rows(topic_sets):
+    """Flatten the pipeline's [(language, level, [(topic_key, topic_data)])] into table rows."""
+    levels, words, translations, examples = _Interner(), _Interner(), _Interner(), _Interner()
+    topics = []
+    entries = []
+    fts = []
+    for language, level, topic_list in topic_sets:
+        level_id = levels(level)
+        for topic_key, topic_data in topic_list:
+            topic_id = len(topics) + 1
+            topics.append((topic_id, language, level_id, topic_key, topic_data.get('topic') or topic_key))
+            for position, entry in enumerate(topic_data.get('words', [])):
+                word = entry.get('word', '')
+                translation = entry.get('translation')
+                example = entry.get('example')
+                entries.append((len(entries) + 1, topic_id, position, words(word),
+                                translations((language, translation)) if translation else None,
+                                examples((language, example)) if example else None))
+                fts.append((len(entries), word, translation or '', example or ''))
+    source_words = [(row_id, word, fold_key(word)) for row_id, word in words.rows()]
+    return levels.rows(), topics, source_words, translations.rows(), examples.rows(), entries, fts
+
+
+def _stored_hash(conn):
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'input_hash'").fetchone()
+    except sqlite3.DatabaseError:
+        return None
+    return row[0] if row else None
+
+
+def _plain(topic_sets):
+    """topic_sets with VocabStore entries (see vocab_store) as the dicts they stand for."""
+    plain = []
+    for language, level, topic_list in topic_sets:
+        topics = []
+        for topic_key, topic_data in topic_list:
+            words = [dict(entry.items()) for entry in topic_data.get('words', [])]
+            topics.append((topic_key, {'topic': topic_data.get('topic'), 'words': words}))
+        plain.append((language, level, topics))
+    return plain
+
+
+def write_vocabulary_db(path, topic_sets, dry_run=False, input_hash=None):
+    """
+    Export topic_sets (see wordlist_pipeline) to the SQLite database at path.
+    input_hash identifies the topic sets, e.g. by the output hashes in the
+    build manifest; without it their contents are hashed.
+    Returns True if the database changed (or would change, in a dry run).
+    """
+    input_hash = content_hash(SQLITE_VERSION, input_hash or _plain(topic_sets))
+    if dry_run and not Path(path).exists():
+        return True
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        if _stored_hash(conn) == input_hash:
+            return False
+        if dry_run:
+            return True
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA foreign_keys = OFF')
+        levels, topics, source_words, translations, examples, entries, fts = _rows(topic_sets)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for table in TABLES:
+                conn.execute(f'DROP TABLE IF EXISTS {table}')
+            for statement in SCHEMA.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.executemany('INSERT INTO levels VALUES (?, ?)', levels)
+            conn.executemany('INSERT INTO topics VALUES (?, ?, ?, ?, ?)', topics)
+            conn.executemany('INSERT INTO source_words VALUES (?, ?, ?)', source_words)
+            conn.executemany('INSERT INTO translations VALUES (?, ?, ?)', translations)
+            conn.executemany('INSERT INTO examples VALUES (?, ?, ?)', examples)
+            conn.executemany('INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)', entries)
+            conn.executemany('INSERT INTO entries_fts (rowid, word, translation, example) VALUES (?, ?, ?, ?)', fts)
+            conn.executemany('INSERT INTO meta VALUES (?, ?)',
+                             [('version', str(SQLITE_VERSION)), ('input_hash', input_hash)])
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('ANALYZE')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return True
+    finally:
+        conn.close()
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query: every token must match, the last one as a prefix."""
+    tokens = fold_key(text).replace('"', ' ').split()
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"' for token in tokens) + '*'
+
+
+ENTRY_COLUMNS = """
+    SELECT t.lang, l.code AS level, t.key AS topic, e.position, w.word,
+           tr.text AS translation, ex.text AS example
+    FROM entries e
+    JOIN topics t ON t.id = e.topic_id
+    JOIN levels l ON l.id = t.level_id
+    JOIN source_words w ON w.id = e.word_id
+    LEFT JOIN translations tr ON tr.id = e.translation_id
+    LEFT JOIN examples ex ON ex.id = e.example_id
+"""
+
+
+class VocabularyDB:
+    """Read-only queries over a database written by write_vocabulary_db."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _all(self, sql, params=()):
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def topics(self, lang, level):
+        """[{'key', 'name', 'count'}] of one language/level, in build order."""
+        return self._all("""
+            SELECT t.key, t.name, (SELECT COUNT(*) FROM entries e WHERE e.topic_id = t.id) AS count
+            FROM topics t JOIN levels l ON l.id = t.level_id
+            WHERE t.lang = ? AND l.code = ?
+            ORDER BY t.id
+        """, (lang, level))
+
+    def topic_words(self, lang, level, topic, limit=-1):
+        """Entries of one topic in list order; limit=-1 returns all of them."""
+        return self._all(ENTRY_COLUMNS + """
+            WHERE t.lang = ? AND l.code = ? AND t.key = ?
+            ORDER BY e.position LIMIT ?
+        """, (lang, level, topic, limit))
+
+    def translations(self, word, lang=None):
+        """Entries whose source word matches word, ignoring case and accents."""
+        sql = ENTRY_COLUMNS + ' WHERE w.word_key = ?'
+        params = [fold_key(word)]
+        if lang:
+            sql += ' AND t.lang = ?'
+            params.append(lang)
+        return self._all(sql + ' ORDER BY e.id', params)
+
+    def search(self, text, lang=None, level=None, limit=20):
+        """Full-text search over words, translations and examples, best match first."""
+        query = fts_query(text)
+        if not query:
+            return []
+        sql = """
+            WITH hits AS (
+                SELECT rowid, bm25(entries_fts, 3.0, 2.0, 1.0) AS rank
+                FROM entries_fts WHERE entries_fts MATCH ?
+            )
+        """ + ENTRY_COLUMNS + ' JOIN hits h ON h.rowid = e.id WHERE 1'
+        params = [query]
+        if lang:
+            sql += ' AND t.lang = ?'
+            params.append(lang)
+        if level:
+            sql += ' AND l.code = ?'
+            params.append(level)
+        return self._all(sql + ' ORDER BY h.rank, e.id LIMIT ?', params + [limit])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the SQLite vocabulary export.')
+    parser.add_argument('database')
+    commands = parser.add_subparsers(dest='command', required=True)
+    topics = commands.add_parser('topics', help='list the topics of a language/level')
+    topics.add_argument('lang')
+    topics.add_argument('level')
+    words = commands.add_parser('words', help='list the words of a topic')
+    words.add_argument('lang')
+    words.add_argument('level')
+    words.add_argument('topic')
+    words.add_argument('--limit', type=int, default=-1)
+    search = commands.add_parser('search', help='full-text search')
+    search.add_argument('query')
+    search.add_argument('--lang')
+    search.add_argument('--level')
+    search.add_argument('--limit', type=int, default=10)
+    args = parser.parse_args()
+
+    with VocabularyDB(args.database) as db:
+        if args.command == 'topics':
+            rows = db.topics(args.lang, args.level)
+            for row in rows:
+                print(f"{row['key']}: {row['name']} ({row['count']} words)")
+        elif args.command == 'words':
+            rows = db.topic_words(args.lang, args.level, args.topic, args.limit)
+            for row in rows:
+                print(f"{row['word']} -> {row['translation']}")
+        else:
+            rows = db.search(args.query, args.lang, args.level, args.limit)
+            for row in rows:
+                print(f"{row['lang']}/{row['level']}/{row['topic']}#{row['position']}: "
+                      f"{row['word']} -> {row['translation']}")
+    if not rows:
+        print('No results')
+    return 0 if rows else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
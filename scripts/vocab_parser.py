@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for the vocabulary source files.
+Reads a file line by line and yields one record per word, so large merged
+corpora can be processed without holding the whole text in memory.
+
+File format:
+    ## 1. Individuo: dimensión física     <- section heading (topic)
+    # Body parts                          <- comment
+    músculo                               <- one word or phrase per line
+
+Headless lists (b2_words.txt, c1_words.txt) are plain word-per-line files;
+parse them with a default_topic. paginate() splits long topics into pages.
+"""
+
+import re
+
+from normalize import fold_key, normalize_key
+
+HEADING_PREFIX = re.compile(r'##\s*\d*\.?\s*')
+
+
+def heading_key(line):
+    """Turn a '## 1. Individuo: dimensión física' heading into 'dimensión_física'."""
+    key_match = HEADING_PREFIX.sub('', line)
+    if ':' in key_match:
+        key = key_match.split(':')[1]
+    else:
+        key = key_match.replace('##', '').strip()
+    return key.strip().lower().replace(' ', '_')
+
+
+def iter_records(lines, topic_names=None, default_topic=None):
+    """
+    Yield (topic_key, word, line_no) records from an iterable of lines.
+    A heading yields (topic_key, None, line_no) so that empty sections are
+    still reported. topic_names optionally maps Spanish keys to other keys.
+    Lines before the first heading go to default_topic, or are skipped
+    without one; blank lines and '#' comments are always skipped.
+    """
+    topic = None
+    if default_topic is not None:
+        topic = default_topic
+        yield topic, None, 0
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if line.startswith('##'):
+            key = heading_key(line)
+            topic = topic_names.get(key, key) if topic_names else key
+            yield topic, None, line_no
+            continue
+
+        if not line or line.startswith('#') or topic is None:
+            continue
+
+        yield topic, line, line_no
+
+
+def iter_file(path, topic_names=None, default_topic=None):
+    """Stream records from a UTF-8 vocabulary file, one line at a time."""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from iter_records(f, topic_names, default_topic)
+
+
+def collect_topics(records, source='<text>'):
+    """
+    Group records into {topic_key: [word1, word2, ...]}.
+    A repeated heading starts its section over, as the original parser did.
+    """
+    result = {}
+    headings = {}
+    for topic, word, line_no in records:
+        if word is None:
+            if topic in headings and line_no:
+                print(f"Warning: {source}:{line_no}: section '{topic}' repeats line "
+                      f"{headings[topic]}; earlier entries are replaced")
+            headings[topic] = line_no
+            result[topic] = []
+            continue
+        result[topic].append(word)
+    return result
+
+
+def parse_txt(text, topic_names=None, default_topic=None):
+    """
+    Parse vocabulary text into {topic_key: [word1, word2, ...]}.
+    Compatible wrapper over the streaming parser.
+    """
+    return collect_topics(iter_records(text.split('\n'), topic_names, default_topic))
+
+
+def parse_file(path, topic_names=None, default_topic=None):
+    """Parse a vocabulary file into {topic_key: [words]} without reading it whole."""
+    return collect_topics(iter_file(path, topic_names, default_topic), source=str(path))
+
+
+def read_frequencies(path):
+    """Read a 'word<TAB or space>count' frequency list into {normalized word: count}."""
+    frequencies = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            word, _, count = line.strip().rpartition('\t' if '\t' in line else ' ')
+            if word and count.isdigit():
+                frequencies[normalize_key(word)] = int(count)
+    return frequencies
+
+
+def order_words(words, order='source', frequencies=None):
+    """
+    Return words in page order: 'source' keeps the file order, 'alpha' sorts
+    accent- and case-insensitively, 'frequency' puts the most frequent words
+    first (words missing from frequencies last, alphabetically).
+    """
+    def alpha(word):
+        return fold_key(word), word
+
+    if order == 'alpha':
+        return sorted(words, key=alpha)
+    if order == 'frequency':
+        frequencies = frequencies or {}
+        return sorted(words, key=lambda word: (-frequencies.get(normalize_key(word), 0), alpha(word)))
+    return list(words)
+
+
+def paginate(topics_map, page_size, order='source', frequencies=None):
+    """
+    Split every topic longer than page_size into pages '<topic>_01',
+    '<topic>_02', ... Returns (topics_map, pages), where pages maps each
+    split topic to [{'key', 'offset', 'count', 'first', 'last'}] in order.
+    Topics that fit on one page are kept as they are.
+    """
+    paged = {}
+    pages = {}
+    for topic, words in topics_map.items():
+        if not page_size or len(words) <= page_size:
+            paged[topic] = words
+            continue
+        words = order_words(words, order, frequencies)
+        count = (len(words) + page_size - 1) // page_size
+        width = max(2, len(str(count)))
+        pages[topic] = []
+        for number, offset in enumerate(range(0, len(words), page_size), 1):
+            page_words = words[offset:offset + page_size]
+            key = f'{topic}_{number:0{width}d}'
+            paged[key] = page_words
+            pages[topic].append({'key': key, 'offset': offset, 'count': len(page_words),
+                                 'first': page_words[0], 'last': page_words[-1]})
+    return paged, pages
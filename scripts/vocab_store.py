@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory vocabulary model shared by the build scripts.
+Every string (and list value, e.g. answer keys, as a tuple) is interned
+once in a value pool and referred to by an integer ID; levels, languages
+and topics get integer IDs too. A level's source words are one array of
+value IDs with a (start, stop) span per topic, and each language view of
+the level adds one array per entry field. The 'word' column of every view
+is the level's source array itself, so the languages of a level share it
+instead of holding a copy each.
+
+Entries are read through Entry records (__slots__, created on access) that
+answer get() like the entry dicts of a topic file, so the bundle and index
+builders take the store's views in place of loaded topic files.
+"""
+
+from array import array
+
+MISSING = -1
+
+
+class _Layout:
+    """Source words of a level: value IDs plus the span of every topic."""
+
+    __slots__ = ('words', 'spans')
+
+    def __init__(self, words, spans):
+        self.words = words
+        self.spans = spans
+
+
+class _View:
+    """One language of a level: a layout plus a value-ID column per field."""
+
+    __slots__ = ('layout', 'fields', 'columns', 'names')
+
+    def __init__(self, layout, fields, columns, names):
+        self.layout = layout
+        self.fields = fields
+        self.columns = columns
+        self.names = names
+
+
+class Entry:
+    """One entry of a language view, read like the entry dict it came from."""
+
+    __slots__ = ('_store', '_view', '_row')
+
+    def __init__(self, store, view, row):
+        self._store = store
+        self._view = view
+        self._row = row
+
+    def get(self, field, default=None):
+        column = self._view.columns.get(field)
+        if column is None:
+            return default
+        value = column[self._row]
+        return default if value == MISSING else self._store.values[value]
+
+    def __getitem__(self, field):
+        column = self._view.columns.get(field)
+        if column is None or column[self._row] == MISSING:
+            raise KeyError(field)
+        return self._store.values[column[self._row]]
+
+    def __contains__(self, field):
+        column = self._view.columns.get(field)
+        return column is not None and column[self._row] != MISSING
+
+    def __iter__(self):
+        row = self._row
+        columns = self._view.columns
+        return (field for field in self._view.fields if columns[field][row] != MISSING)
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(field, self[field]) for field in self]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f'Entry({self.to_dict()!r})'
+
+
+class EntryList:
+    """The entries of one topic in a language view, without copying them out."""
+
+    __slots__ = ('_store', '_view', '_start', '_stop')
+
+    def __init__(self, store, view, start, stop):
+        self._store = store
+        self._view = view
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return Entry(self._store, self._view, self._start + index)
+
+    def __iter__(self):
+        store, view = self._store, self._view
+        return (Entry(store, view, row) for row in range(self._start, self._stop))
+
+
+class VocabStore:
+    """Interned values, integer IDs and columnar entries for levels and languages."""
+
+    def __init__(self):
+        self.values = []
+        self._value_ids = {}
+        self.names = {'level': [], 'language': [], 'topic': []}
+        self._name_ids = {kind: {} for kind in self.names}
+        self._sources = {}
+        self._views = {}
+
+    def intern(self, value):
+        """ID of value in the pool; lists are stored as tuples."""
+        if isinstance(value, list):
+            value = tuple(value)
+        value_id = self._value_ids.get(value)
+        if value_id is None:
+            value_id = self._value_ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def id_of(self, kind, name):
+        """Integer ID of a level, language or topic name."""
+        ids = self._name_ids[kind]
+        name_id = ids.get(name)
+        if name_id is None:
+            name_id = ids[name] = len(self.names[kind])
+            self.names[kind].append(name)
+        return name_id
+
+    def _layout(self, topics):
+        """Intern [(topic_key, words)] into a layout."""
+        words = array('i')
+        spans = {}
+        for topic_key, topic_words in topics:
+            start = len(words)
+            words.extend(map(self.intern, topic_words))
+            spans[self.id_of('topic', topic_key)] = (start, len(words))
+        return _Layout(words, spans)
+
+    def add_level(self, level, topics_map):
+        """Store the parsed source words of a level, {topic_key: [words]}."""
+        self._sources[self.id_of('level', level)] = self._layout(topics_map.items())
+
+    def topic_keys(self, level):
+        layout = self._sources[self.id_of('level', level)]
+        return [self.names['topic'][topic_id] for topic_id in layout.spans]
+
+    def words(self, level, topic_key):
+        """The source words of one topic as a list of strings."""
+        layout = self._sources[self.id_of('level', level)]
+        start, stop = layout.spans[self.id_of('topic', topic_key)]
+        values = self.values
+        return [values[value] for value in layout.words[start:stop]]
+
+    def add_view(self, level, language, topics):
+        """
+        Store a language view of a level from [(topic_key, topic_data)] as
+        read from its topic files. If the topics and words match the level's
+        source words, the view shares them; otherwise it gets its own layout.
+        """
+        level_id = self.id_of('level', level)
+        entries_of = [(topic_key, data if isinstance(data, list) else data.get('words', []))
+                      for topic_key, data in topics]
+        layout = self._layout((topic_key, [entry.get('word', '') for entry in entries])
+                              for topic_key, entries in entries_of)
+        source = self._sources.get(level_id)
+        if source is None:
+            self._sources[level_id] = layout
+        elif list(source.spans.items()) == list(layout.spans.items()) and source.words == layout.words:
+            layout = source
+
+        fields = []
+        for _, entries in entries_of:
+            for entry in entries:
+                for field in entry:
+                    if field not in fields:
+                        fields.append(field)
+        columns = {field: array('i', [MISSING]) * len(layout.words) for field in fields}
+        columns['word'] = layout.words
+        row = 0
+        for _, entries in entries_of:
+            for entry in entries:
+                for field, value in entry.items():
+                    if field != 'word':
+                        columns[field][row] = self.intern(value)
+                row += 1
+        names = {self.id_of('topic', topic_key): self.intern(data.get('topic'))
+                 for topic_key, data in topics if isinstance(data, dict)}
+        self._views[level_id, self.id_of('language', language)] = _View(layout, fields, columns, names)
+
+    def topics(self, level, language):
+        """
+        The view as [(topic_key, {'topic': name, 'words': EntryList})], the
+        shape of loaded topic files.
+        """
+        view = self._views[self.id_of('level', level), self.id_of('language', language)]
+        result = []
+        for topic_id, (start, stop) in view.layout.spans.items():
+            name = view.names.get(topic_id)
+            data = {'topic': None if name is None else self.values[name],
+                    'words': EntryList(self, view, start, stop)}
+            result.append((self.names['topic'][topic_id], data))
+        return result
@@ -1,72 +1,277 @@
 #!/usr/bin/env python3
 """
 Summary script to show statistics of the generated topical vocabulary files.
+Languages and levels are discovered from data/word_lists, topic files are
+read concurrently and per-file statistics are cached by (path, mtime, size),
+so repeat runs only re-read files that changed. Besides word counts, the
+report lists untranslated entries, words repeated across topics and examples
+that are only the fallback template.
 """
 
-import os
+import argparse
 import json
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def main():
-    """Generate summary statistics of the vocabulary files."""
-    base_dir = Path('data/word_lists')
-    
+from compact_format import load_topic
+from example_engine import DEFAULT_TEMPLATE, TOPIC_TEMPLATES, WORD_TEMPLATES
+from normalize import normalize_key
+
+CACHE_NAME = '.summary-cache.json'
+CACHE_VERSION = 1
+# The generators' source language: its translation is the word by design
+SOURCE_LANGUAGE = 'spanish'
+
+
+def template_patterns():
+    """Compile the generators' fallback example templates into regexes."""
+    templates = [DEFAULT_TEMPLATE]
+    templates += WORD_TEMPLATES.values()
+    templates += TOPIC_TEMPLATES.values()
+    patterns = []
+    for template in templates:
+        if not template:
+            continue
+        pattern = re.escape(template)
+        for name in ('word', 'topic'):
+            pattern = pattern.replace(re.escape('{' + name + '}'), '.+')
+        patterns.append(re.compile(f'^{pattern}$'))
+    return patterns
+
+
+TEMPLATE_PATTERNS = template_patterns()
+
+
+def discover(base_dir):
+    """Return {language: [levels]} for every <language>/<level>/ directory."""
+    languages = {}
+    for lang_dir in sorted(p for p in Path(base_dir).iterdir() if p.is_dir()):
+        levels = sorted(p.name for p in lang_dir.iterdir() if p.is_dir())
+        if levels:
+            languages[lang_dir.name] = levels
+    return languages
+
+
+def topic_files(level_dir):
+    """Topic JSON files in a level directory (no indexes, bundles or dotfiles)."""
+    return sorted(
+        p for p in level_dir.glob('*.json')
+        if p.name not in ('index.json', 'pages.json') and not p.name.startswith(('bundle.', '.'))
+    )
+
+
+def file_stats(path):
+    """Read one topic file and compute its statistics."""
+    data = load_topic(path.read_bytes())
+    words = data if isinstance(data, list) else data.get('words', [])
+    untranslated = []
+    template_examples = 0
+    for entry in words:
+        word = entry.get('word', '')
+        if entry.get('translation') == word:
+            untranslated.append(word)
+        example = entry.get('example') or ''
+        if any(p.match(example) for p in TEMPLATE_PATTERNS):
+            template_examples += 1
+    return {
+        'words': len(words),
+        'untranslated': untranslated,
+        'template_examples': template_examples,
+        'keys': sorted({normalize_key(entry.get('word', '')) for entry in words})
+    }
+
+
+class StatsCache:
+    """Per-file statistics keyed by path and invalidated by mtime and size."""
+
+    def __init__(self, path, enabled=True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.files = {}
+        self.dirty = False
+        if enabled and self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self.files = data.get('files', {})
+            except (OSError, ValueError):
+                self.files = {}
+
+    def get(self, path, stat):
+        record = self.files.get(str(path))
+        if record and record['mtime_ns'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+            return record['stats']
+        return None
+
+    def put(self, path, stat, stats):
+        self.files[str(path)] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'stats': stats}
+        self.dirty = True
+
+    def save(self, live_paths):
+        if not self.enabled:
+            return
+        stale = set(self.files) - live_paths
+        for path in stale:
+            del self.files[path]
+        if self.dirty or stale:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'files': self.files}, f, ensure_ascii=False)
+
+
+def load_all(paths, cache, jobs):
+    """Return {path: stats}, reading uncached files in a thread pool."""
+    results = {}
+    pending = []
+    for path in paths:
+        stat = path.stat()
+        stats = cache.get(path, stat)
+        if stats is None:
+            pending.append((path, stat))
+        else:
+            results[path] = stats
+
+    def load(item):
+        path, stat = item
+        try:
+            return path, stat, file_stats(path)
+        except (OSError, ValueError, AttributeError) as e:
+            return path, stat, {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for path, stat, stats in pool.map(load, pending):
+            results[path] = stats
+            if 'error' not in stats:
+                cache.put(path, stat, stats)
+    return results, len(pending)
+
+
+def build_report(base_dir, jobs=8, use_cache=True):
+    """Collect statistics for every language/level below base_dir."""
+    base_dir = Path(base_dir)
+    languages = discover(base_dir)
+    files = {
+        (lang, level): topic_files(base_dir / lang / level)
+        for lang, levels in languages.items() for level in levels
+    }
+    cache = StatsCache(base_dir / CACHE_NAME, enabled=use_cache)
+    all_paths = [path for paths in files.values() for path in paths]
+    stats, reread = load_all(all_paths, cache, jobs)
+    cache.save({str(path) for path in all_paths})
+
+    report = {'languages': {}, 'errors': [], 'files_read': reread, 'files_cached': len(all_paths) - reread}
+    for lang, levels in languages.items():
+        lang_report = {'words': 0, 'levels': {}}
+        for level in levels:
+            level_report = {'topics': 0, 'words': 0, 'untranslated': [], 'template_examples': 0,
+                            'duplicates': []}
+            topics_by_key = {}
+            for path in files[lang, level]:
+                file_report = stats[path]
+                if 'error' in file_report:
+                    report['errors'].append({'file': str(path), 'error': file_report['error']})
+                    continue
+                level_report['topics'] += 1
+                level_report['words'] += file_report['words']
+                level_report['template_examples'] += file_report['template_examples']
+                if lang != SOURCE_LANGUAGE:
+                    level_report['untranslated'] += [
+                        {'topic': path.stem, 'word': word} for word in file_report['untranslated']
+                    ]
+                for key in file_report['keys']:
+                    topics_by_key.setdefault(key, []).append(path.stem)
+            level_report['duplicates'] = [
+                {'word': key, 'topics': topics}
+                for key, topics in sorted(topics_by_key.items()) if len(topics) > 1
+            ]
+            lang_report['levels'][level] = level_report
+            lang_report['words'] += level_report['words']
+        report['languages'][lang] = lang_report
+
+    report['totals'] = {
+        'files': sum(l['topics'] for lang in report['languages'].values() for l in lang['levels'].values()),
+        'words': sum(lang['words'] for lang in report['languages'].values()),
+        'languages': len(languages),
+        'levels': len({level for levels in languages.values() for level in levels})
+    }
+
+    # Topic list from the first index.json found (Spanish B1 in a full build)
+    report['topics'] = []
+    for lang, level in [(SOURCE_LANGUAGE, 'b1')] + list(files):
+        index_file = base_dir / lang / level / 'index.json'
+        if index_file.exists():
+            with open(index_file, 'r', encoding='utf-8') as f:
+                report['topics'] = json.load(f)
+            break
+    return report
+
+
+def print_text(report, show=5):
+    """Print the report in the original human-readable layout."""
     print("🎯 Topical Vocabulary Generation Summary")
     print("=" * 50)
-    
-    total_files = 0
-    total_words = 0
-    
-    languages = ['spanish', 'english', 'russian']
-    levels = ['b1', 'b2']
-    
-    for lang in languages:
+
+    for lang, lang_report in report['languages'].items():
         print(f"\n📚 {lang.upper()} Language Files:")
-        lang_total = 0
-        
-        for level in levels:
-            level_dir = base_dir / lang / level
-            if level_dir.exists():
-                # Count JSON files (excluding index.json)
-                json_files = [f for f in level_dir.glob('*.json') if f.name != 'index.json']
-                level_words = 0
-                
-                for json_file in json_files:
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            words_count = len(data.get('words', []))
-                            level_words += words_count
-                    except Exception as e:
-                        print(f"   Error reading {json_file}: {e}")
-                
-                print(f"   {level.upper()}: {len(json_files)} topics, {level_words} words")
-                lang_total += level_words
-                total_files += len(json_files)
-        
-        print(f"   Total for {lang}: {lang_total} words")
-        total_words += lang_total
-    
+        for level, level_report in lang_report['levels'].items():
+            print(f"   {level.upper()}: {level_report['topics']} topics, {level_report['words']} words")
+            untranslated = level_report['untranslated']
+            if untranslated:
+                sample = ', '.join(item['word'] for item in untranslated[:show])
+                print(f"      ⚠️  {len(untranslated)} untranslated (translation == word): {sample}")
+            if level_report['duplicates']:
+                sample = ', '.join(
+                    f"{d['word']} ({len(d['topics'])} topics)" for d in level_report['duplicates'][:show]
+                )
+                print(f"      🔁 {len(level_report['duplicates'])} words in several topics: {sample}")
+            if level_report['template_examples']:
+                print(f"      📝 {level_report['template_examples']} template-only examples")
+        print(f"   Total for {lang}: {lang_report['words']} words")
+
+    for error in report['errors']:
+        print(f"   Error reading {error['file']}: {error['error']}")
+
+    totals = report['totals']
     print(f"\n🎉 OVERALL SUMMARY:")
-    print(f"   Total JSON files: {total_files}")
-    print(f"   Total vocabulary entries: {total_words}")
-    print(f"   Languages: {len(languages)}")
-    print(f"   Levels: {len(levels)}")
-    
-    # Show available topics
-    spanish_b1_dir = base_dir / 'spanish' / 'b1'
-    if spanish_b1_dir.exists():
-        try:
-            with open(spanish_b1_dir / 'index.json', 'r', encoding='utf-8') as f:
-                topics = json.load(f)
-            print(f"\n📋 Available Topics ({len(topics)}):")
-            for i, topic in enumerate(topics, 1):
-                display_name = topic.replace('_', ' ').title()
-                print(f"   {i:2d}. {display_name}")
-        except Exception as e:
-            print(f"Error reading topics: {e}")
-    
+    print(f"   Total JSON files: {totals['files']}")
+    print(f"   Total vocabulary entries: {totals['words']}")
+    print(f"   Languages: {totals['languages']}")
+    print(f"   Levels: {totals['levels']}")
+    print(f"   Files read: {report['files_read']}, from cache: {report['files_cached']}")
+
+    if report['topics']:
+        print(f"\n📋 Available Topics ({len(report['topics'])}):")
+        for i, topic in enumerate(report['topics'], 1):
+            display_name = topic.replace('_', ' ').title()
+            print(f"   {i:2d}. {display_name}")
+
     print(f"\n✅ All vocabulary files are ready for use in your PWA!")
 
+
+def main():
+    """Generate summary statistics of the vocabulary files."""
+    parser = argparse.ArgumentParser(description='Summarize and audit the generated vocabulary files.')
+    parser.add_argument('--base-dir', default='data/word_lists', help='root of the generated tree')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    parser.add_argument('--jobs', type=int, default=8, help='threads used to read files')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='ignore and do not update the per-file stats cache')
+    parser.add_argument('--show', type=int, default=5, help='sample size for issues in the text report')
+    args = parser.parse_args()
+
+    report = build_report(args.base_dir, jobs=max(1, args.jobs), use_cache=args.cache)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_text(report, show=args.show)
+
+
 if __name__ == '__main__':
     main()
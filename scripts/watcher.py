@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Watch mode for build_vocabulary.py (--watch).
+After the initial build the process stays up with the generators' lexicons,
+example engines and the parsed sources warm in memory, and watches the
+source files, the generator and translation modules and data/examples/:
+inotify on Linux (through ctypes, no extra dependency), stat polling
+elsewhere or with --poll.
+
+Events are debounced: a burst of saves is handled once, after the files
+have been quiet for --debounce seconds. A changed source file is parsed
+again and compared section by section with the previous parse, and only
+the topics whose words changed are rebuilt, in every language of the build,
+without bundles or indexes, so the edited topic files are on disk within
+milliseconds. Once no event has arrived for SETTLE seconds, the changed
+levels are built once more with bundles, indexes and the precache manifest,
+which then covers every edit made in between. A changed module (e.g. the
+translation tables) is reloaded and rebuilds every topic of the builds
+using it; only files whose bytes change are written. An error, such as a
+module saved half-edited, is reported and the watcher carries on; the
+builds it stopped are retried on the next save.
+"""
+
+import ctypes
+import ctypes.util
+import importlib
+import os
+import select
+import struct
+import sys
+import time
+import traceback
+from argparse import Namespace
+from pathlib import Path
+
+DEBOUNCE = 0.2
+SETTLE = 2.0
+POLL_INTERVAL = 0.5
+EXAMPLES_DIR = 'data/examples'
+
+# inotify(7)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_EVENT = struct.Struct('iIII')
+
+
+class PollingWatcher:
+    """Reports files whose mtime or size changed, checked every interval seconds."""
+
+    kind = 'polling'
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.state = {path: self._stat(path) for path in paths}
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout=None):
+        """Block until a file changes or timeout passes; returns the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, previous in self.state.items():
+                current = self._stat(path)
+                if current != previous:
+                    self.state[path] = current
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            time.sleep(max(0, delay))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Linux inotify on the directories of the watched files, so editors that
+    save by writing a new file and renaming it over the old one are seen too.
+    """
+
+    kind = 'inotify'
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.dirs = {}
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+        for directory in sorted({os.path.dirname(path) for path in self.paths}):
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {directory}')
+            self.dirs[wd] = directory
+
+    def wait(self, timeout=None):
+        """Block until a watched file changes or timeout passes; returns the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = set()
+            data = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = IN_EVENT.unpack_from(data, offset)
+                offset += IN_EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                path = os.path.join(self.dirs.get(wd, ''), name)
+                if path in self.paths:
+                    changed.add(path)
+            if changed:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_watcher(paths, poll=False):
+    """inotify where available, else (or with poll) a PollingWatcher."""
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}), polling instead")
+    return PollingWatcher(paths)
+
+
+def diff_sections(previous, current):
+    """
+    Topic keys whose words differ between two parses of a source file, or
+    None if topics were added, removed or reordered (rebuild the level).
+    """
+    if previous is None or list(previous) != list(current):
+        return None
+    return [topic for topic, words in current.items() if previous[topic] != words]
+
+
+class ParseCache:
+    """Each generator's parse of each source file, kept until the file changes."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def parser(self, generator):
+        def parse_file(path):
+            path = os.path.abspath(path)
+            stat = os.stat(path)
+            key = (generator.__name__, path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            cached = self.entries.get(key)
+            if cached is None or cached[0] != stamp:
+                cached = self.entries[key] = (stamp, generator.parse_file(path))
+            return cached[1]
+        return parse_file
+
+
+def _report_error(what, error):
+    detail = ''.join(traceback.format_exception_only(type(error), error)).rstrip()
+    print(f"❌ {what} failed:\n{detail}")
+
+
+def _module_path(name):
+    module = sys.modules.get(name) or importlib.import_module(name)
+    return os.path.abspath(module.__file__)
+
+
+class BuildWatcher:
+    """Maps watched files to the builds they feed and rebuilds what an edit affects."""
+
+    def __init__(self, config, names, build_args, run_build):
+        self.config = config
+        self.names = names
+        self.build_args = build_args
+        self.run_build = run_build
+        self.parses = ParseCache()
+        self.sources = {}
+        self.modules = {}
+        self.sections = {}
+        for name in names:
+            build = config['builds'][name]
+            only_levels = build_args[name].level
+            for level, source in build['levels'].items():
+                if not only_levels or level in only_levels:
+                    self.sources.setdefault(os.path.abspath(source), []).append((name, level))
+            for spec in (build['generator'], build.get('translations'), build.get('examples')):
+                if spec:
+                    module = spec.partition(':')[0]
+                    self.modules.setdefault(_module_path(module), (module, set()))[1].add(name)
+            if build.get('examples'):
+                for corpus in Path(EXAMPLES_DIR).glob('*.json'):
+                    self.modules.setdefault(os.path.abspath(corpus), (None, set()))[1].add(name)
+        for path, targets in self.sources.items():
+            if os.path.exists(path):
+                for name, _ in targets:
+                    self.sections[name, path] = self._parse(name, path)
+
+    def paths(self):
+        return sorted(set(self.sources) | set(self.modules))
+
+    def _levels(self, name):
+        return [(level, path) for path, targets in self.sources.items()
+                for build, level in targets if build == name]
+
+    def _modules(self, name):
+        """The modules a build imports: its generator, translation tables and example engine."""
+        build = self.config['builds'][name]
+        return {spec.partition(':')[0] for spec in (build['generator'], build.get('translations'),
+                                                    build.get('examples')) if spec}
+
+    def _generator(self, name):
+        return importlib.import_module(self.config['builds'][name]['generator'])
+
+    def _parse(self, name, path):
+        return self.parses.parser(self._generator(name))(path)
+
+    def affected(self, changed):
+        """
+        Return {build: {level: topic keys or None for all}} for changed paths,
+        reloading changed modules first. Builds using a module that fails to
+        reload are left out until it reloads.
+        """
+        work = {}
+        reload = []
+        for path in sorted(changed):
+            if path in self.modules:
+                module, names = self.modules[path]
+                reload += [module] if module else []
+                for name in sorted(names):
+                    # Its generator goes too, so cached lexicons and example engines are rebuilt
+                    reload.append(self.config['builds'][name]['generator'])
+                    for level, _ in self._levels(name):
+                        work.setdefault(name, {})[level] = None
+        failed = set()
+        for module in dict.fromkeys(reload):
+            print(f"♻️  Reloading {module}")
+            try:
+                importlib.reload(sys.modules[module])
+            except Exception as e:
+                _report_error(f"Reloading {module}", e)
+                failed.add(module)
+        if reload:
+            self.parses.entries.clear()
+
+        for path in changed:
+            if path not in self.sources or not os.path.exists(path):
+                continue
+            for name, level in self.sources[path]:
+                try:
+                    current = self._parse(name, path)
+                except Exception as e:
+                    _report_error(f"Parsing {os.path.relpath(path)}", e)
+                    continue
+                topics = diff_sections(self.sections.get((name, path)), current)
+                self.sections[name, path] = current
+                if topics == []:
+                    print(f"{os.path.relpath(path)}: no topic of {name} changed")
+                    continue
+                levels = work.setdefault(name, {})
+                if level in levels and levels[level] is None:
+                    continue
+                levels[level] = None if topics is None else sorted(set(levels.get(level) or ()) | set(topics))
+        for name in [name for name in work if self._modules(name) & failed]:
+            print(f"⏸️  {name} waits for {', '.join(sorted(self._modules(name) & failed))} to load")
+            self._forget(name)
+            del work[name]
+        return work
+
+    def _forget(self, name):
+        """Drop a build's parsed sections, so its next change rebuilds whole levels."""
+        for key in [key for key in self.sections if key[0] == name]:
+            del self.sections[key]
+
+    def _args(self, name, **overrides):
+        args = Namespace(**vars(self.build_args[name]))
+        for key, value in overrides.items():
+            setattr(args, key, value)
+        return args
+
+    def rebuild_topics(self, work):
+        """Rebuild the affected topic files only; returns {build: levels} still owed a full pass."""
+        pending = {}
+        for name, levels in work.items():
+            generator = self._generator(name)
+            for level, topics in levels.items():
+                start = time.perf_counter()
+                _reset_stats(generator)
+                # Bundles and indexes wait for the settle pass. A --provider stays on:
+                # its cached translations are part of the topic files, and only new
+                # words are sent to it
+                args = self._args(name, level=[level], topic=topics, bundle=False,
+                                  alignment=False, search=False, sqlite=None, precache=False,
+                                  profile=None, trace=None)
+                try:
+                    changed = self.run_build(name, self.config, args, parse_file=self.parses.parser(generator))
+                except (Exception, SystemExit) as e:
+                    _report_error(f"Rebuilding {name}/{level}", e)
+                    self._forget(name)
+                    continue
+                what = 'every topic' if topics is None else ', '.join(topics)
+                print(f"⚡ {name}/{level}: {what} rebuilt in {(time.perf_counter() - start) * 1000:.0f} ms, "
+                      f"{len(changed)} file(s) changed")
+                pending.setdefault(name, set()).add(level)
+        return pending
+
+    def settle(self, pending):
+        """Bring the bundles, indexes and precache manifest of the changed levels up to date."""
+        for name, levels in pending.items():
+            start = time.perf_counter()
+            generator = self._generator(name)
+            _reset_stats(generator)
+            args = self._args(name, level=sorted(levels), topic=None, profile=None, trace=None)
+            try:
+                self.run_build(name, self.config, args, parse_file=self.parses.parser(generator))
+            except (Exception, SystemExit) as e:
+                _report_error(f"Refreshing the bundles and indexes of {name}", e)
+                continue
+            print(f"🧩 {name}: bundles and indexes refreshed in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def _reset_stats(generator):
+    for provider in getattr(generator, 'STATS_PROVIDERS', ()):
+        provider().reset_stats()
+
+
+def watch(config, names, build_args, run_build, debounce=DEBOUNCE, settle=SETTLE, poll=False):
+    """
+    Watch the inputs of the named builds until interrupted. build_args maps
+    each build to its parsed options; run_build is build_vocabulary.run_build.
+    """
+    builds = BuildWatcher(config, names, build_args, run_build)
+    watcher = open_watcher(builds.paths(), poll)
+    print(f"👀 Watching {len(builds.paths())} file(s) ({watcher.kind}); press Ctrl+C to stop")
+    pending = {}
+    try:
+        while True:
+            changed = watcher.wait(settle if pending else None)
+            if not changed:
+                builds.settle(pending)
+                pending = {}
+                continue
+            # Debounce: coalesce the burst until the files are quiet
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            for name, levels in builds.rebuild_topics(builds.affected(changed)).items():
+                pending.setdefault(name, set()).update(levels)
+    except KeyboardInterrupt:
+        if pending:
+            builds.settle(pending)
+        print("Stopped watching.")
+    finally:
+        watcher.close()
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+Shared build driver for the word-list generators.
+Parses each level once, builds every (language, topic) file through the
+generator's own build_topic function and only rewrites files whose inputs
+changed since the last run, as recorded in the build manifest.
+"""
+
+import cProfile
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from alignment import ALIGNMENT_NAME, write_alignment
+from build_manifest import BuildManifest, content_hash, file_matches, write_if_changed
+from bundles import (
+    BUNDLE_MANIFEST, build_bundle, load_bundle, read_bundle_manifest, update_bundle_manifest, write_bundle
+)
+from compact_format import load_topic, serialize_compact
+from dedup import (DEDUP_REPORT, SHARE_VERSION, cross_topic_repeats, dedupe_topics, pack_entries,
+                   write_dedup_report)
+from delta_patches import PATCH_INDEX, write_patches
+from distractors import DEFAULT_COUNT, entry_distractors
+import instrumentation
+from instrumentation import count, get_recorder, stage
+from precache import PRECACHE_NAME, write_precache
+from search_index import SEARCH_DIR, SEARCH_MANIFEST, write_search_index
+from translation_provider import DEFAULT_CACHE, DEFAULT_CONCURRENCY, DEFAULT_RATE
+from vocab_db import write_vocabulary_db
+from vocab_parser import paginate, read_frequencies
+from vocab_store import VocabStore
+
+MANIFEST_NAME = '.build-manifest.json'
+PAGES_NAME = 'pages.json'
+PAGE_ORDERS = ('source', 'alpha', 'frequency')
+
+
+def serialize_json(data):
+    """Serialize generated data exactly like the original json.dump(..., indent=2)."""
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def add_build_arguments(parser):
+    """Register the command-line options shared by both generators."""
+    parser.add_argument('--force', action='store_true',
+                        help='rebuild every file, ignoring the build manifest')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='list the files that would change without writing anything')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='build topics in N worker processes (0 = one per CPU)')
+    parser.add_argument('--no-bundle', dest='bundle', action='store_false',
+                        help='skip the single-file bundle per language/level')
+    parser.add_argument('--distractors', type=int, default=DEFAULT_COUNT, metavar='K',
+                        help=f'multiple-choice distractors per entry in bundles (default: {DEFAULT_COUNT}, 0 = none)')
+    parser.add_argument('--no-dedup', dest='dedup', action='store_false',
+                        help='keep case/accent variants within topics and repeated entries in bundles')
+    parser.add_argument('--no-alignment', dest='alignment', action='store_false',
+                        help='skip the cross-language alignment index')
+    parser.add_argument('--no-search', dest='search', action='store_false',
+                        help='skip the sharded search index')
+    parser.add_argument('--sqlite', metavar='FILE',
+                        help='also export every language/level to a SQLite database (see vocab_db.py)')
+    parser.add_argument('--no-patches', dest='patches', action='store_false',
+                        help='do not store delta patches for rewritten topic files')
+    parser.add_argument('--no-precache', dest='precache', action='store_false',
+                        help='do not regenerate the service-worker precache manifest')
+    parser.add_argument('--compact', action='store_true',
+                        help='write topic files in the compact columnar format')
+    parser.add_argument('--page-size', type=int, default=0, metavar='N',
+                        help='split topics longer than N words into pages (default: 0 = no paging)')
+    parser.add_argument('--page-order', choices=PAGE_ORDERS, default='source',
+                        help='word order within paged topics (default: source)')
+    parser.add_argument('--frequencies', metavar='FILE',
+                        help="'word count' list used by --page-order frequency")
+    parser.add_argument('--profile', nargs='?', const='build.prof', metavar='FILE',
+                        help='time each build stage and write cProfile stats of the main process '
+                             'to FILE (default: build.prof; read with python -m pstats)')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='time each build stage and write Chrome-trace spans per topic to FILE')
+    parser.add_argument('--lexicon', metavar='FILE',
+                        help='translate with a compiled binary lexicon (see binary_lexicon.py)')
+    parser.add_argument('--provider', metavar='SPEC',
+                        help="translate lexicon misses with a provider, e.g. 'stub:en=es-en.tsv' "
+                             "or 'module:Class' (see translation_provider.py)")
+    parser.add_argument('--translation-cache', default=DEFAULT_CACHE, metavar='FILE',
+                        help=f'SQLite cache of provider translations (default: {DEFAULT_CACHE})')
+    parser.add_argument('--provider-concurrency', type=int, default=DEFAULT_CONCURRENCY, metavar='N',
+                        help=f'provider batches in flight at once (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--provider-rate', type=float, default=DEFAULT_RATE, metavar='R',
+                        help=f'provider requests per second (default: {DEFAULT_RATE:g}, 0 = unlimited)')
+
+
+# Per-process state for pool workers, installed once by _init_worker so the
+# parsed topics (the VocabStore) are shipped to each worker once instead of
+# with every unit.
+_WORKER = {}
+
+
+def _init_worker(build_topic, store, stats_providers, serialize):
+    _WORKER['build_topic'] = build_topic
+    _WORKER['store'] = store
+    _WORKER['stats_providers'] = stats_providers
+    _WORKER['serialize'] = serialize
+
+
+def _init_pool_worker(build_topic, store, stats_providers, serialize):
+    _init_worker(build_topic, store, stats_providers, serialize)
+    # A forked worker starts with a copy of the parent's counters; only its own are sent back
+    for provider in stats_providers:
+        provider().reset_stats()
+
+
+def _build_unit(unit):
+    """Build and serialize one (level, lang, topic) unit."""
+    level, lang, topic_key = unit
+    words = _WORKER['store'].words(level, topic_key)
+    with stage('topic', level=level, lang=lang['code'], topic=topic_key):
+        topic_data = _WORKER['build_topic'](lang, level, topic_key, words)
+        with stage('serialize'):
+            payload = _WORKER['serialize'](topic_data)
+    count('entries', len(topic_data['words']))
+    count('bytes_serialized', len(payload))
+    return payload, len(topic_data['words'])
+
+
+def _build_unit_in_worker(unit):
+    """Like _build_unit, but also hand back the worker's counters for this unit."""
+    payload, items = _build_unit(unit)
+    stats = []
+    for provider in _WORKER['stats_providers']:
+        source = provider()
+        stats.append(source.stats())
+        source.reset_stats()
+    return payload, items, stats
+
+
+def _build_units(units, store, build_topic, jobs, stats_providers, serialize):
+    """Yield (payload, item_count) for each unit, in the order of units."""
+    if jobs == 1 or len(units) < 2:
+        _init_worker(build_topic, store, stats_providers, serialize)
+        yield from map(_build_unit, units)
+        return
+
+    workers = min(jobs, len(units))
+    chunksize = max(1, len(units) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker,
+                             initargs=(build_topic, store, stats_providers, serialize)) as pool:
+        # map() returns results in submission order, which keeps the output
+        # and the log deterministic regardless of which worker finishes first
+        for payload, items, stats in pool.map(_build_unit_in_worker, units, chunksize=chunksize):
+            for provider, provider_stats in zip(stats_providers, stats):
+                provider().merge_stats(provider_stats)
+            yield payload, items
+
+
+def generate(levels, src_txt, langs, parse_file, build_topic, fingerprint,
+             base_dir='data/word_lists', force=False, dry_run=False, jobs=1,
+             stats_providers=(), bundle=True, compact=False, alignment=True,
+             search=True, precache=True, distractors=DEFAULT_COUNT, page_size=0,
+             page_order='source', frequencies=None, dedup=True, sqlite=None,
+             patches=True, profile=None, trace=None, only_levels=None, only_langs=None,
+             only_topics=None, build_name=None, app_root='.'):
+    """
+    Generate index.json and one <topic>.json per level and language.
+    parse_file(path) returns {topic_key: [words]} for a source file;
+    build_topic(lang, level, topic_key, words) returns the topic's JSON data;
+    fingerprint identifies the translation/example tables it depends on.
+    The manifest records the files under build_name. Files this build wrote
+    before that the source no longer yields (removed or renamed topics) are
+    deleted; files other builds wrote, or that no build recorded, are kept.
+    With jobs > 1 the stale topics are built in a process pool; the output is
+    byte-identical to a serial run. The parsed words, and the topics loaded
+    for bundles and indexes, are held in a VocabStore (see vocab_store). Each of stats_providers returns an object
+    (e.g. the lexicon) whose counters are merged back from the workers.
+    With dedup, words that differ only by case or accents collapse within
+    each topic, bundles store entries repeated across topics once, and
+    dedup-report.json lists what was merged.
+    With bundle, each language/level is also packed into one bundle file
+    that lists, per entry, the rows of its best `distractors` wrong answers.
+    With compact, topic files use the columnar format from compact_format.
+    With alignment, alignment.json links every source word across languages.
+    With search, a sharded prefix/trigram search index is written to search/.
+    With sqlite, every language/level is exported to that SQLite database.
+    With patches, every rewritten JSON topic file also gets a delta patch
+    from its previous version (see delta_patches); compact files do not.
+    With precache, precache-manifest.js (for sw.js) is refreshed in app_root,
+    the directory served as the web root; it is skipped if base_dir lies
+    outside app_root, since the app could not fetch the files listed.
+    With page_size, topics longer than page_size are split into pages in
+    page_order (frequencies is a word-count file for 'frequency'), and each
+    language/level gets a pages.json recording the page boundaries.
+    With profile or trace, every stage is timed (see instrumentation) and the
+    timings are printed; profile is a cProfile stats file for the main
+    process and trace a Chrome trace file with the spans of every process.
+    The timings cover this call only; instrumentation is off again afterwards.
+    only_levels, only_langs and only_topics restrict the build to a slice:
+    only those levels are parsed and only those topic files (and the pages
+    of those topics) are built. Bundles are refreshed for the languages and
+    levels in the slice; the alignment, search and SQLite indexes still
+    cover every language/level, reading the ones outside the slice from disk.
+    Returns the list of changed paths, relative to base_dir.
+    """
+    if profile or trace:
+        instrumentation.enable(trace=bool(trace))
+        stats_providers = (*stats_providers, get_recorder)
+    profiler = cProfile.Profile() if profile else None
+    if profiler:
+        profiler.enable()
+
+    base_dir = Path(base_dir)
+    manifest = BuildManifest(base_dir / MANIFEST_NAME)
+    jobs = jobs or os.cpu_count() or 1
+    serialize = serialize_compact if compact else serialize_json
+    output_format = 'columnar' if compact else 'json'
+    changed = []
+    # Payloads only stay in memory in a dry run; otherwise they are read back from disk
+    built = {}
+    fresh = 0
+
+    def emit(rel_path, input_hash, payload, label):
+        path = base_dir / rel_path
+        if dry_run:
+            if not file_matches(path, payload):
+                changed.append(rel_path)
+                print(f"Would write {label}")
+            return
+        with stage('write'):
+            written = write_if_changed(path, payload)
+        if written:
+            changed.append(rel_path)
+            count('files_written')
+            count('bytes_written', len(payload))
+            print(f"Written {label}")
+        manifest.record(rel_path, input_hash, payload, build_name)
+
+    # Parse every level once up front into the store; it is read-only from here on
+    store = VocabStore()
+    parsed = []
+    pages = {}
+    dedup_report = {'topic_variants': {}, 'cross_topic': {}, 'bundles': {}}
+    frequency_table = read_frequencies(frequencies) if frequencies else None
+    for level in levels:
+        if only_levels and level not in only_levels:
+            continue
+        src_file = Path(src_txt[level])
+
+        if not src_file.exists():
+            print(f"Warning: Source file {src_file} not found, skipping {level}")
+            continue
+
+        with stage('parse', level=level):
+            topics_map = parse_file(src_file)
+        count('words', sum(map(len, topics_map.values())))
+        print(f"Found {len(topics_map)} topics for {level}")
+        if dedup:
+            with stage('dedup', level=level):
+                topics_map, merges = dedupe_topics(topics_map)
+            dedup_report['topic_variants'][level] = merges
+            dedup_report['cross_topic'][level] = cross_topic_repeats(topics_map)
+            if merges:
+                dropped = sum(len(record['merged']) for record in merges)
+                print(f"Merged {dropped} case/accent variant(s) within topics")
+        if page_size:
+            topics_map, pages[level] = paginate(topics_map, page_size, page_order, frequency_table)
+            if pages[level]:
+                print(f"Split {len(pages[level])} topic(s) into {page_size}-word pages")
+        store.add_level(level, topics_map)
+        parsed.append(level)
+
+    slice_langs = [lang for lang in langs if not only_langs or lang['code'] in only_langs]
+    selected = {level: _select_topics(store.topic_keys(level), pages.get(level, {}), only_topics)
+                for level in parsed}
+    if only_topics and not any(selected.values()):
+        print(f"Warning: no topic matches {', '.join(only_topics)}")
+
+    units = []
+    pending = []
+    for level in parsed:
+        for lang in slice_langs:
+            lang_dir = f"{lang['code']}/{level}"
+
+            # index.json lists the available topics
+            topics = store.topic_keys(level)
+            emit(f'{lang_dir}/index.json', content_hash(topics), serialize_json(topics),
+                 f'{lang_dir}/index.json')
+            if pages.get(level):
+                page_index = {'page_size': page_size, 'order': page_order, 'topics': pages[level]}
+                emit(f'{lang_dir}/{PAGES_NAME}', content_hash(page_index), serialize_json(page_index),
+                     f'{lang_dir}/{PAGES_NAME}')
+
+            for topic_key in selected[level]:
+                words = store.words(level, topic_key)
+                rel_path = f'{lang_dir}/{topic_key}.json'
+                input_hash = content_hash(fingerprint, output_format, lang['code'], level, topic_key, words)
+                if not force and manifest.is_fresh(rel_path, input_hash, base_dir):
+                    fresh += 1
+                    continue
+                units.append((level, lang, topic_key))
+                pending.append((rel_path, input_hash))
+
+    if units:
+        print(f"Building {len(units)} topic file(s) with {min(jobs, len(units))} job(s)...")
+    results = _build_units(units, store, build_topic, jobs, stats_providers, serialize)
+    patch_changes = []
+    for done, ((rel_path, input_hash), (payload, items)) in enumerate(zip(pending, results), 1):
+        if dry_run:
+            built[rel_path] = payload
+        previous = None
+        if patches and not compact and not dry_run and (base_dir / rel_path).exists():
+            previous = (base_dir / rel_path).read_bytes()
+        emit(rel_path, input_hash, payload, f"{rel_path} ({items} items) [{done}/{len(units)}]")
+        if previous is not None and previous != payload:
+            patch_changes.append((rel_path, previous, payload))
+
+    # Files of topics that were removed or renamed in the source go, so they
+    # do not linger in the precache manifest, the bundles or the summaries
+    removed = []
+    for level in parsed:
+        keep = {'index.json', *(f'{topic_key}.json' for topic_key in store.topic_keys(level))}
+        if pages.get(level):
+            keep.add(PAGES_NAME)
+        for lang in slice_langs:
+            removed += _prune_outputs(base_dir, manifest, f"{lang['code']}/{level}", keep,
+                                      build_name, dry_run)
+    changed += removed
+
+    if patch_changes or (removed and not dry_run and (base_dir / PATCH_INDEX).exists()):
+        with stage('patches'):
+            written = write_patches(base_dir, patch_changes, removed)
+        changed += written
+        if patch_changes:
+            print(f"Stored {len(written) - (PATCH_INDEX in written)} delta patch(es)")
+
+    def report(rel_path, label):
+        changed.append(rel_path)
+        print(f"{'Would write' if dry_run else 'Written'} {label}")
+
+    # Bundles and the indexes need every topic of a language/level,
+    # including up-to-date topics that were not rebuilt and are read from disk.
+    # Bundles cover the slice; the indexes also take in the languages and
+    # levels outside it, as far as they have been built before. Each output is
+    # skipped while the topic files it was built from are unchanged.
+    sources = []
+    for level in levels:
+        for lang in langs:
+            in_slice = level in parsed and lang in slice_langs
+            if in_slice:
+                topic_keys = store.topic_keys(level)
+            elif alignment or search or sqlite:
+                topic_keys = _read_index(base_dir, lang['code'], level)
+            else:
+                continue
+            if topic_keys is not None:
+                source_hash = _sources_hash(manifest, lang['code'], level, topic_keys)
+                sources.append((lang['code'], level, topic_keys, in_slice, source_hash))
+    indexes_hash = content_hash([source[4] for source in sources])
+    if None in (source[4] for source in sources):
+        indexes_hash = None
+
+    def is_fresh(rel_path, input_hash):
+        return (not force and not dry_run and input_hash is not None
+                and manifest.is_fresh(rel_path, input_hash, base_dir))
+
+    bundle_records = read_bundle_manifest(base_dir) if bundle else {}
+    stale_bundles = set()
+    for language, level, _, in_slice, source_hash in sources:
+        record = bundle_records.get(f'{language}/{level}')
+        bundle_hash = content_hash(source_hash, dedup, SHARE_VERSION, distractors) if source_hash else None
+        if bundle and in_slice and not (record and is_fresh(record['file'], bundle_hash)):
+            stale_bundles.add((language, level))
+    alignment = alignment and not is_fresh(ALIGNMENT_NAME, indexes_hash)
+    search = search and not is_fresh(f'{SEARCH_DIR}/{SEARCH_MANIFEST}', indexes_hash)
+
+    topic_sets = []
+    if stale_bundles or alignment or search or sqlite:
+        with stage('load_topics'):
+            for language, level, topic_keys, in_slice, source_hash in sources:
+                if not (alignment or search or sqlite) and (language, level) not in stale_bundles:
+                    continue
+                topics = _load_topics(base_dir, language, level, topic_keys, built, warn=in_slice)
+                if topics is not None:
+                    # Kept as columns of the store; the entry dicts of the files are dropped
+                    store.add_view(level, language, topics)
+                    topic_sets.append((language, level, store.topics(level, language), source_hash))
+
+    if bundle:
+        records = {}
+        for language, level, topics, source_hash in topic_sets:
+            if (language, level) not in stale_bundles:
+                continue
+            packed = pack_entries(topics, share=dedup)
+            entries, homes, topic_rows = packed
+            listed = sum(len(rows) for _, _, rows in topic_rows)
+            if dedup:
+                dedup_report['bundles'][f'{language}/{level}'] = {'listed': listed, 'stored': len(entries)}
+            choices = None
+            if distractors:
+                # Scoring a level takes a while; reuse the rows while the entries are unchanged
+                previous = load_bundle(base_dir, language, level) or {}
+                cached = {'key': previous.get('distractors_key'), 'rows': previous.get('distractors')}
+                with stage('distractors', lang=language, level=level):
+                    choices = entry_distractors(entries, homes, k=distractors, previous=cached)
+            with stage('bundle', lang=language, level=level):
+                payload = build_bundle(language, level, packed, choices)
+                record, bundle_changed = write_bundle(base_dir, language, level, payload, dry_run)
+            records[f'{language}/{level}'] = record
+            if bundle_changed:
+                report(record['file'], f"{record['file']} ({record['entries']} items)")
+            if not dry_run:
+                replaced = bundle_records.get(f'{language}/{level}')
+                if replaced and replaced['file'] != record['file']:
+                    manifest.forget(replaced['file'])
+                if source_hash:
+                    manifest.record(record['file'], content_hash(source_hash, dedup, SHARE_VERSION, distractors),
+                                    payload)
+        if update_bundle_manifest(base_dir, records, dry_run):
+            changed.append(BUNDLE_MANIFEST)
+
+    if dedup and parsed and write_dedup_report(base_dir, dedup_report, dry_run):
+        report(DEDUP_REPORT, DEDUP_REPORT)
+
+    index_sets = [topic_set[:3] for topic_set in topic_sets]
+    if alignment:
+        with stage('alignment'):
+            alignment_changed = write_alignment(base_dir, index_sets, dry_run)
+        if alignment_changed:
+            report(ALIGNMENT_NAME, ALIGNMENT_NAME)
+        _record_output(manifest, base_dir, ALIGNMENT_NAME, indexes_hash, dry_run)
+
+    if search:
+        with stage('search_index'):
+            search_changed = write_search_index(base_dir, index_sets, dry_run=dry_run)
+        if search_changed:
+            report(f'{SEARCH_DIR}/{SEARCH_MANIFEST}', f'{SEARCH_DIR}/ (search index)')
+        _record_output(manifest, base_dir, f'{SEARCH_DIR}/{SEARCH_MANIFEST}', indexes_hash, dry_run)
+
+    if sqlite:
+        with stage('sqlite'):
+            sqlite_changed = write_vocabulary_db(sqlite, index_sets, dry_run, input_hash=indexes_hash)
+        if sqlite_changed:
+            changed.append(sqlite)
+            print(f"{'Would write' if dry_run else 'Written'} {sqlite} (SQLite export)")
+
+    if precache and not base_dir.resolve().is_relative_to(Path(app_root).resolve()):
+        print(f"Skipping {PRECACHE_NAME}: {base_dir} is outside the web root {app_root}")
+    elif precache:
+        # In a dry run this reflects the files currently on disk
+        with stage('precache'):
+            manifest_data, precache_changed = write_precache(app_root, base_dir, dry_run)
+        if precache_changed:
+            report(PRECACHE_NAME, f"{PRECACHE_NAME} (version {manifest_data['version']})")
+
+    if dry_run:
+        print(f"Dry run: {len(changed)} file(s) would change, {fresh} topic(s) up to date.")
+    else:
+        manifest.save()
+        print(f"{len(changed)} file(s) written, {fresh} topic(s) up to date.")
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(profile)
+    if instrumentation.enabled():
+        _report_instrumentation(stats_providers, profile, trace)
+    if profile or trace:
+        instrumentation.disable()
+    return changed
+
+
+def _select_topics(topic_keys, pages, only_topics):
+    """The topic_keys in only_topics (all without it); a paged topic selects its pages."""
+    if not only_topics:
+        return list(topic_keys)
+    page_keys = {page['key'] for topic in only_topics for page in pages.get(topic, ())}
+    return [key for key in topic_keys if key in only_topics or key in page_keys]
+
+
+def _read_index(base_dir, language, level):
+    """The topic keys in a language/level's index.json, or None if it has not been built."""
+    try:
+        return json.loads((base_dir / language / level / 'index.json').read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def _sources_hash(manifest, language, level, topic_keys):
+    """
+    Hash of the recorded output hashes of a language/level's topic files,
+    identifying the input of its bundle and index entries; None if a file
+    is not in the manifest.
+    """
+    outputs = []
+    for topic_key in topic_keys:
+        record = manifest.files.get(f'{language}/{level}/{topic_key}.json')
+        if record is None:
+            return None
+        outputs.append(record['output'])
+    return content_hash(language, level, topic_keys, outputs)
+
+
+def _load_topics(base_dir, language, level, topic_keys, built, warn=True):
+    """
+    Read [(topic_key, data)] for a language/level, preferring the payloads
+    built in this run. Returns None if a file is missing, i.e. the
+    language/level has not been built completely yet.
+    """
+    topics = []
+    for topic_key in topic_keys:
+        rel_path = f'{language}/{level}/{topic_key}.json'
+        try:
+            payload = built.get(rel_path) or (base_dir / rel_path).read_bytes()
+        except FileNotFoundError:
+            if warn:
+                print(f"Warning: {rel_path} is missing; {language}/{level} is left out of "
+                      "the bundle and indexes until it is built")
+            return None
+        topics.append((topic_key, load_topic(payload)))
+    return topics
+
+
+def _prune_outputs(base_dir, manifest, lang_dir, keep, build_name, dry_run):
+    """
+    Remove the files in lang_dir (e.g. english/b1) that the manifest records
+    as written by build_name but that it no longer produces, and their
+    records; keep holds the names of the files it does produce. Old bundles
+    are deleted by write_bundle, so only their records are dropped here.
+    Returns the removed paths, relative to base_dir.
+    """
+    prefix = f'{lang_dir}/'
+    removed = []
+    for rel_path, record in sorted(manifest.files.items()):
+        name = rel_path[len(prefix):]
+        if not rel_path.startswith(prefix) or name in keep or '/' in name:
+            continue
+        if name.startswith('bundle.'):
+            if not dry_run and not (base_dir / rel_path).exists():
+                manifest.forget(rel_path)
+            continue
+        if record.get('build') != build_name:
+            continue
+        removed.append(rel_path)
+        print(f"{'Would remove' if dry_run else 'Removed'} {rel_path} (no longer built)")
+        if not dry_run:
+            (base_dir / rel_path).unlink(missing_ok=True)
+            manifest.forget(rel_path)
+    return removed
+
+
+def _record_output(manifest, base_dir, rel_path, input_hash, dry_run):
+    """Record an index file built from input_hash, so an unchanged input skips it next time."""
+    if input_hash and not dry_run:
+        manifest.record(rel_path, input_hash, (base_dir / rel_path).read_bytes())
+
+
+def _report_instrumentation(stats_providers, profile, trace):
+    """Print the stage timings and write the trace, with the providers' counters."""
+    recorder = get_recorder()
+    for provider in stats_providers:
+        source = provider()
+        if source is recorder:
+            continue
+        # e.g. Lexicon.en.misses, from {lang: {counter: value}}
+        for lang, counters in source.stats().items():
+            for name, value in counters.items():
+                recorder.counters[f'{type(source).__name__}.{lang}.{name}'] = value
+    stats = recorder.stats()
+    print("Build stages:")
+    print(instrumentation.format_stats(stats))
+    if profile:
+        print(f"cProfile stats written to {profile} (python -m pstats {profile})")
+    if trace:
+        instrumentation.write_trace(trace, stats)
+        print(f"Trace written to {trace} ({len(stats['spans'])} spans; open in chrome://tracing)")
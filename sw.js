@@ -1,48 +1,122 @@
 // Service Worker for Language Learning PWA
-const CACHE_NAME = 'language-learning-v4';
-const urlsToCache = [
-  './',
-  './index.html',
-  './css/styles.css',
-  './js/app.js',
-  './js/topical-vocabulary.js',
-  './js/translations.js',
-  './js/chatbot.js',
-  './manifest.json',
-  './icons/favicon-96x96.png',
-  './icons/web-app-manifest-192x192.png',
-  './icons/web-app-manifest-512x512.png',
-  './icons/apple-touch-icon.png',
-  './icons/favicon.ico',
-  './icons/favicon.svg',
-  // Cache vocabulary JSON files for offline topical vocabulary
-  './data/word_lists/english/b1/food.json',
-  './data/word_lists/english/b1/travel.json',
-  './data/word_lists/english/b1/work.json',
-  './data/word_lists/english/b2/environment.json',
-  './data/word_lists/english/b2/health.json',
-  './data/word_lists/english/b2/technology.json',
-  './data/word_lists/spanish/b1/food.json',
-  './data/word_lists/spanish/b1/travel.json',
-  './data/word_lists/spanish/b1/work.json',
-  './data/word_lists/spanish/b2/environment.json',
-  './data/word_lists/spanish/b2/health.json',
-  './data/word_lists/spanish/b2/technology.json',
-  './data/word_lists/russian/b1/food.json',
-  './data/word_lists/russian/b1/travel.json',
-  './data/word_lists/russian/b1/work.json',
-  './data/word_lists/russian/b2/environment.json',
-  './data/word_lists/russian/b2/health.json',
-  './data/word_lists/russian/b2/technology.json'
-];
-
-// Install event - cache resources
+
+// precache-manifest.js is generated by the word-list build (scripts/precache.py)
+// and lists the app shell plus the vocabulary bundles with their content hashes;
+// topic files are cached at runtime unless it was generated with --topics.
+try {
+  importScripts('./precache-manifest.js');
+} catch (error) {
+  console.warn('Precache manifest not available, caching the app shell only:', error);
+}
+
+const PRECACHE_MANIFEST = self.__PRECACHE_MANIFEST || {
+  version: 'dev',
+  entries: [
+    './',
+    './index.html',
+    './css/styles.css',
+    './js/app.js',
+    './js/topical-vocabulary.js',
+    './js/translations.js',
+    './js/chatbot.js',
+    './manifest.json'
+  ].map((url) => ({ url, hash: 'dev' }))
+};
+
+// Runtime cache, versioned by the aggregate hash of the manifest
+const CACHE_NAME = `language-learning-${PRECACHE_MANIFEST.version}`;
+// Precached entries are stored under url?__rev=<hash>, so an entry whose hash
+// did not change is kept across versions instead of being downloaded again
+const PRECACHE_NAME = 'language-learning-precache';
+
+const precacheKeys = new Map(
+  PRECACHE_MANIFEST.entries.map((entry) => {
+    const url = new URL(entry.url, self.location).href;
+    const key = new URL(entry.url, self.location);
+    key.searchParams.set('__rev', entry.hash);
+    return [url, key.href];
+  })
+);
+
+const precacheEntries = new Map(
+  PRECACHE_MANIFEST.entries.map((entry) => [new URL(entry.url, self.location).href, entry])
+);
+
+// Delta patches between builds (scripts/delta_patches.py). A changed topic
+// file is rebuilt from its cached revision by following the patch chain in
+// patches.json, as long as that downloads less than the file itself.
+const DATA_URL = new URL('./data/word_lists/', self.location).href;
+
+async function contentHash(text) {
+  // First 16 hex digits of the sha256, like precache-manifest.js
+  const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(text));
+  return Array.from(new Uint8Array(digest).slice(0, 8), (b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+function applyPatch(data, patch) {
+  const removed = new Set(patch.removed);
+  const words = data.words.filter((_, i) => !removed.has(i));
+  patch.added.forEach(([i, entry]) => words.splice(i, 0, entry));
+  patch.modified.forEach(([i, entry]) => { words[i] = entry; });
+  return { ...patch.document, words };
+}
+
+async function patchedResponse(cache, url, cached, patchIndex) {
+  const entry = precacheEntries.get(url);
+  const chain = cached && patchIndex && url.startsWith(DATA_URL) && patchIndex.files[url.slice(DATA_URL.length)];
+  if (!chain) return null;
+  let revision = cached.revision;
+  let data = await (await cache.match(cached.request)).json();
+  let bytes = 0;
+  while (revision !== entry.hash) {
+    const step = chain.find((patch) => patch.from === revision);
+    if (!step || (bytes += step.size) >= entry.size) return null;
+    const response = await fetch(new URL(step.file, DATA_URL), { cache: 'no-cache' });
+    if (!response.ok) return null;
+    data = applyPatch(data, await response.json());
+    revision = step.to;
+  }
+  // Same serialization as the generator; a mismatch falls back to a download
+  const text = JSON.stringify(data, null, 2);
+  if (await contentHash(text) !== entry.hash) return null;
+  return new Response(text, { headers: { 'Content-Type': 'application/json' } });
+}
+
+// Install event - download entries that are new or whose hash changed
 self.addEventListener('install', (event) => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then((cache) => {
+    caches.open(PRECACHE_NAME)
+      .then(async (cache) => {
         console.log('Opened cache');
-        return cache.addAll(urlsToCache);
+        // The revision already cached for each URL, for patching
+        const previous = new Map();
+        for (const request of await cache.keys()) {
+          const url = new URL(request.url);
+          const revision = url.searchParams.get('__rev');
+          url.search = '';
+          previous.set(url.href, { revision, request });
+        }
+        const patchIndex = await fetch(new URL('patches.json', DATA_URL), { cache: 'no-cache' })
+          .then((res) => (res.ok ? res.json() : null))
+          .catch(() => null);
+        let downloaded = 0;
+        let patched = 0;
+        await Promise.all(
+          Array.from(precacheKeys, async ([url, key]) => {
+            if (await cache.match(key)) return;
+            const rebuilt = await patchedResponse(cache, url, previous.get(url), patchIndex).catch(() => null);
+            if (rebuilt) {
+              await cache.put(key, rebuilt);
+              patched++;
+              return;
+            }
+            const response = await fetch(url, { cache: 'no-cache' });
+            if (!response.ok) throw new Error(`Failed to precache ${url}: ${response.status}`);
+            await cache.put(key, response);
+            downloaded++;
+          })
+        );
+        console.log(`Precached ${downloaded} changed and ${patched} patched of ${precacheKeys.size} entries`);
       })
       .catch((error) => {
         console.error('Failed to cache resources during install:', error);
@@ -50,24 +124,46 @@ self.addEventListener('install', (event) => {
   );
 });
 
-// Activate event - clean up old caches
+// Activate event - clean up old caches and precache revisions
 self.addEventListener('activate', (event) => {
+  const currentKeys = new Set(precacheKeys.values());
   event.waitUntil(
-    caches.keys().then((cacheNames) => {
-      return Promise.all(
-        cacheNames.map((cacheName) => {
-          if (cacheName !== CACHE_NAME) {
-            console.log('Deleting old cache:', cacheName);
-            return caches.delete(cacheName);
-          }
-        })
-      );
-    })
+    Promise.all([
+      caches.keys().then((cacheNames) => {
+        return Promise.all(
+          cacheNames.map((cacheName) => {
+            if (cacheName !== CACHE_NAME && cacheName !== PRECACHE_NAME) {
+              console.log('Deleting old cache:', cacheName);
+              return caches.delete(cacheName);
+            }
+          })
+        );
+      }),
+      caches.open(PRECACHE_NAME).then((cache) => {
+        return cache.keys().then((requests) => {
+          return Promise.all(
+            requests
+              .filter((request) => !currentKeys.has(request.url))
+              .map((request) => cache.delete(request))
+          );
+        });
+      })
+    ])
   );
 });
 
 // Fetch event - serve cached content when offline
 self.addEventListener('fetch', (event) => {
+  const precacheKey = precacheKeys.get(event.request.url);
+  if (precacheKey && event.request.method === 'GET') {
+    event.respondWith(
+      caches.open(PRECACHE_NAME)
+        .then((cache) => cache.match(precacheKey))
+        .then((response) => response || fetch(event.request))
+    );
+    return;
+  }
+
   event.respondWith(
     caches.match(event.request)
       .then((response) => {
@@ -96,7 +192,8 @@ self.addEventListener('fetch', (event) => {
       .catch(() => {
         // Return offline page for navigation requests
         if (event.request.destination === 'document') {
-          return caches.match('/index.html');
+          const indexKey = precacheKeys.get(new URL('./index.html', self.location).href);
+          return indexKey ? caches.match(indexKey) : caches.match('./index.html');
         }
       })
   );
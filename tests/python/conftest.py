@@ -0,0 +1,11 @@
+"""
+Shared setup for the Python tests: the build scripts in scripts/ import
+each other as top-level modules, so that directory goes on sys.path.
+Every test module relies on it instead of setting up the path itself.
+Run with: python -m pytest tests/python
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
@@ -0,0 +1,46 @@
+"""
+Tests for scripts/alignment.py, the cross-language alignment index.
+Run with: python -m pytest tests/python
+"""
+
+import json
+
+from alignment import ALIGNMENT_NAME, AlignmentIndex, build_alignment, write_alignment
+
+
+def topic_sets(*words):
+    english = [{'word': word, 'translation': word.upper()} for word in words]
+    german = [{'word': word, 'translation': word.title()} for word in words]
+    return [('english', 'b1', [('ocio', {'topic': 'Ocio', 'words': english})]),
+            ('german', 'b1', [('ocio', german)])]
+
+
+def test_ids_survive_rebuilds_and_are_not_reused():
+    first = build_alignment(topic_sets('cine', 'teatro'))
+    assert {record['word']: int(word_id) for word_id, record in first['words'].items()} == {'cine': 0, 'teatro': 1}
+    second = build_alignment(topic_sets('museo', 'teatro'), first)
+    assert {record['word']: int(word_id) for word_id, record in second['words'].items()} == {'teatro': 1, 'museo': 2}
+    third = build_alignment(topic_sets('cine'), second)
+    assert list(third['words']) == ['3']
+    assert third['next_id'] == 4
+
+
+def test_lookups_in_both_directions():
+    index = AlignmentIndex(build_alignment(topic_sets('cine', 'Teatro')))
+    assert index.lookup('  teatro ', ['german']) == [
+        {'id': 1, 'word': 'Teatro', 'targets': {'german': [{'translation': 'Teatro', 'file': 'german/b1/ocio.json',
+                                                            'offset': 1}]}}]
+    assert index.reverse_lookup('cine', 'english') == [{'id': 0, 'word': 'cine'}]
+    assert index.reverse_lookup('cine', 'russian') == []
+    assert index.lookup('museo') == []
+
+
+def test_write_keeps_ids_from_the_file_on_disk(tmp_path):
+    assert write_alignment(tmp_path, topic_sets('cine', 'teatro'))
+    assert not write_alignment(tmp_path, topic_sets('cine', 'teatro'))
+    assert write_alignment(tmp_path, topic_sets('teatro'), dry_run=True)
+    write_alignment(tmp_path, topic_sets('teatro'))
+    data = json.loads((tmp_path / ALIGNMENT_NAME).read_bytes())
+    assert data['words'] == {'1': {'word': 'teatro', 'targets': {'english': [[0, 0, 'TEATRO']],
+                                                                 'german': [[1, 0, 'Teatro']]}}}
+    assert AlignmentIndex.load(tmp_path / ALIGNMENT_NAME).ids_for('TEATRO') == [1]
@@ -0,0 +1,48 @@
+"""
+Tests for scripts/benchmark_pipeline.py: corpus scaling and baseline comparison.
+Run with: python -m pytest tests/python
+"""
+
+import pytest
+
+from benchmark_pipeline import RESULTS_VERSION, compare, make_corpus
+from vocab_parser import parse_file
+
+SOURCE = '## Ocio\ncine\nteatro\n## Trabajo\njefe'
+
+
+def results(**seconds):
+    return {'1x': {'stages': {stage: {'seconds': value} for stage, value in seconds.items()}}}
+
+
+def baseline(**seconds):
+    return {'version': RESULTS_VERSION, 'results': results(**seconds)}
+
+
+def test_corpus_copies_get_their_own_topics(tmp_path):
+    source = tmp_path / 'source.txt'
+    source.write_text(SOURCE, encoding='utf-8')
+    assert make_corpus(source, 3, tmp_path / 'corpus.txt') == 15
+    topics = parse_file(tmp_path / 'corpus.txt')
+    assert len(topics) == 6
+    assert sum(len(words) for words in topics.values()) == 9
+
+
+def test_compare_passes_inside_the_threshold():
+    assert compare(results(parse=0.11, topic=0.5), baseline(parse=0.1, topic=0.6), 0.2) == []
+
+
+def test_compare_reports_stages_beyond_the_threshold():
+    regressions = compare(results(parse=0.13, topic=0.5), baseline(parse=0.1, topic=0.5), 0.2)
+    assert regressions == ['1x parse: 100.0 ms -> 130.0 ms (+30%)']
+
+
+def test_compare_skips_what_the_baseline_did_not_measure():
+    current = {**results(parse=1.0, bundle=1.0), '10x': results(parse=1.0)['1x']}
+    assert compare(current, baseline(parse=1.0), 0.2) == []
+    assert compare(current, {'version': RESULTS_VERSION}, 0.2) == []
+
+
+def test_compare_rejects_other_result_versions():
+    with pytest.raises(ValueError):
+        compare(results(parse=0.1), {'version': RESULTS_VERSION - 1, 'results': {}}, 0.2)
@@ -0,0 +1,44 @@
+"""
+Tests for scripts/binary_lexicon.py, the memory-mapped translation lexicon.
+Run with: python -m pytest tests/python
+"""
+
+import os
+
+import pytest
+
+from binary_lexicon import LEXICON_ENV, BinaryLexicon, check_lexicon, use_binary_lexicon, write_lexicon
+from generate_enhanced_word_lists import get_comprehensive_translations
+from lexicon import Lexicon
+
+TABLES = {'en': {'alegría': 'joy', 'Tener la piel': 'to have skin', 'pulmón': 'lung', 'pulmon': 'lung'},
+          'ru': {'alegría': 'радость'}}
+
+
+def test_binary_lexicon_answers_like_lexicon(tmp_path):
+    write_lexicon(tmp_path / 'lexicon.bin', TABLES)
+    expected = Lexicon(TABLES)
+    words = ['alegría', 'alegria', 'ALEGRÍA', ' tener  la PIEL', 'pulmon', 'codo', '']
+    with BinaryLexicon(tmp_path / 'lexicon.bin') as lexicon:
+        assert lexicon.fingerprint() == expected.fingerprint()
+        for lang in ('en', 'ru', 'de'):
+            assert [lexicon.lookup(word, lang) for word in words] == [expected.lookup(word, lang) for word in words]
+        assert lexicon.translate_many(words, 'en') == expected.translate_many(words, 'en')
+
+
+def test_lexicon_of_other_tables_is_refused(tmp_path):
+    spec = 'generate_enhanced_word_lists:get_comprehensive_translations'
+    extended = {lang: {**table, 'hueso': 'bone'} for lang, table in get_comprehensive_translations().items()}
+    write_lexicon(tmp_path / 'own.bin', extended, get_comprehensive_translations())
+    check_lexicon(tmp_path / 'own.bin', spec)
+    write_lexicon(tmp_path / 'other.bin', TABLES)
+    with pytest.raises(ValueError, match='not compiled from'):
+        check_lexicon(tmp_path / 'other.bin', spec)
+
+
+def test_use_binary_lexicon_none_clears_it(tmp_path, monkeypatch):
+    monkeypatch.delenv(LEXICON_ENV, raising=False)
+    use_binary_lexicon(tmp_path / 'lexicon.bin')
+    assert os.environ[LEXICON_ENV] == str(tmp_path / 'lexicon.bin')
+    use_binary_lexicon(None)
+    assert LEXICON_ENV not in os.environ
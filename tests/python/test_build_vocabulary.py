@@ -0,0 +1,41 @@
+"""
+Tests for scripts/build_vocabulary.py, the config-driven build entry point.
+Run with: python -m pytest tests/python
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from build_vocabulary import build_langs, default_builds, load_config
+from wordlist_pipeline import _select_topics
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_shipped_config_declares_the_builds():
+    config = load_config(ROOT / 'scripts' / 'build_config.json')
+    assert default_builds(config) == ['topical', 'pages']
+    assert build_langs(config, config['builds']['pages']) == [{'code': 'english', 'tcode': 'en'}]
+    for build in config['builds'].values():
+        for source in build['levels'].values():
+            assert (ROOT / source).exists()
+
+
+def test_config_rejects_undeclared_languages(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps({
+        'version': 1, 'output': 'out', 'languages': {'spanish': 'es'},
+        'builds': {'x': {'generator': 'g', 'levels': {}, 'languages': ['klingon']}}
+    }), encoding='utf-8')
+    with pytest.raises(ValueError, match='klingon'):
+        load_config(path)
+
+
+def test_topic_filter_selects_pages_of_a_paged_topic():
+    topics_map = {'ocio': ['a'], 'ocio_extra': ['b'], 'trabajo_01': ['c'], 'trabajo_02': ['d']}
+    pages = {'trabajo': [{'key': 'trabajo_01'}, {'key': 'trabajo_02'}]}
+    assert _select_topics(topics_map, pages, None) == list(topics_map)
+    assert _select_topics(topics_map, pages, ['ocio']) == ['ocio']
+    assert _select_topics(topics_map, pages, ['trabajo']) == ['trabajo_01', 'trabajo_02']
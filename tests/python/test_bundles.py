@@ -0,0 +1,52 @@
+"""
+Tests for scripts/bundles.py, the one-request vocabulary bundles.
+Run with: python -m pytest tests/python
+"""
+
+import gzip
+import json
+
+from bundles import (BUNDLE_MANIFEST, build_bundle, load_bundle, read_bundle, read_bundle_manifest,
+                     update_bundle_manifest, write_bundle)
+from dedup import pack_entries
+
+TOPICS = [
+    ('ocio', {'topic': 'Ocio', 'words': [{'word': 'cine', 'translation': 'cinema'},
+                                         {'word': 'teatro', 'translation': 'theatre', 'example': 'Voy al teatro.'}]}),
+    ('arte', {'topic': 'Arte', 'words': [{'word': 'Teatro', 'translation': 'theatre', 'example': 'Voy al teatro.'},
+                                         {'word': 'museo', 'translation': 'museum'}]})
+]
+
+
+def test_bundle_stores_shared_entries_once():
+    bundle = json.loads(build_bundle('english', 'b1', pack_entries(TOPICS)))
+    assert bundle['fields'] == ['word', 'translation', 'example']
+    assert len(bundle['entries']) == 3
+    assert bundle['index'] == [{'key': 'ocio', 'topic': 'Ocio', 'rows': [0, 1]},
+                               {'key': 'arte', 'topic': 'Arte', 'rows': [1, 2]}]
+    assert bundle['entries'][2] == ['museo', 'museum', None]
+
+
+def test_written_bundle_reads_back_and_replaces_older_ones(tmp_path):
+    first, _ = write_bundle(tmp_path, 'english', 'b1', build_bundle('english', 'b1', pack_entries(TOPICS[:1])))
+    payload = build_bundle('english', 'b1', pack_entries(TOPICS, share=False))
+    record, changed = write_bundle(tmp_path, 'english', 'b1', payload)
+    assert changed and record['file'] != first['file']
+    path = tmp_path / record['file']
+    suffixes = {'gzip': '.gz', 'br': '.br'}
+    assert {p.name for p in path.parent.iterdir()} == {
+        path.name, *(path.name + suffixes[encoding] for encoding in record['encodings'])}
+    assert gzip.decompress(path.with_name(path.name + '.gz').read_bytes()) == payload
+    assert record['topics'] == 2 and record['entries'] == 4
+    assert read_bundle(path) == dict(TOPICS)
+    assert write_bundle(tmp_path, 'english', 'b1', payload) == (record, False)
+
+
+def test_bundle_manifest_points_at_current_bundle(tmp_path):
+    assert read_bundle_manifest(tmp_path) == {}
+    assert load_bundle(tmp_path, 'english', 'b1') is None
+    record, _ = write_bundle(tmp_path, 'english', 'b1', build_bundle('english', 'b1', pack_entries(TOPICS)))
+    assert update_bundle_manifest(tmp_path, {'english/b1': record})
+    assert not update_bundle_manifest(tmp_path, {'english/b1': record})
+    assert json.loads((tmp_path / BUNDLE_MANIFEST).read_bytes())['bundles'] == {'english/b1': record}
+    assert load_bundle(tmp_path, 'english', 'b1')['index'][1]['key'] == 'arte'
@@ -0,0 +1,60 @@
+"""
+Tests for scripts/compact_format.py, the columnar topic format.
+Run with: python -m pytest tests/python
+"""
+
+from pathlib import Path
+
+import pytest
+
+from compact_format import decode_topic, encode_topic, load_topic, serialize_compact, validate
+
+ROOT = Path(__file__).resolve().parents[2]
+TOPIC = {'topic': 'Ocio', 'words': [
+    {'word': 'cine', 'translation': 'cinema', 'example': 'The word "cinema" is useful.'},
+    {'word': 'teatro', 'translation': 'theatre', 'example': 'The word "theatre" is useful.',
+     'answers': ['theatre', 'theater']},
+    {'word': 'fiesta', 'translation': 'party', 'example': 'A party {at} home, a party.'},
+    {'word': 'museo', 'translation': 'museum'}
+]}
+
+
+def test_round_trip_keeps_every_entry():
+    encoded = encode_topic(TOPIC)
+    assert decode_topic(encoded) == TOPIC
+    assert load_topic(serialize_compact(TOPIC)) == TOPIC
+    assert validate(encoded) == []
+
+
+def test_examples_share_one_template():
+    encoded = encode_topic(TOPIC)
+    examples = encoded['columns'][encoded['fields'].index('example')]
+    assert examples[0] == examples[1] < 0
+    assert encoded['strings'][-examples[0] - 1] == 'The word "{translation}" is useful.'
+    # Braces or a repeated translation are stored verbatim
+    assert examples[2] >= 0
+    assert examples[3] is None
+
+
+def test_bare_entry_lists_and_regular_files_load():
+    assert decode_topic(encode_topic(TOPIC['words'])) == TOPIC['words']
+    assert load_topic(b'{"topic": "Ocio", "words": []}') == {'topic': 'Ocio', 'words': []}
+
+
+def test_validate_reports_broken_files():
+    encoded = encode_topic(TOPIC)
+    encoded['columns'][0].append(0)
+    assert "column 'word' has 5 values, expected 4" in validate(encoded)
+    encoded = encode_topic(TOPIC)
+    encoded['strings'].append(encoded['strings'][0])
+    assert validate(encoded) == ['string table contains duplicates']
+
+
+TOPIC_FILES = sorted(path for path in (ROOT / 'data' / 'word_lists').glob('*/*/*.json')
+                     if not path.name.startswith(('.', 'index.', 'pages.', 'bundle.')))
+
+
+@pytest.mark.parametrize('path', TOPIC_FILES, ids=lambda path: path.relative_to(ROOT).as_posix())
+def test_committed_topic_files_round_trip(path):
+    topic = load_topic(path.read_bytes())
+    assert decode_topic(encode_topic(topic)) == topic
@@ -0,0 +1,45 @@
+"""
+Tests for scripts/dedup.py, build-time deduplication.
+Run with: python -m pytest tests/python
+"""
+
+import json
+
+from dedup import DEDUP_REPORT, cross_topic_repeats, dedupe_topics, pack_entries, write_dedup_report
+
+
+def test_variants_collapse_into_the_first_spelling():
+    topics, merges = dedupe_topics({'ocio': ['Cine', 'cine', ' CINÉ', 'teatro'], 'arte': ['museo']})
+    assert topics == {'ocio': ['Cine', 'teatro'], 'arte': ['museo']}
+    assert merges == [{'topic': 'ocio', 'kept': 'Cine', 'merged': ['cine', ' CINÉ']}]
+
+
+def test_cross_topic_repeats_name_the_first_topic():
+    repeats = cross_topic_repeats({'ocio': ['cine', 'teatro'], 'arte': ['Teatro', 'museo'], 'ciudad': ['teatro']})
+    assert repeats == [{'word': 'teatro', 'home': 'ocio', 'topics': ['ocio', 'arte', 'ciudad']}]
+
+
+def test_pack_entries_shares_rows_only_for_the_same_translation_and_example():
+    topics = [('ocio', {'topic': 'Ocio', 'words': [{'word': 'cine', 'translation': 'cinema'}]}),
+              ('arte', [{'word': 'Cine', 'translation': 'cinema'}, {'word': 'cine', 'translation': 'film'}])]
+    entries, homes, index = pack_entries(topics)
+    assert [entry['translation'] for entry in entries] == ['cinema', 'film']
+    assert homes == ['ocio', 'arte']
+    assert index == [('ocio', 'Ocio', [0]), ('arte', 'Arte', [0, 1])]
+    assert len(pack_entries(topics, share=False)[0]) == 3
+
+
+def test_topic_specific_examples_are_not_shared():
+    topics = [('ocio', [{'word': 'cine', 'translation': 'cinema', 'example': 'cine in the context of ocio'}]),
+              ('arte', [{'word': 'cine', 'translation': 'cinema', 'example': 'cine in the context of arte'}])]
+    entries, _, index = pack_entries(topics)
+    assert [entry['example'] for entry in entries] == ['cine in the context of ocio', 'cine in the context of arte']
+    assert [rows for _, _, rows in index] == [[0], [1]]
+
+
+def test_report_keeps_sections_of_other_levels(tmp_path):
+    assert write_dedup_report(tmp_path, {'cross_topic': {'b1': []}})
+    assert write_dedup_report(tmp_path, {'cross_topic': {'b2': []}, 'topic_variants': {'b2': []}})
+    assert not write_dedup_report(tmp_path, {'cross_topic': {'b2': []}})
+    report = json.loads((tmp_path / DEDUP_REPORT).read_bytes())
+    assert report == {'cross_topic': {'b1': [], 'b2': []}, 'topic_variants': {'b2': []}}
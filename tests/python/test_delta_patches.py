@@ -0,0 +1,42 @@
+"""
+Tests for scripts/delta_patches.py, the patches between builds of a topic file.
+Run with: python -m pytest tests/python
+"""
+
+import json
+from pathlib import Path
+
+from delta_patches import PATCH_HISTORY, apply_patch, make_patch, revision, serialize, write_patches
+
+
+def topic(name, *words):
+    return {'topic': name, 'words': [{'word': w, 'translation': t} for w, t in words]}
+
+
+OLD = serialize(topic('Ocio', ('descanso', 'rest'), ('cine', 'cinema'), ('teatro', 'theatre')))
+NEW = serialize(topic('Tiempo libre', ('descanso', 'break'), ('teatro', 'theatre'), ('museo', 'museum')))
+
+
+def test_patch_reproduces_new_file():
+    patch = make_patch(OLD, NEW)
+    assert (patch['from'], patch['to']) == (revision(OLD), revision(NEW))
+    assert patch['removed'] == [1]
+    assert patch['added'] == [[2, {'word': 'museo', 'translation': 'museum'}]]
+    assert patch['modified'] == [[0, {'word': 'descanso', 'translation': 'break'}]]
+    assert serialize(apply_patch(json.loads(OLD), patch)) == NEW
+
+
+def test_make_patch_rejects_non_topic_files():
+    assert make_patch(OLD, b'["index"]') is None
+    assert make_patch(b'{"count": 1, "fields": []}', b'not json') is None
+
+
+def test_write_patches_keeps_recent_history(tmp_path):
+    versions = [serialize(topic('Ocio', ('cine', f'cinema {i}'))) for i in range(PATCH_HISTORY + 2)]
+    for old, new in zip(versions, versions[1:]):
+        write_patches(tmp_path, [('english/b1/ocio.json', old, new)])
+    index = json.loads((tmp_path / 'patches.json').read_text(encoding='utf-8'))
+    history = index['files']['english/b1/ocio.json']
+    assert [step['to'] for step in history] == [revision(v) for v in versions[-PATCH_HISTORY:]]
+    assert sorted(p.name for p in (tmp_path / 'patches').iterdir()) == sorted(
+        Path(step['file']).name for step in history)
@@ -0,0 +1,56 @@
+"""
+Tests for scripts/distractors.py, the multiple-choice distractors in bundles.
+Run with: python -m pytest tests/python
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from distractors import compute_distractors, edit_distance
+
+ROOT = Path(__file__).resolve().parents[2]
+BUILD = '''
+import sys
+from vocab_parser import parse_file
+from wordlist_pipeline import generate
+build_topic = lambda lang, level, key, words: {'topic': key, 'words': [{'word': w} for w in words]}
+generate(['b1'], {'b1': 'data/word_lists/spanish_b1_words.txt'}, [{'code': 'spanish', 'tcode': 'es'}],
+         parse_file, build_topic, 'v1', base_dir=sys.argv[1], precache=False, alignment=False, search=False)
+'''
+
+
+def test_distractors_are_similar_answers_best_first():
+    texts = ['the cat', 'the car', 'the hat', 'a dog', 'the cat']
+    picks = compute_distractors(texts, ['a', 'a', 'b', 'b', 'b'], k=2)
+    assert picks[0] == [1, 2]
+    assert 4 not in picks[0] and 0 not in picks[4]
+    assert picks[3] and all(len(row) <= 2 for row in picks)
+
+
+def test_pruned_scoring_keeps_the_best_candidates():
+    # With k above the shortlist every candidate is scored; with k=3 most are skipped
+    words = (ROOT / 'data' / 'word_lists' / 'b2_words.txt').read_text(encoding='utf-8').split()[:600]
+    topics = [n % 7 for n in range(len(words))]
+    full = compute_distractors(words, topics, k=100)
+    assert compute_distractors(words, topics, k=3) == [row[:3] for row in full]
+
+
+def test_edit_distance():
+    assert edit_distance('kitten', 'sitting') == 3
+    assert edit_distance('', 'abc') == edit_distance('abc', '') == 3
+    assert edit_distance('flaw', 'lawn') == 2
+
+
+def test_bundles_do_not_depend_on_the_hash_seed(tmp_path):
+    outputs = []
+    for seed in ('1', '2'):
+        out = tmp_path / seed
+        env = {**os.environ, 'PYTHONHASHSEED': seed, 'PYTHONPATH': str(ROOT / 'scripts')}
+        subprocess.run([sys.executable, '-c', BUILD, str(out)], cwd=ROOT, env=env, check=True,
+                       capture_output=True)
+        bundles = sorted((out / 'spanish' / 'b1').glob('bundle.*.json'))
+        assert len(bundles) == 1
+        outputs.append(bundles[0].read_bytes())
+    assert outputs[0] == outputs[1]
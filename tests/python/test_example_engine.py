@@ -0,0 +1,52 @@
+"""
+Tests for scripts/example_engine.py, the example sentence engine.
+Run with: python -m pytest tests/python
+"""
+
+import os
+
+from example_engine import EXAMPLES_ENV, ExampleEngine, load_corpora, open_example_engine, use_example_engine
+
+CORPORA = {'en': {'ocio': {'Cine': 'I go to the cinema.'}}}
+
+
+def test_corpus_sentences_win_over_templates():
+    engine = ExampleEngine(CORPORA, {'en': 'Talk about {word} ({topic}).'})
+    assert engine.example('en', ' cine ', 'ocio') == 'I go to the cinema.'
+    assert engine.example('en', 'cine', 'tiempo_libre') == 'Talk about cine (tiempo libre).'
+    assert engine.example('de', 'cine', 'ocio') == 'Example: cine'
+    assert engine.stats() == {'en': {'corpus': 1, 'template': 1}, 'de': {'corpus': 0, 'template': 1}}
+
+
+def test_topic_batch_matches_single_lookups():
+    engine = ExampleEngine(CORPORA)
+    engine.register_template('en', lambda word, topic: f'{word.upper()}!')
+    words = ['cine', 'teatro', 'CINE']
+    assert engine.examples_for_topic('en', 'ocio', words) == ['I go to the cinema.', 'TEATRO!', 'I go to the cinema.']
+    assert engine.examples_for_topic('en', 'ocio', words) == [engine.example('en', word, 'ocio') for word in words]
+
+
+def test_fingerprint_follows_corpora_and_templates():
+    fingerprint = ExampleEngine(CORPORA).fingerprint()
+    assert ExampleEngine(CORPORA).fingerprint() == fingerprint
+    assert ExampleEngine(CORPORA, {'en': 'See {word}.'}).fingerprint() != fingerprint
+    assert ExampleEngine({'en': {'ocio': {'cine': 'Cinema!'}}}).fingerprint() != fingerprint
+
+
+def test_load_corpora_reads_one_file_per_language(tmp_path):
+    (tmp_path / 'en.json').write_text('{"ocio": {"cine": "I go to the cinema."}}', encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('ignored', encoding='utf-8')
+    assert load_corpora(tmp_path) == {'en': {'ocio': {'cine': 'I go to the cinema.'}}}
+
+
+def make_custom_engine():
+    return ExampleEngine(default_template='Custom {word}')
+
+
+def test_configured_engine_replaces_the_default(monkeypatch):
+    monkeypatch.delenv(EXAMPLES_ENV, raising=False)
+    use_example_engine(f'{__name__}:make_custom_engine')
+    assert open_example_engine(ExampleEngine).example('en', 'cine', 'ocio') == 'Custom cine'
+    use_example_engine(None)
+    assert EXAMPLES_ENV not in os.environ
+    assert open_example_engine(ExampleEngine).example('en', 'cine', 'ocio') == 'Example: cine'
@@ -0,0 +1,63 @@
+"""
+Tests for scripts/instrumentation.py, the stage timers behind --profile and --trace.
+Run with: python -m pytest tests/python
+"""
+
+import json
+import os
+
+import instrumentation
+from instrumentation import Recorder, count, stage
+
+
+def test_disabled_recorder_records_nothing(monkeypatch):
+    monkeypatch.setattr(instrumentation, '_RECORDER', Recorder())
+    assert stage('parse') is stage('write')
+    with stage('parse'):
+        count('words', 3)
+    assert instrumentation.get_recorder().stats() == {'stages': {}, 'counters': {}, 'spans': []}
+
+
+def test_trace_records_stages_counters_and_spans(monkeypatch, tmp_path):
+    monkeypatch.setattr(instrumentation, '_RECORDER', Recorder())
+    monkeypatch.delenv(instrumentation.INSTRUMENT_ENV, raising=False)
+    instrumentation.enable(trace=True)
+    with stage('topic', level='b1', lang='english', topic='ocio'):
+        with stage('serialize'):
+            count('bytes_serialized', 10)
+    count('bytes_serialized', 5)
+
+    recorder = instrumentation.get_recorder()
+    worker = Recorder('trace')
+    worker.merge_stats(recorder.stats())
+    recorder.merge_stats(worker.stats())
+    stats = recorder.stats()
+    assert stats['stages']['topic']['calls'] == 2
+    assert stats['counters'] == {'bytes_serialized': 30}
+    assert [span['name'] for span in stats['spans'][:2]] == ['serialize', 'topic']
+    assert stats['spans'][1]['args'] == {'level': 'b1', 'lang': 'english', 'topic': 'ocio'}
+
+    instrumentation.write_trace(tmp_path / 'trace.json', stats)
+    trace = json.loads((tmp_path / 'trace.json').read_text(encoding='utf-8'))
+    assert len(trace['traceEvents']) == 4
+    assert all(event['ph'] == 'X' for event in trace['traceEvents'])
+
+
+def test_each_build_reports_only_its_own_numbers(monkeypatch, tmp_path):
+    from vocab_parser import parse_file
+    from wordlist_pipeline import generate
+
+    monkeypatch.setattr(instrumentation, '_RECORDER', Recorder())
+    monkeypatch.delenv(instrumentation.INSTRUMENT_ENV, raising=False)
+    langs = [{'code': 'english', 'tcode': 'en'}]
+    build_topic = lambda lang, level, key, words: {'topic': key, 'words': [{'word': w} for w in words]}
+    for level, words in (('b1', 'cine\nteatro\n'), ('b2', 'jefe\n')):
+        src = tmp_path / f'{level}.txt'
+        src.write_text(f'## Ocio\n{words}', encoding='utf-8')
+        trace = tmp_path / f'{level}.trace.json'
+        generate([level], {level: str(src)}, langs, parse_file, build_topic, 'v1',
+                 base_dir=tmp_path / 'out', precache=False, trace=str(trace))
+        counters = json.loads(trace.read_text(encoding='utf-8'))['otherData']['counters']
+        assert counters['words'] == words.count('\n')
+        assert not instrumentation.enabled()
+        assert instrumentation.INSTRUMENT_ENV not in os.environ
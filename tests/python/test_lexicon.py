@@ -0,0 +1,45 @@
+"""
+Tests for scripts/lexicon.py, the shared translation lexicon.
+Run with: python -m pytest tests/python
+"""
+
+from lexicon import Lexicon
+
+TABLES = {'en': {'Alegría': 'joy', 'pulmón': 'lung', 'tener  la piel': 'to have skin',
+                 'año': 'year', 'ano': 'anus'}}
+
+
+def test_lookup_normalizes_case_spacing_and_accents():
+    lexicon = Lexicon(TABLES)
+    assert lexicon.lookup('alegría', 'en') == 'joy'
+    assert lexicon.lookup(' TENER la PIEL ', 'en') == 'to have skin'
+    assert lexicon.lookup('pulmon', 'en') == 'lung'
+    assert lexicon.lookup('codo', 'en') is None
+    assert lexicon.lookup('alegría', 'de') is None
+    assert lexicon.stats()['en'] == {'hits': 2, 'folded_hits': 1, 'provided': 0, 'misses': 1}
+
+
+def test_ambiguous_folded_keys_are_not_guessed():
+    lexicon = Lexicon({'en': {'año': 'year', 'ano': 'anus'}})
+    assert lexicon.lookup('año', 'en') == 'year'
+    assert lexicon.lookup('ano', 'en') == 'anus'
+    assert lexicon.lookup('ANÓ', 'en') is None
+
+
+def test_translate_many_matches_translate():
+    lexicon = Lexicon(TABLES)
+    words = ['alegria', 'codo', 'Pulmón', 'año']
+    assert lexicon.translate_many(words, 'en') == [lexicon.translate(word, 'en') for word in words]
+    assert lexicon.translate_many(words, 'ru') == words
+
+
+def test_fallback_fills_misses_and_changes_the_fingerprint():
+    lexicon = Lexicon(TABLES)
+    fingerprint = lexicon.fingerprint()
+    assert fingerprint == Lexicon(dict(TABLES)).fingerprint()
+    lexicon.set_fallback({'en': {'codo': 'elbow'}})
+    assert lexicon.translate('codo', 'en') == 'elbow'
+    assert lexicon.lookup('alegría', 'en') == 'joy'
+    assert lexicon.fingerprint() != fingerprint
+    assert lexicon.tables_fingerprint() == fingerprint
+
@@ -0,0 +1,84 @@
+"""
+Tests for scripts/normalize.py, the shared normalization behind the lexicon,
+the indexes and the precomputed answer keys.
+Run with: python -m pytest tests/python
+"""
+
+from normalize import accepted_forms, add_answer_keys, fold_key, match_key, normalize_key
+
+
+def test_normalize_key_collapses_whitespace_and_case():
+    assert normalize_key('  Tener   la PIEL ') == 'tener la piel'
+
+
+def test_normalize_key_composes_to_nfc():
+    decomposed = 'alimentación'
+    assert normalize_key(decomposed) == 'alimentación'
+
+
+def test_fold_key_removes_accents():
+    assert fold_key('Alimentación') == 'alimentacion'
+    assert fold_key('Тёплый') == 'теплыи'
+
+
+def test_match_key_strips_punctuation_and_articles():
+    assert match_key('¿La piel?', 'spanish') == 'piel'
+    assert match_key('to hug', 'english') == 'hug'
+    assert match_key('der Personalchef', 'german') == 'personalchef'
+    assert match_key("don't", 'english') == 'dont'
+
+
+def test_match_key_keeps_lone_article_and_unknown_language():
+    assert match_key('la', 'spanish') == 'la'
+    assert match_key('la piel') == 'la piel'
+
+
+def test_match_key_keeps_cyrillic_short_i():
+    assert match_key('Тёплый йогурт', 'russian') == 'теплый йогурт'
+
+
+def test_match_key_casefolds_sharp_s():
+    assert match_key('Straße') == 'strasse'
+
+
+def test_accepted_forms_alternatives_and_endings():
+    assert accepted_forms('ir/venir') == ['ir', 'venir']
+    assert accepted_forms('ciego/a', 'spanish') == ['ciego', 'ciega']
+    assert accepted_forms('hombro(s)') == ['hombro', 'hombros']
+    assert accepted_forms('') == []
+
+
+def test_accepted_forms_append_or_replace_endings():
+    assert accepted_forms('profesor/a', 'spanish') == ['profesor', 'profesora']
+    assert accepted_forms('ojo/s', 'spanish') == ['ojo', 'ojos']
+    assert accepted_forms('pez/es', 'spanish') == ['pez', 'peces']
+    assert accepted_forms('ciegos/as', 'spanish') == ['ciegos', 'ciegas']
+    assert accepted_forms('bueno/a/os/as', 'spanish') == ['bueno', 'buena', 'buenos', 'buenas']
+    assert accepted_forms('yes/no', 'english') == ['yes', 'no']
+
+
+def test_accepted_forms_drop_notes():
+    assert accepted_forms('but (prep)', 'english') == ['but']
+    assert accepted_forms('banco (m.)', 'spanish') == ['banco']
+    assert accepted_forms('to look (at)', 'english') == ['look', 'look at']
+
+
+def test_add_answer_keys_merges_duplicate_entries():
+    entries = [
+        {'word': 'human resources director', 'translation': 'der Personalchef'},
+        {'word': 'Human Resources Director', 'translation': 'der Personalchef'},
+        {'word': 'piel', 'translation': 'skin'},
+        {'word': 'cutis', 'translation': 'skin'},
+    ]
+    add_answer_keys(entries, 'english', 'german')
+    assert entries[0]['word_keys'] == entries[1]['word_keys'] == ['human resources director']
+    assert entries[1]['translation_keys'] == ['personalchef']
+    # Either source word is accepted for 'skin'
+    assert entries[2]['word_keys'] == ['piel', 'cutis']
+    assert entries[3]['word_keys'] == ['cutis', 'piel']
+
+
+def test_add_answer_keys_untranslated_entry_uses_source_language():
+    entries = [{'word': 'la piel', 'translation': 'la piel'}]
+    add_answer_keys(entries, 'spanish', 'english')
+    assert entries[0]['translation_keys'] == ['piel']
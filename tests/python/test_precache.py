@@ -0,0 +1,70 @@
+"""Tests for the service-worker precache manifest."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from precache import PRECACHE_NAME, build_precache, write_precache
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def make_app(root):
+    (root / 'js').mkdir(parents=True)
+    (root / 'index.html').write_text('<html></html>', encoding='utf-8')
+    (root / 'js' / 'app.js').write_text('console.log(1);', encoding='utf-8')
+    words = root / 'data' / 'word_lists'
+    (words / 'english' / 'b1').mkdir(parents=True)
+    (words / 'english' / 'b1' / 'ocio.json').write_text('{}', encoding='utf-8')
+    (words / 'english' / 'b1' / '.build-manifest.json').write_text('{}', encoding='utf-8')
+    (words / 'patches.json').write_text('{}', encoding='utf-8')
+    (words / 'index.json').write_text('{}', encoding='utf-8')
+    (words / 'english' / 'b1' / 'bundle.0123456789ab.json').write_text('{}', encoding='utf-8')
+    (words / 'english' / 'b1' / 'bundle.ba9876543210.json').write_text('{}', encoding='utf-8')
+    bundles = {'bundles': {'english/b1': {'file': 'english/b1/bundle.0123456789ab.json'}}}
+    (words / 'bundles.json').write_text(json.dumps(bundles), encoding='utf-8')
+    return words
+
+
+def test_only_current_bundles_are_precached(tmp_path):
+    words = make_app(tmp_path)
+    urls = [e['url'] for e in build_precache(tmp_path, words)['entries']]
+    assert urls == ['./', './data/word_lists/bundles.json',
+                    './data/word_lists/english/b1/bundle.0123456789ab.json', './index.html', './js/app.js']
+
+
+def test_topic_files_are_opt_in_and_skip_build_artifacts(tmp_path):
+    words = make_app(tmp_path)
+    urls = [e['url'] for e in build_precache(tmp_path, words, topics=True)['entries']]
+    assert urls == ['./', './data/word_lists/bundles.json',
+                    './data/word_lists/english/b1/bundle.0123456789ab.json',
+                    './data/word_lists/english/b1/ocio.json', './data/word_lists/index.json',
+                    './index.html', './js/app.js']
+
+
+def test_version_follows_shell_content(tmp_path):
+    words = make_app(tmp_path)
+    first = build_precache(tmp_path, words)['version']
+    assert build_precache(tmp_path, words)['version'] == first
+    (tmp_path / 'js' / 'app.js').write_text('console.log(2);', encoding='utf-8')
+    assert build_precache(tmp_path, words)['version'] != first
+
+
+def test_write_reports_changes(tmp_path):
+    words = make_app(tmp_path)
+    manifest, changed = write_precache(tmp_path, words)
+    assert changed
+    text = (tmp_path / PRECACHE_NAME).read_text(encoding='utf-8')
+    assert json.dumps(manifest['version']) in text
+    assert write_precache(tmp_path, words) == (manifest, False)
+    (tmp_path / 'index.html').write_text('<html>2</html>', encoding='utf-8')
+    assert write_precache(tmp_path, words, dry_run=True)[1]
+    assert (tmp_path / PRECACHE_NAME).read_text(encoding='utf-8') == text
+
+
+def test_committed_manifest_is_current():
+    # Any change to the app shell or the committed word lists must ship a regenerated manifest
+    result = subprocess.run([sys.executable, 'scripts/precache.py', '--check'], cwd=ROOT,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout
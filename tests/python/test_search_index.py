@@ -0,0 +1,55 @@
+"""
+Tests for scripts/search_index.py, the static search index.
+Run with: python -m pytest tests/python
+"""
+
+from search_index import SEARCH_DIR, SearchIndex, write_search_index
+
+WORDS = [
+    {'word': 'tener la piel', 'translation': 'to have skin', 'example': 'Hay que tener la piel dura.'},
+    {'word': 'piel', 'translation': 'skin', 'example': 'La piel es suave.'},
+    {'word': 'pielero', 'translation': 'furrier'},
+    {'word': 'cuero', 'translation': 'leather', 'example': 'Un bolso de piel.'},
+    {'word': 'zampiel', 'translation': 'made up'},
+    {'word': 'Ñandú', 'translation': 'rhea'}
+]
+TOPIC_SETS = [('english', 'b1', [('cuerpo', {'topic': 'Cuerpo', 'words': WORDS})]),
+              ('english', 'b2', [('ropa', WORDS[3:4])])]
+
+
+def offsets(index, query, **options):
+    return [(hit['level'], hit['offset']) for hit in index.search(query, **options)]
+
+
+def test_ranking_prefers_whole_words_then_fields_then_prefixes(tmp_path):
+    write_search_index(tmp_path, TOPIC_SETS)
+    index = SearchIndex.load(tmp_path)
+    # Whole word, phrase, word prefix, example, then the substring match
+    assert offsets(index, 'piel') == [('b1', 1), ('b1', 0), ('b1', 2), ('b1', 3), ('b2', 0), ('b1', 4)]
+    assert offsets(index, 'piel', substring=False) == [('b1', 1), ('b1', 0), ('b1', 2), ('b1', 3), ('b2', 0)]
+    assert offsets(index, 'skin') == [('b1', 0), ('b1', 1)]
+    assert offsets(index, 'tener piel') == [('b1', 0)]
+    assert offsets(index, 'nandu') == [('b1', 5)]
+    assert offsets(index, 'cuero', levels=['b2']) == [('b2', 0)]
+    assert index.search('') == [] and index.search('xyz') == []
+
+
+def test_small_shards_answer_like_one_shard(tmp_path):
+    write_search_index(tmp_path / 'one', TOPIC_SETS)
+    write_search_index(tmp_path / 'many', TOPIC_SETS, budget=24)
+    one, many = SearchIndex.load(tmp_path / 'one'), SearchIndex.load(tmp_path / 'many')
+    assert max(map(len, one.shards['prefix'])) == 1
+    assert max(map(len, many.shards['prefix'])) > 1
+    for query in ('piel', 'pi', 'p', 'iel', 'tener la', 'leather', 'ñan'):
+        assert many.search(query) == one.search(query)
+
+
+def test_rewrite_drops_old_shards(tmp_path):
+    assert write_search_index(tmp_path, TOPIC_SETS)
+    assert not write_search_index(tmp_path, TOPIC_SETS)
+    assert write_search_index(tmp_path, TOPIC_SETS[1:], dry_run=True)
+    write_search_index(tmp_path, TOPIC_SETS[1:])
+    index = SearchIndex.load(tmp_path)
+    files = {shard['file'] for shards in index.shards.values() for shard in shards.values()}
+    assert {path.name for path in (tmp_path / SEARCH_DIR).glob('*.*.json')} == files
+    assert offsets(index, 'piel') == [('b2', 0)]
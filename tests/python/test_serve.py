@@ -0,0 +1,87 @@
+"""
+Tests for scripts/serve.py, the static PWA server.
+Run with: python -m pytest tests/python
+"""
+
+import gzip
+import http.client
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from serve import IMMUTABLE, REVALIDATE, VocabRequestHandler, accepted_encodings, parse_range
+
+BODY = b'0123456789' * 200
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / 'words.json').write_bytes(BODY)
+    (tmp_path / 'bundle.5f0343e7a9c3.json').write_bytes(b'{"plain": true}')
+    (tmp_path / 'bundle.5f0343e7a9c3.json.gz').write_bytes(gzip.compress(b'{"plain": true}'))
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), partial(VocabRequestHandler, directory=str(tmp_path)))
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(port, path, **headers):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+    connection.request('GET', path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_parse_range():
+    assert parse_range('bytes=0-9', 100) == (0, 9)
+    assert parse_range('bytes=90-', 100) == (90, 99)
+    assert parse_range('bytes=-10', 100) == (90, 99)
+    assert parse_range('bytes=95-200', 100) == (95, 99)
+    assert parse_range('bytes=100-', 100) == 'invalid'
+    assert parse_range('bytes=-0', 100) == 'invalid'
+    assert parse_range('bytes=0-1,5-6', 100) is None
+    assert parse_range(None, 100) is None
+
+
+def test_accepted_encodings():
+    assert accepted_encodings('gzip, br;q=0, deflate;q=0.5') == {'gzip', 'deflate'}
+    assert accepted_encodings(None) == set()
+
+
+def test_etag_revalidation(server):
+    response, body = get(server, '/words.json')
+    assert response.status == 200 and body == BODY
+    assert response.getheader('Cache-Control') == REVALIDATE
+    etag = response.getheader('ETag')
+    response, body = get(server, '/words.json', **{'If-None-Match': etag})
+    assert response.status == 304 and body == b''
+    assert get(server, '/words.json', **{'If-None-Match': '"other"'})[0].status == 200
+
+
+def test_byte_ranges(server):
+    response, body = get(server, '/words.json', Range='bytes=10-19')
+    assert response.status == 206 and body == BODY[10:20]
+    assert response.getheader('Content-Range') == f'bytes 10-19/{len(BODY)}'
+    response, _ = get(server, '/words.json', Range=f'bytes={len(BODY)}-')
+    assert response.status == 416
+    assert response.getheader('Content-Range') == f'bytes */{len(BODY)}'
+    # A stale If-Range validator gets the whole file
+    response, body = get(server, '/words.json', Range='bytes=10-19', **{'If-Range': '"stale"'})
+    assert response.status == 200 and body == BODY
+
+
+def test_compressed_responses(server):
+    response, body = get(server, '/bundle.5f0343e7a9c3.json', **{'Accept-Encoding': 'gzip'})
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert response.getheader('Cache-Control') == IMMUTABLE
+    assert gzip.decompress(body) == b'{"plain": true}'
+    response, body = get(server, '/words.json', **{'Accept-Encoding': 'gzip'})
+    assert response.getheader('Content-Encoding') == 'gzip'
+    assert gzip.decompress(body) == BODY
+    assert get(server, '/bundle.5f0343e7a9c3.json')[1] == b'{"plain": true}'
@@ -0,0 +1,102 @@
+"""
+Tests for scripts/translation_provider.py, the batched provider for lexicon misses.
+Run with: python -m pytest tests/python
+"""
+
+import asyncio
+import os
+
+from lexicon import Lexicon
+from translation_provider import (
+    CACHE_ENV, PROVIDER_ENV, StubProvider, TranslationCache, TranslationError, load_provider,
+    translate_all, use_translation_cache
+)
+
+
+class FlakyProvider(StubProvider):
+    """Fails the first attempt of every batch."""
+
+    name = 'flaky'
+
+    def __init__(self, tables):
+        super().__init__(tables)
+        self.attempts = 0
+
+    async def translate_batch(self, texts, source_lang, target_lang):
+        self.attempts += 1
+        if self.attempts % 2:
+            raise TranslationError('try again')
+        return await super().translate_batch(texts, source_lang, target_lang)
+
+
+def test_translate_all_batches_retries_and_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr('translation_provider.BACKOFF', 0)
+    provider = FlakyProvider({'en': {'hueso': 'bone', 'Pulmón': 'lung'}})
+    provider.batch_size = 2
+    cache = TranslationCache(tmp_path / 'cache.sqlite')
+    counts = asyncio.run(translate_all(provider, cache, {'en': ['hueso', 'pulmón', 'codo']}, 'es', rate=0))
+    assert counts == (2, 1, 0)
+    assert provider.batches == 2 and provider.attempts == 4
+    assert cache.known('en', 'flaky') == {'hueso', 'pulmón', 'codo'}
+    assert cache.tables('flaky') == {'en': {'hueso': 'bone', 'pulmón': 'lung'}}
+    assert cache.tables('stub') == {}
+
+
+def test_failed_batches_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr('translation_provider.BACKOFF', 0)
+    provider = FlakyProvider({})
+    cache = TranslationCache(tmp_path / 'cache.sqlite')
+    counts = asyncio.run(translate_all(provider, cache, {'en': ['hueso']}, 'es', rate=0, retries=0))
+    assert counts == (0, 0, 1)
+    assert cache.known('en', 'flaky') == set()
+
+
+class BrokenProvider(StubProvider):
+    """Drops the last answer of 'en' batches and cannot reach the 'ru' service."""
+
+    name = 'broken'
+
+    async def translate_batch(self, texts, source_lang, target_lang):
+        if target_lang == 'ru':
+            raise ConnectionResetError('connection reset')
+        answers = await super().translate_batch(texts, source_lang, target_lang)
+        return answers[:-1] if target_lang == 'en' else answers
+
+
+def test_short_and_failing_batches_fail_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr('translation_provider.BACKOFF', 0)
+    provider = BrokenProvider({'en': {'hueso': 'bone'}, 'de': {'hueso': 'Knochen'}})
+    provider.batch_size = 2
+    cache = TranslationCache(tmp_path / 'cache.sqlite')
+    texts = {'en': ['hueso', 'codo'], 'ru': ['hueso'], 'de': ['hueso']}
+    counts = asyncio.run(translate_all(provider, cache, texts, 'es', rate=0, retries=1))
+    assert counts == (1, 0, 3)
+    assert cache.known('en', 'broken') == set() and cache.known('ru', 'broken') == set()
+    assert cache.known('de', 'broken') == {'hueso'}
+
+
+def test_use_translation_cache_none_clears_the_fallback(tmp_path, monkeypatch):
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+    monkeypatch.delenv(PROVIDER_ENV, raising=False)
+    use_translation_cache(tmp_path / 'cache.sqlite', 'stub')
+    assert os.environ[PROVIDER_ENV] == 'stub'
+    use_translation_cache(None)
+    assert CACHE_ENV not in os.environ and PROVIDER_ENV not in os.environ
+
+
+def test_lexicon_falls_back_to_provided_translations():
+    lexicon = Lexicon({'en': {'piel': 'skin'}})
+    before = lexicon.fingerprint()
+    lexicon.set_fallback({'en': {'hueso': 'bone'}, 'ru': {'hueso': 'кость'}})
+    assert lexicon.fingerprint() != before
+    assert lexicon.translate_many(['piel', 'Hueso', 'codo'], 'en') == ['skin', 'bone', 'codo']
+    assert lexicon.lookup('hueso', 'ru') == 'кость'
+    assert lexicon.stats()['en'] == {'hits': 1, 'folded_hits': 0, 'provided': 1, 'misses': 1}
+
+
+def test_load_provider_parses_stub_tables(tmp_path):
+    tsv = tmp_path / 'es-en.tsv'
+    tsv.write_text('# comment\nhueso\tbone\n', encoding='utf-8')
+    provider = load_provider(f'stub:en={tsv}')
+    assert provider.name == 'stub'
+    assert asyncio.run(provider.translate_batch(['Hueso', 'codo'], 'es', 'en')) == ['bone', None]
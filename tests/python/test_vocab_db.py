@@ -0,0 +1,77 @@
+"""
+Tests for scripts/vocab_db.py, the SQLite export of the generated word lists.
+Run with: python -m pytest tests/python
+"""
+
+from vocab_db import VocabularyDB, fts_query, write_vocabulary_db
+
+TOPIC_SETS = [
+    ('english', 'b1', [
+        ('salud', {'topic': 'Salud', 'words': [
+            {'word': 'la piel', 'translation': 'the skin', 'example': 'My skin is dry.'},
+            {'word': 'tener la piel suave', 'translation': 'to have soft skin'},
+        ]}),
+        ('ocio', {'topic': 'Ocio', 'words': [
+            {'word': 'descanso', 'translation': 'rest', 'example': 'I need some rest.'},
+        ]}),
+    ]),
+    ('russian', 'b1', [
+        ('salud', {'topic': 'Здоровье', 'words': [
+            {'word': 'la piel', 'translation': 'кожа'},
+        ]}),
+    ]),
+]
+
+
+def test_write_is_skipped_when_inputs_are_unchanged(tmp_path):
+    path = tmp_path / 'vocabulary.sqlite'
+    assert write_vocabulary_db(path, TOPIC_SETS, dry_run=True)
+    assert not path.exists()
+    assert write_vocabulary_db(path, TOPIC_SETS)
+    assert not write_vocabulary_db(path, TOPIC_SETS)
+    assert write_vocabulary_db(path, TOPIC_SETS[:1], dry_run=True)
+
+
+def test_queries(tmp_path):
+    path = tmp_path / 'vocabulary.sqlite'
+    write_vocabulary_db(path, TOPIC_SETS)
+    with VocabularyDB(path) as db:
+        assert db.topics('english', 'b1') == [
+            {'key': 'salud', 'name': 'Salud', 'count': 2},
+            {'key': 'ocio', 'name': 'Ocio', 'count': 1},
+        ]
+        words = db.topic_words('english', 'b1', 'salud', limit=1)
+        assert [(w['word'], w['translation'], w['example']) for w in words] == [
+            ('la piel', 'the skin', 'My skin is dry.')]
+        # Source words are stored once and matched without case or accents
+        assert [w['translation'] for w in db.translations('LA PÍEL')] == ['the skin', 'кожа']
+        assert [w['word'] for w in db.search('ski', lang='english')] == ['la piel', 'tener la piel suave']
+        hits = db.search('piel', level='b1')
+        assert sorted(w['lang'] for w in hits) == ['english', 'english', 'russian']
+        assert hits[-1]['word'] == 'tener la piel suave'
+        assert db.search('   ') == []
+
+
+def test_fts_query_quotes_tokens():
+    assert fts_query('Tener "la" piel') == '"tener" "la" "piel"*'
+    assert fts_query('') is None
+
+
+def test_pipeline_exports_store_views(tmp_path):
+    from vocab_parser import parse_file
+    from wordlist_pipeline import generate
+
+    src = tmp_path / 'b1.txt'
+    src.write_text('## Salud\nla piel\n\n## Ocio\ndescanso\n', encoding='utf-8')
+    path = tmp_path / 'vocabulary.sqlite'
+    build_topic = lambda lang, level, key, words: {
+        'topic': key.title(), 'words': [{'word': w, 'translation': w.upper(), 'translation_keys': [w]} for w in words]}
+    options = {'base_dir': tmp_path / 'out', 'precache': False, 'sqlite': str(path)}
+    langs = [{'code': 'english', 'tcode': 'en'}]
+    generate(['b1'], {'b1': str(src)}, langs, parse_file, build_topic, 'v1', **options)
+    with VocabularyDB(path) as db:
+        assert [w['translation'] for w in db.topic_words('english', 'b1', 'salud')] == ['LA PIEL']
+    changed = generate(['b1'], {'b1': str(src)}, langs, parse_file, build_topic, 'v1', **options)
+    assert str(path) not in changed
+    assert write_vocabulary_db(tmp_path / 'direct.sqlite', [
+        ('english', 'b1', [('salud', {'topic': 'Salud', 'words': [{'word': 'x', 'translation_keys': ('x',)}]})])])
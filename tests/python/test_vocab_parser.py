@@ -0,0 +1,74 @@
+"""
+Tests for scripts/vocab_parser.py, the streaming vocabulary parser.
+Run with: python -m pytest tests/python
+"""
+
+from pathlib import Path
+
+import pytest
+
+from vocab_parser import heading_key, iter_records, order_words, paginate, parse_file, parse_txt, read_frequencies
+
+ROOT = Path(__file__).resolve().parents[2]
+TEXT = """# Vocabulario B1
+suelto
+## 1. Individuo: dimensión física
+# Partes del cuerpo
+músculo
+  hueso  
+
+## Ocio
+cine
+"""
+
+
+def test_heading_key():
+    assert heading_key('## 1. Individuo: dimensión física') == 'dimensión_física'
+    assert heading_key('## Tiempo libre') == 'tiempo_libre'
+    assert heading_key('##12.Ocio') == 'ocio'
+
+
+def test_records_skip_comments_blank_lines_and_headless_words():
+    assert list(iter_records(TEXT.split('\n'))) == [
+        ('dimensión_física', None, 3), ('dimensión_física', 'músculo', 5),
+        ('dimensión_física', 'hueso', 6), ('ocio', None, 8), ('ocio', 'cine', 9)]
+
+
+def test_default_topic_and_topic_names():
+    assert parse_txt(TEXT, {'ocio': 'leisure'}, default_topic='sin_tema') == {
+        'sin_tema': ['suelto'], 'dimensión_física': ['músculo', 'hueso'], 'leisure': ['cine']}
+
+
+def test_repeated_heading_starts_over(capsys):
+    assert parse_txt('## Ocio\ncine\n## Ocio\nteatro\n') == {'ocio': ['teatro']}
+    assert "section 'ocio' repeats line 1" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('name', ['spanish_b1_words.txt', 'spanish_b2_words.txt', 'b2_words.txt'])
+def test_parse_file_matches_parse_txt(name):
+    path = ROOT / 'data' / 'word_lists' / name
+    text = path.read_text(encoding='utf-8')
+    assert parse_file(path, default_topic='lista') == parse_txt(text, default_topic='lista')
+
+
+def test_paginate_splits_long_topics_only():
+    words = [f'palabra{n}' for n in range(5)]
+    paged, pages = paginate({'lista': words, 'ocio': ['cine']}, 2)
+    assert paged == {'lista_01': words[:2], 'lista_02': words[2:4], 'lista_03': words[4:], 'ocio': ['cine']}
+    assert pages == {'lista': [
+        {'key': 'lista_01', 'offset': 0, 'count': 2, 'first': 'palabra0', 'last': 'palabra1'},
+        {'key': 'lista_02', 'offset': 2, 'count': 2, 'first': 'palabra2', 'last': 'palabra3'},
+        {'key': 'lista_03', 'offset': 4, 'count': 1, 'first': 'palabra4', 'last': 'palabra4'}]}
+    assert paginate({'lista': words}, 0) == ({'lista': words}, {})
+    assert list(paginate({'lista': words * 20}, 1)[0])[-1] == 'lista_100'
+
+
+def test_page_orders(tmp_path):
+    words = ['Ñu', 'árbol', 'casa', 'abeja']
+    assert order_words(words) == words
+    assert order_words(words, 'alpha') == ['abeja', 'árbol', 'casa', 'Ñu']
+    path = tmp_path / 'frequencies.txt'
+    path.write_text('casa\t50\nÑU 7\nsin número\n', encoding='utf-8')
+    frequencies = read_frequencies(path)
+    assert frequencies == {'casa': 50, 'ñu': 7}
+    assert order_words(words, 'frequency', frequencies) == ['casa', 'Ñu', 'abeja', 'árbol']
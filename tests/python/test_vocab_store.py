@@ -0,0 +1,46 @@
+"""
+Tests for scripts/vocab_store.py, the columnar vocabulary model.
+Run with: python -m pytest tests/python
+"""
+
+from bundles import build_bundle
+from dedup import pack_entries
+from vocab_store import VocabStore
+
+SOURCE = {'ocio': ['pasatiempo', 'ocio'], 'trabajo': ['jefe']}
+
+
+def topic_files(translations):
+    return [
+        (topic, {'topic': topic.title(),
+                 'words': [{'word': word, 'translation': translations.get(word, word),
+                            'translation_keys': [translations.get(word, word)]} for word in words]})
+        for topic, words in SOURCE.items()
+    ]
+
+
+def test_language_views_share_the_source_words():
+    store = VocabStore()
+    store.add_level('b1', SOURCE)
+    store.add_view('b1', 'english', topic_files({'ocio': 'leisure', 'jefe': 'boss'}))
+    store.add_view('b1', 'russian', topic_files({'jefe': 'начальник'}))
+    assert store.topic_keys('b1') == ['ocio', 'trabajo']
+    assert store.words('b1', 'ocio') == ['pasatiempo', 'ocio']
+
+    english = store.topics('b1', 'english')
+    russian = store.topics('b1', 'russian')
+    assert english[0][1]['words'][0]._view.columns['word'] is russian[0][1]['words'][0]._view.columns['word']
+    entry = english[1][1]['words'][0]
+    assert list(entry) == ['word', 'translation', 'translation_keys']
+    assert entry['translation'] == 'boss' and entry.get('example', 'none') == 'none'
+    assert entry.get('translation_keys') == ('boss',)
+    assert [e.get('translation') for e in russian[0][1]['words']] == ['pasatiempo', 'ocio']
+
+
+def test_bundles_from_views_match_bundles_from_dicts():
+    files = topic_files({'ocio': 'leisure', 'jefe': 'boss'})
+    store = VocabStore()
+    store.add_view('b1', 'english', files)
+    from_dicts = build_bundle('english', 'b1', pack_entries(files))
+    from_store = build_bundle('english', 'b1', pack_entries(store.topics('b1', 'english')))
+    assert from_store == from_dicts
@@ -0,0 +1,62 @@
+"""
+Tests for scripts/vocabulary_summary.py, the vocabulary statistics report.
+Run with: python -m pytest tests/python
+"""
+
+import json
+import os
+
+from compact_format import serialize_compact
+from vocabulary_summary import CACHE_NAME, build_report
+
+
+def write_topic(path, words, compact=False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {'topic': path.stem.title(), 'words': words}
+    path.write_bytes(serialize_compact(data) if compact else json.dumps(data).encode('utf-8'))
+
+
+def make_tree(base):
+    level = base / 'english' / 'b1'
+    write_topic(level / 'ocio.json', [{'word': 'cine', 'translation': 'cinema', 'example': 'Example: cine'},
+                                      {'word': 'museo', 'translation': 'museo'}])
+    write_topic(level / 'arte.json', [{'word': 'Museo', 'translation': 'museum'}], compact=True)
+    (level / 'index.json').write_text('["ocio", "arte"]', encoding='utf-8')
+    write_topic(base / 'spanish' / 'b1' / 'ocio.json', [{'word': 'cine', 'translation': 'cine'}])
+
+
+def test_report_counts_words_and_issues(tmp_path):
+    make_tree(tmp_path)
+    report = build_report(tmp_path, jobs=2)
+    english = report['languages']['english']['levels']['b1']
+    assert (english['topics'], english['words'], english['template_examples']) == (2, 3, 1)
+    assert english['untranslated'] == [{'topic': 'ocio', 'word': 'museo'}]
+    assert english['duplicates'] == [{'word': 'museo', 'topics': ['arte', 'ocio']}]
+    # The source language translates to itself by design
+    assert report['languages']['spanish']['levels']['b1']['untranslated'] == []
+    assert report['totals'] == {'files': 3, 'words': 4, 'languages': 2, 'levels': 1}
+    assert report['topics'] == ['ocio', 'arte']
+
+
+def test_cache_rereads_only_changed_files(tmp_path):
+    make_tree(tmp_path)
+    assert build_report(tmp_path)['files_read'] == 3
+    assert (tmp_path / CACHE_NAME).exists()
+    report = build_report(tmp_path)
+    assert (report['files_read'], report['files_cached']) == (0, 3)
+
+    path = tmp_path / 'english' / 'b1' / 'ocio.json'
+    write_topic(path, [{'word': 'cine', 'translation': 'cinema'}])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    report = build_report(tmp_path)
+    assert (report['files_read'], report['files_cached']) == (1, 2)
+    assert report['languages']['english']['levels']['b1']['words'] == 2
+
+
+def test_unreadable_files_are_reported(tmp_path):
+    make_tree(tmp_path)
+    (tmp_path / 'english' / 'b1' / 'broken.json').write_text('{', encoding='utf-8')
+    report = build_report(tmp_path, use_cache=False)
+    assert [error['file'].endswith('broken.json') for error in report['errors']] == [True]
+    assert not (tmp_path / CACHE_NAME).exists()
@@ -0,0 +1,78 @@
+"""
+Tests for scripts/watcher.py, the --watch mode of build_vocabulary.py.
+Run with: python -m pytest tests/python
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from watcher import BuildWatcher, ParseCache, diff_sections, open_watcher
+
+
+def test_diff_sections_lists_changed_topics():
+    previous = {'ocio': ['cine'], 'trabajo': ['jefe']}
+    assert diff_sections(previous, {'ocio': ['cine'], 'trabajo': ['jefe', 'sueldo']}) == ['trabajo']
+    assert diff_sections(previous, dict(previous)) == []
+    assert diff_sections(previous, {'ocio': ['cine']}) is None
+    assert diff_sections(None, previous) is None
+
+
+def test_parse_cache_reparses_only_changed_files(tmp_path):
+    source = tmp_path / 'words.txt'
+    source.write_text('cine\n', encoding='utf-8')
+    calls = []
+    generator = SimpleNamespace(__name__='fake', parse_file=lambda path: calls.append(path) or {'t': [1]})
+    parse = ParseCache().parser(generator)
+    assert parse(source) is parse(str(source))
+    source.write_text('cine\nteatro\n', encoding='utf-8')
+    parse(source)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize('poll', [True, False])
+def test_watchers_report_changed_files(tmp_path, poll):
+    watched = tmp_path / 'words.txt'
+    watched.write_text('a\n', encoding='utf-8')
+    watcher = open_watcher([str(watched)], poll)
+    if poll:
+        watcher.interval = 0.01
+    try:
+        assert watcher.wait(0.05) == set()
+        (tmp_path / 'other.txt').write_text('b\n', encoding='utf-8')
+        watched.write_text('a\nb\n', encoding='utf-8')
+        assert watcher.wait(2) == {str(watched)}
+    finally:
+        watcher.close()
+
+
+def test_errors_are_reported_and_watching_goes_on(tmp_path, monkeypatch, capsys):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = tmp_path / 'watched_tables.py'
+    module.write_text('def tables():\n    return {}\n', encoding='utf-8')
+    source = tmp_path / 'b1.txt'
+    source.write_text('## Ocio\ncine\n', encoding='utf-8')
+    config = {'builds': {'topical': {'generator': 'vocab_parser', 'levels': {'b1': str(source)},
+                                     'translations': 'watched_tables:tables'}}}
+    runs = []
+
+    def run_build(name, config, args, parse_file=None):
+        runs.append(args.level)
+        if len(runs) == 1:
+            raise OSError('disk full')
+        return []
+
+    builds = BuildWatcher(config, ['topical'], {'topical': SimpleNamespace(level=None)}, run_build)
+    source.write_text('## Ocio\ncine\nteatro\n', encoding='utf-8')
+    work = builds.affected({str(source)})
+    assert work == {'topical': {'b1': ['ocio']}}
+    assert builds.rebuild_topics(work) == {}
+    assert 'disk full' in capsys.readouterr().out
+
+    module.write_text('def tables(:\n', encoding='utf-8')
+    assert builds.affected({str(module)}) == {}
+    assert 'SyntaxError' in capsys.readouterr().out
+    module.write_text('def tables():\n    return {"en": {}}\n', encoding='utf-8')
+    work = builds.affected({str(module)})
+    assert work == {'topical': {'b1': None}}
+    assert builds.rebuild_topics(work) == {'topical': {'b1'}}
@@ -0,0 +1,144 @@
+"""
+Tests for scripts/wordlist_pipeline.py, the shared build driver.
+Run with: python -m pytest tests/python
+"""
+
+import json
+
+from build_manifest import BuildManifest
+from vocab_parser import parse_file
+from wordlist_pipeline import MANIFEST_NAME, generate
+
+LANGS = [{'code': 'english', 'tcode': 'en'}]
+SOURCE = '## Ocio\ncine\nteatro\n\n## Trabajo\njefe\nsueldo\n'
+
+
+def build_topic(lang, level, topic_key, words):
+    return {'topic': topic_key.title(), 'words': [{'word': word, 'translation': word.upper()} for word in words]}
+
+
+def build(tmp_path, source=SOURCE, langs=LANGS, **options):
+    src = tmp_path / 'b1.txt'
+    src.write_text(source, encoding='utf-8')
+    options = {'precache': False, 'alignment': False, 'search': False, **options}
+    return generate(['b1'], {'b1': str(src)}, langs, parse_file, build_topic, 'v1',
+                    base_dir=tmp_path / 'word_lists', **options)
+
+
+def test_renamed_topic_replaces_its_old_file(tmp_path):
+    build(tmp_path)
+    out = tmp_path / 'word_lists' / 'english' / 'b1'
+    assert (out / 'ocio.json').exists()
+    changed = build(tmp_path, SOURCE.replace('## Ocio', '## Tiempo libre'))
+    assert 'english/b1/ocio.json' in changed
+    assert not (out / 'ocio.json').exists()
+    assert json.loads((out / 'tiempo_libre.json').read_bytes())['words'][0]['word'] == 'cine'
+    manifest = BuildManifest(tmp_path / 'word_lists' / MANIFEST_NAME)
+    assert 'english/b1/ocio.json' not in manifest.files
+    assert len([path for path in manifest.files if '/bundle.' in path]) == 1
+
+
+def snapshot(root):
+    return {path.relative_to(root).as_posix(): (path.stat().st_mtime_ns, path.read_bytes())
+            for path in sorted(root.rglob('*')) if path.is_file()}
+
+
+def test_unchanged_rebuild_leaves_every_file_untouched(tmp_path):
+    build(tmp_path, alignment=True, search=True)
+    before = snapshot(tmp_path / 'word_lists')
+    assert build(tmp_path, alignment=True, search=True) == []
+    assert snapshot(tmp_path / 'word_lists') == before
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    assert 'english/b1/ocio.json' in build(tmp_path, dry_run=True)
+    assert not (tmp_path / 'word_lists').exists()
+    build(tmp_path)
+    before = snapshot(tmp_path / 'word_lists')
+    changed = build(tmp_path, SOURCE.replace('## Ocio', '## Tiempo libre'), dry_run=True)
+    assert {'english/b1/ocio.json', 'english/b1/tiempo_libre.json'} <= set(changed)
+    assert snapshot(tmp_path / 'word_lists') == before
+
+
+def test_precache_manifest_goes_to_the_web_root(tmp_path):
+    changed = build(tmp_path, precache=True, app_root=tmp_path)
+    assert 'precache-manifest.js' in changed
+    assert '"./word_lists/bundles.json"' in (tmp_path / 'precache-manifest.js').read_text(encoding='utf-8')
+    # Files outside the web root cannot be served, so no manifest is written for them
+    site = tmp_path / 'site'
+    build(tmp_path, precache=True, app_root=site, force=True)
+    assert not site.exists()
+
+
+def test_pruning_leaves_other_builds_and_unmanaged_files_alone(tmp_path):
+    out = tmp_path / 'word_lists' / 'english' / 'b1'
+    build(tmp_path, build_name='topical')
+    (tmp_path / 'basic.txt').write_text('## Arte\nmuseo\n', encoding='utf-8')
+    generate(['b1'], {'b1': str(tmp_path / 'basic.txt')}, LANGS, parse_file, build_topic, 'v2',
+             base_dir=tmp_path / 'word_lists', precache=False, alignment=False, search=False,
+             build_name='basic')
+    (out / 'notas.json').write_text('{}', encoding='utf-8')
+    (out / '3._identidad_personal.json').write_text('[]', encoding='utf-8')
+
+    changed = build(tmp_path, SOURCE.replace('## Ocio', '## Tiempo libre'), build_name='topical')
+    assert 'english/b1/ocio.json' in changed
+    assert not (out / 'ocio.json').exists()
+    for name in ('arte.json', 'notas.json', '3._identidad_personal.json', 'trabajo.json', 'tiempo_libre.json'):
+        assert (out / name).exists(), name
+
+
+def test_same_size_edit_of_an_output_is_rebuilt(tmp_path):
+    build(tmp_path)
+    path = tmp_path / 'word_lists' / 'english' / 'b1' / 'ocio.json'
+    original = path.read_bytes()
+    path.write_bytes(original.replace(b'CINE', b'CINA'))
+    assert 'english/b1/ocio.json' in build(tmp_path)
+    assert path.read_bytes() == original
+
+
+def test_parallel_build_matches_serial_build(tmp_path):
+    source = '\n'.join(f'## Tema {n}\npalabra{n}\notra{n}\n' for n in range(6))
+    langs = LANGS + [{'code': 'german', 'tcode': 'de'}]
+    trees = {}
+    for jobs in (1, 2):
+        root = tmp_path / f'jobs{jobs}'
+        root.mkdir()
+        build(root, source, langs=langs, jobs=jobs, alignment=True, search=True)
+        out = root / 'word_lists'
+        trees[jobs] = {path.relative_to(out).as_posix(): path.read_bytes()
+                       for path in sorted(out.rglob('*')) if path.is_file()}
+    assert len(trees[1]) > 12
+    assert trees[2] == trees[1]
+
+
+def test_paged_build_writes_pages_and_drops_them_when_paging_stops(tmp_path):
+    source = '## Lista\n' + '\n'.join(f'palabra{n}' for n in range(5)) + '\n'
+    build(tmp_path, source, page_size=2)
+    out = tmp_path / 'word_lists' / 'english' / 'b1'
+    pages = json.loads((out / 'pages.json').read_bytes())
+    assert [page['key'] for page in pages['topics']['lista']] == ['lista_01', 'lista_02', 'lista_03']
+    assert json.loads((out / 'index.json').read_bytes()) == ['lista_01', 'lista_02', 'lista_03']
+    assert [entry['word'] for entry in json.loads((out / 'lista_03.json').read_bytes())['words']] == ['palabra4']
+
+    build(tmp_path, source)
+    assert sorted(path.name for path in out.glob('[!.]*.json') if not path.name.startswith('bundle.')) == [
+        'index.json', 'lista.json']
+
+
+def test_slice_build_only_touches_its_slice(tmp_path):
+    langs = LANGS + [{'code': 'german', 'tcode': 'de'}]
+    build(tmp_path, langs=langs)
+    out = tmp_path / 'word_lists'
+    before = snapshot(out)
+
+    edited = SOURCE.replace('cine\n', 'cine\nmuseo\n').replace('jefe\n', 'jefa\n')
+    changed = build(tmp_path, edited, langs=langs, only_langs=['english'], only_topics=['ocio'])
+    after = snapshot(out)
+    topic_files = {path for path in changed if not path.split('/')[-1].startswith(('bundle.', 'index.'))
+                   and path.startswith(('english/', 'german/'))}
+    assert topic_files == {'english/b1/ocio.json'}
+    assert 'museo' in after['english/b1/ocio.json'][1].decode('utf-8')
+    untouched = [path for path in before if path.startswith('german/') or path == 'english/b1/trabajo.json']
+    assert len(untouched) > 3
+    for path in untouched:
+        assert after[path] == before[path], path